@@ -0,0 +1,93 @@
+"""
+Database load benchmark: parsing faktury.json vs the binary snapshot cache
+
+Both load paths pause the cyclic GC; "json.loads" with the GC running is
+the load before either change. A cold start (no valid cache) parses the
+JSON; the cache is then written when the storage is closed.
+
+Usage:
+    python benchmarks/bench_db_load.py [--count N] [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.models import Invoice
+from database.snapshot_cache import gc_paused
+from database.storage import AtomicJSONStorage
+
+
+def write_database(path: Path, count: int):
+    """faktury.json in TinyDB's layout with count invoices"""
+    invoices = {
+        str(i + 1): Invoice(
+            company_name=f"Firma {i % 500}",
+            nip=f"{1000000000 + i % 500}",
+            amount=round(100 + i * 1.37 % 5000, 2),
+            deadline=f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            issue_date=f"2024-{i % 12 + 1:02d}-01",
+            payment_term=30,
+            description=f"Transport {i}",
+            loading_location={"city": "Warszawa", "address": f"ul. Prosta {i % 100}"},
+        ).to_dict()
+        for i in range(count)
+    }
+    path.write_text(json.dumps({"invoices": invoices}), encoding="utf-8")
+
+
+def measure(label: str, load, repeat: int):
+    """Print the best time of load()"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<30} {best * 1000:8.1f} ms")
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wczytywanie bazy: JSON vs pamięć podręczna")
+    parser.add_argument("--count", type=int, default=50_000, help="Liczba faktur")
+    parser.add_argument("--repeat", type=int, default=3, help="Powtórzenia (najlepszy czas)")
+    args = parser.parse_args(argv)
+
+    path = Path(tempfile.mkdtemp()) / "faktury.json"
+    write_database(path, args.count)
+    cache_path = AtomicJSONStorage(path).cache.path
+
+    def load_json_gc_paused():
+        content = path.read_bytes()
+        with gc_paused():
+            json.loads(content)
+
+    def cold_start():
+        cache_path.unlink(missing_ok=True)
+        storage = AtomicJSONStorage(path)
+        storage.read()
+        return storage
+
+    def warm_start():
+        storage = AtomicJSONStorage(path)
+        storage.read()
+        storage.close()
+
+    print(f"{args.count} faktur, faktury.json {path.stat().st_size / 1024 / 1024:.1f} MB")
+    measure("json.loads (GC włączony)", lambda: json.loads(path.read_bytes()), args.repeat)
+    json_time = measure("json.loads (GC wstrzymany)", load_json_gc_paused, args.repeat)
+    cold_time = measure("zimny start (bez cache)", cold_start, args.repeat)
+    storages = [cold_start() for _ in range(args.repeat)]
+    measure("zapis cache przy zamknięciu", lambda: storages.pop().close(), args.repeat)
+    cache_time = measure("start z cache", warm_start, args.repeat)
+    print(f"cache {cache_path.stat().st_size / 1024 / 1024:.1f} MB; względem JSON z wstrzymanym GC: "
+          f"start z cache {json_time / cache_time:.2f}x, zimny start {json_time / cold_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Attachment encoding benchmark: PNG re-encoding vs the encoding policy
+
+Runs on generated sample images, or on real files passed as arguments.
+
+Usage:
+    python benchmarks/bench_image_encoding.py [FILE ...] [--format JPEG|WEBP] [--repeat N]
+"""
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.image_encoding import MAX_SIZE, encode_attachment, fit
+
+
+def encode_png(data: bytes) -> bytes:
+    """The previous policy: downsize and save every image as PNG"""
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft(None, fit(img.size, MAX_SIZE))
+        img.thumbnail(MAX_SIZE, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+
+def _photo(size):
+    """Smooth gradients with sensor-like noise"""
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.effect_noise(size, 40).filter(ImageFilter.GaussianBlur(1))
+    return Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+
+def _scan(size):
+    """White page with lines of dark 'text'"""
+    img = Image.new("RGB", size, (250, 250, 248))
+    draw = ImageDraw.Draw(img)
+    for y in range(size[1] // 20, size[1] - size[1] // 20, max(1, size[1] // 60)):
+        draw.text((size[0] // 12, y), "Faktura VAT 2024/03/117  NIP 123-456-78-90  1 234,56 PLN " * 3,
+                  fill=(20, 20, 20))
+    return img
+
+
+def make_samples(directory: Path):
+    """Sample files like those attached to invoices"""
+    samples = [
+        ("zdjecie_telefon.jpg", _photo((4000, 3000)), dict(format="JPEG", quality=92)),
+        ("zdjecie_male.jpg", _photo((1600, 1200)), dict(format="JPEG", quality=85)),
+        ("skan.png", _scan((2480, 3508)), dict(format="PNG")),
+        ("skan.jpg", _scan((1240, 1754)), dict(format="JPEG", quality=85)),
+        ("zrzut_ekranu.png", _scan((1920, 1080)), dict(format="PNG")),
+    ]
+    paths = []
+    for name, img, options in samples:
+        path = directory / name
+        img.save(path, **options)
+        paths.append(path)
+    return paths
+
+
+def measure(encode, data: bytes, repeat: int):
+    """(encoded size, best time in ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = encode(data)
+        best = min(best, time.perf_counter() - start)
+    return len(encoded), best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kodowanie załączników: PNG vs polityka kodowania")
+    parser.add_argument("files", nargs="*", help="Pliki zdjęć (domyślnie generowane próbki)")
+    parser.add_argument("--format", choices=("JPEG", "WEBP"), default="JPEG",
+                        help="Format ponownego kodowania")
+    parser.add_argument("--repeat", type=int, default=3, help="Powtórzenia (najlepszy czas)")
+    args = parser.parse_args(argv)
+
+    paths = [Path(path) for path in args.files] or make_samples(Path(tempfile.mkdtemp()))
+
+    print(f"{'plik':<20} {'wejście':>10} {'PNG':>10} {'ms':>7} {'polityka':>10} {'ms':>7} {'oszczędność':>12}")
+    totals = [0, 0, 0]
+    for path in paths:
+        data = path.read_bytes()
+        png_size, png_ms = measure(encode_png, data, args.repeat)
+        new_size, new_ms = measure(lambda d: encode_attachment(d, fmt=args.format), data, args.repeat)
+        kept = " (bez zmian)" if new_size == len(data) else ""
+        print(f"{path.name[:20]:<20} {len(data) / 1024:8.0f} KB {png_size / 1024:7.0f} KB {png_ms:7.1f} "
+              f"{new_size / 1024:7.0f} KB {new_ms:7.1f} {(png_size - new_size) / 1024:9.0f} KB{kept}")
+        totals[0] += len(data)
+        totals[1] += png_size
+        totals[2] += new_size
+
+    print(f"razem: wejście {totals[0] / 1024:.0f} KB, PNG {totals[1] / 1024:.0f} KB, "
+          f"polityka {totals[2] / 1024:.0f} KB ({totals[2] / totals[1]:.1%} rozmiaru PNG)")
+
+
+if __name__ == "__main__":
+    main()
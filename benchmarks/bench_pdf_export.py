@@ -0,0 +1,74 @@
+"""
+Single-table vs streamed (chunked) invoice PDF export benchmark
+
+Usage:
+    python benchmarks/bench_pdf_export.py [--count N] [--mode single|streaming|both]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.models import Invoice
+from database.records import freeze
+from services.export_service import ExportService, ordered
+
+
+def make_invoices(count: int):
+    """Frozen invoice records shaped like the GUI's export snapshot"""
+    return freeze('invoices', (
+        Invoice(
+            company_name=f"Firma {i % 500}",
+            nip=f"{1000000000 + i % 500}",
+            amount=round(100 + i * 1.37 % 5000, 2),
+            deadline=f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            issue_date=f"2024-{i % 12 + 1:02d}-01",
+            is_paid=i % 3 == 0,
+            created_at=f"2024-{i % 12 + 1:02d}-01T{i % 24:02d}:00:00",
+        ).to_dict()
+        for i in range(count)
+    ))
+
+
+def measure(label: str, export):
+    """Print time, peak traced memory and file size of one export"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    filepath = export()
+    elapsed = time.perf_counter() - start
+    _size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {elapsed:8.2f} s  szczyt {peak / 1024 / 1024:8.1f} MB  "
+          f"plik {os.path.getsize(filepath) / 1024:8.0f} KB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eksport PDF: jedna tabela vs strumieniowo")
+    parser.add_argument("--count", type=int, default=20_000, help="Liczba faktur")
+    parser.add_argument("--mode", choices=("single", "streaming", "both"), default="both")
+    args = parser.parse_args(argv)
+
+    invoices = make_invoices(args.count)
+    service = ExportService()
+    print(f"{args.count} faktur")
+
+    # ExportService writes to exports/ under the working directory
+    os.chdir(tempfile.mkdtemp())
+    if args.mode in ("single", "both"):
+        measure("jedna tabela", lambda: service.export_invoices_pdf(invoices, "single.pdf"))
+    if args.mode in ("streaming", "both"):
+        measure("strumień", lambda: service.export_invoices_pdf_streaming(
+            ordered(invoices, 'created_at', descending=True), "streaming.pdf", total=len(invoices)
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory and conversion benchmark for invoice record representations
+
+Usage:
+    python benchmarks/bench_records_memory.py [--count N]
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.models import Invoice
+from database.records import Record, InvoiceRecord, FrozenInvoiceRecord
+from database.snapshot_cache import gc_paused
+
+
+def make_rows(count: int):
+    """Invoice dicts shaped like the ones loaded from faktury.json"""
+    return [
+        Invoice(
+            company_name=f"Firma {i % 500}",
+            nip=f"{1000000000 + i % 500}",
+            amount=round(100 + i * 1.37 % 5000, 2),
+            deadline=f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            issue_date=f"2024-{i % 12 + 1:02d}-01",
+            payment_term=30,
+            description=f"Transport {i}",
+            loading_location={"city": "Warszawa", "address": f"ul. Prosta {i % 100}"},
+        ).to_dict()
+        for i in range(count)
+    ]
+
+
+def measure(label: str, build, repeat: int = 3):
+    """Print the memory retained by build()'s result and the best time to build it
+
+    Timing runs without tracemalloc, which slows every allocation down.
+    """
+    elapsed = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        build()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {size / 1024 / 1024:8.1f} MB  {size / len(result):7.0f} B/rekord  {elapsed:6.2f} s")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zużycie pamięci przez rekordy faktur")
+    parser.add_argument("--count", type=int, default=100_000, help="Liczba faktur")
+    args = parser.parse_args(argv)
+
+    # Rows are shared by all representations, so only the containers
+    # themselves are measured (field values are the same objects)
+    rows = make_rows(args.count)
+    print(f"{args.count} faktur")
+
+    measure("dict (TinyDB)", lambda: [dict(row) for row in rows])
+    measure("Record", lambda: [Record(row) for row in rows])
+    measure("dataclass Invoice", lambda: [Invoice(**row) for row in rows])
+    records = measure("InvoiceRecord", lambda: [InvoiceRecord.from_row(row) for row in rows])
+    measure("FrozenInvoiceRecord", lambda: [FrozenInvoiceRecord.from_row(row) for row in rows])
+
+    # Bulk loads (compact_by_id, freeze) pause the cyclic GC
+    def paused(build):
+        with gc_paused():
+            return build()
+    measure("dataclass (bez GC)", lambda: paused(lambda: [Invoice(**row) for row in rows]))
+    measure("InvoiceRecord (bez GC)", lambda: paused(lambda: [InvoiceRecord.from_row(row) for row in rows]))
+
+    invoices = [Invoice(**row) for row in rows[:20_000]]
+    start = time.perf_counter()
+    for invoice in invoices:
+        asdict(invoice)
+    asdict_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for record in records[:20_000]:
+        record.to_row()
+    to_row_time = time.perf_counter() - start
+    print(f"20000 x asdict(): {asdict_time:.3f} s | 20000 x to_row(): {to_row_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
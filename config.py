@@ -17,12 +17,24 @@ BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 BACKUP_DIR = DATA_DIR / "backups"
 EXPORTS_DIR = DATA_DIR / "exports"
+BLOBS_DIR = DATA_DIR / "blobs"
+THUMBS_DIR = DATA_DIR / "thumbs"
 DB_PATH = DATA_DIR / "faktury.json"
+SQLITE_DB_PATH = DATA_DIR / "faktury.sqlite3"
+
+# Storage backend: "tinydb" (faktury.json) or "sqlite" (faktury.sqlite3)
+DB_BACKEND = "tinydb"
+
+# TinyDB: append changed records to faktury.json.log (compacted in the
+# background) instead of rewriting faktury.json on every change
+DB_JOURNAL = True
 
 # Create directories if not exist
 DATA_DIR.mkdir(exist_ok=True)
 BACKUP_DIR.mkdir(exist_ok=True)
 EXPORTS_DIR.mkdir(exist_ok=True)
+BLOBS_DIR.mkdir(exist_ok=True)
+THUMBS_DIR.mkdir(exist_ok=True)
 
 # Theme colors (Dark theme like C# version)
 COLORS = {
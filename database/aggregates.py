@@ -0,0 +1,141 @@
+"""
+Materialized aggregates over invoices, fuel entries and drivers
+Kept up to date from database ChangeEvents in O(1) per change
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from database.events import ChangeEvent, INSERTED, UPDATED, REMOVED, RELOADED
+from database.records import Record
+
+
+def _cents(amount) -> int:
+    """Amount in grosze; integer sums do not drift when values are subtracted"""
+    try:
+        return round(float(amount or 0) * 100)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _month(record: Record) -> Optional[Tuple[int, int]]:
+    """(year, month) of a fuel entry's date"""
+    parsed = record.parsed('date')
+    if parsed is None:
+        return None
+    return parsed.year, parsed.month
+
+
+def payment_days(invoice: Record) -> Optional[int]:
+    """Days between issue and payment of a paid invoice"""
+    paid_date = invoice.parsed('paid_at')
+    issue_date = invoice.parsed('issue_date')
+    if paid_date is None or issue_date is None:
+        return None
+    try:
+        return (paid_date - issue_date).days
+    except TypeError:
+        return None  # naive and timezone-aware timestamps mixed
+
+
+class Aggregates:
+    """Totals and counts for the stats cards and FinancialSummary
+
+    Each change event subtracts the old record's contribution and adds the
+    new one, so no refresh ever walks the tables. A RELOADED event
+    recomputes that table once.
+    """
+
+    TABLES = ('invoices', 'fuel_entries', 'drivers')
+
+    def __init__(self, db):
+        self.db = db
+        for table in self.TABLES:
+            self._rebuild(table)
+        db.subscribe(self.on_change)
+
+    # Values
+    @property
+    def unpaid_total(self) -> float:
+        return self.unpaid_cents / 100
+
+    @property
+    def paid_total(self) -> float:
+        return self.paid_cents / 100
+
+    def fuel_total(self, year: int, month: int) -> float:
+        """Fuel cost in a calendar month"""
+        return self.fuel_cents.get((year, month), 0) / 100
+
+    def fuel_this_month(self) -> float:
+        now = datetime.now()
+        return self.fuel_total(now.year, now.month)
+
+    @property
+    def avg_payment_days(self) -> float:
+        """Average days from issue to payment over paid invoices"""
+        if not self.payment_days_count:
+            return 0
+        return self.payment_days_sum / self.payment_days_count
+
+    @property
+    def on_time_percent(self) -> float:
+        """Share of paid invoices paid on time"""
+        if not self.paid_count:
+            return 0
+        return self.on_time_count / self.paid_count * 100
+
+    # Maintenance
+    def on_change(self, event: ChangeEvent):
+        """Apply a database change event"""
+        if event.table not in self.TABLES:
+            return
+        if event.kind == RELOADED:
+            self._rebuild(event.table)
+            return
+        if event.kind in (UPDATED, REMOVED) and event.old is not None:
+            self._apply(event.table, event.old, -1)
+        if event.kind in (INSERTED, UPDATED) and event.new is not None:
+            self._apply(event.table, event.new, +1)
+
+    def _rebuild(self, table: str):
+        """Recompute one table's aggregates from scratch"""
+        if table == 'invoices':
+            self.unpaid_count = 0
+            self.unpaid_cents = 0
+            self.paid_count = 0
+            self.paid_cents = 0
+            self.payment_days_sum = 0
+            self.payment_days_count = 0
+            self.on_time_count = 0
+            records = self.db.get_invoices()
+        elif table == 'fuel_entries':
+            self.fuel_cents: Dict[Tuple[int, int], int] = {}
+            records = self.db.get_fuel_entries()
+        else:
+            self.driver_count = 0
+            records = self.db.get_drivers()
+        for record in records:
+            self._apply(table, record, +1)
+
+    def _apply(self, table: str, record: Record, sign: int):
+        """Add (sign=+1) or subtract (sign=-1) one record's contribution"""
+        if table == 'invoices':
+            cents = _cents(record.get('amount'))
+            if record.get('is_paid', False):
+                self.paid_count += sign
+                self.paid_cents += sign * cents
+                days = payment_days(record)
+                if days is not None:
+                    self.payment_days_sum += sign * days
+                    self.payment_days_count += sign
+                if record.get('paid_on_time', False):
+                    self.on_time_count += sign
+            else:
+                self.unpaid_count += sign
+                self.unpaid_cents += sign * cents
+        elif table == 'fuel_entries':
+            month = _month(record)
+            if month is not None:
+                self.fuel_cents[month] = self.fuel_cents.get(month, 0) + sign * _cents(record.get('amount'))
+        else:
+            self.driver_count += sign
@@ -0,0 +1,157 @@
+"""
+Content-addressed storage for invoice attachments
+Images are stored once as raw bytes under data/blobs, keyed by SHA-256
+"""
+
+import base64
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+import config
+
+
+# Invoice fields holding lists of image hashes
+IMAGE_FIELDS = ('invoice_images', 'cargo_images')
+
+# Unreferenced blobs newer than this (seconds) survive remove_unreferenced()
+GC_MIN_AGE = 24 * 60 * 60
+
+# Separator used by the legacy inline format: "data:image/png;base64,...|||data:..."
+LEGACY_SEPARATOR = "|||"
+
+
+class BlobStore:
+    """Stores raw bytes in files named by their SHA-256 digest"""
+
+    def __init__(self, root: Path = config.BLOBS_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, digest: str) -> Path:
+        """File path of a blob (sharded by the first two hex characters)"""
+        return self.root / digest[:2] / digest
+
+    def __contains__(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def put(self, data: bytes) -> str:
+        """Store bytes and return their digest; identical data is stored once"""
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.path(digest)
+        if target.exists():
+            return digest
+
+        target.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Read a blob; raises KeyError if it does not exist"""
+        try:
+            return self.path(digest).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+
+    def remove_unreferenced(self, referenced: Iterable[str], min_age: float = GC_MIN_AGE) -> int:
+        """Delete blobs that no record points to; returns number removed
+
+        Blobs younger than min_age seconds are kept: a dialog may have
+        stored them for an invoice that is not saved yet.
+        """
+        keep = set(referenced)
+        cutoff = time.time() - min_age
+        removed = 0
+        for blob in self.root.glob("??/*"):
+            if blob.name.startswith(".tmp-") or blob.name in keep:
+                continue
+            try:
+                if blob.stat().st_mtime > cutoff:
+                    continue
+                blob.unlink()
+            except FileNotFoundError:
+                continue
+            removed += 1
+        return removed
+
+
+def image_hashes(value) -> List[str]:
+    """Image hashes stored in an invoice image field"""
+    if isinstance(value, list):
+        return value
+    return []
+
+
+def referenced_images(db) -> Set[str]:
+    """Hashes of all images any invoice points to"""
+    referenced = set()
+    for invoice in db.iter_invoices():
+        for field in IMAGE_FIELDS:
+            referenced.update(image_hashes(invoice.get(field)))
+    return referenced
+
+
+def image_count(value) -> int:
+    """Number of images in a field (hash list or legacy inline string)"""
+    if isinstance(value, list):
+        return len(value)
+    if is_legacy_images(value):
+        return len([part for part in value.split(LEGACY_SEPARATOR) if part.strip()])
+    return 0
+
+
+def is_legacy_images(value) -> bool:
+    """True for the old inline base64 data-URI format"""
+    return isinstance(value, str) and bool(value)
+
+
+def decode_legacy_images(value: str) -> List[bytes]:
+    """Decode "data:...;base64,XXX|||data:..." into raw image bytes"""
+    images = []
+    for part in value.split(LEGACY_SEPARATOR):
+        part = part.strip()
+        if not part:
+            continue
+        if part.startswith("data:"):
+            part = part.split(",", 1)[1]
+        images.append(base64.b64decode(part))
+    return images
+
+
+def store_images(store: BlobStore, images: Iterable[bytes]) -> Optional[List[str]]:
+    """Put images into the store and return their de-duplicated hash list"""
+    hashes = []
+    for data in images:
+        digest = store.put(data)
+        if digest not in hashes:
+            hashes.append(digest)
+    return hashes or None
+
+
+def migrate_inline_images(db, store: BlobStore) -> int:
+    """Move legacy inline images of all invoices into the blob store
+
+    Returns the number of invoices that were rewritten.
+    """
+    migrated = 0
+    for invoice in db.get_invoices():
+        changes = {}
+        for field in IMAGE_FIELDS:
+            value = invoice.get(field)
+            if is_legacy_images(value):
+                changes[field] = store_images(store, decode_legacy_images(value))
+        if changes:
+            db.update_invoice(invoice['id'], changes)
+            migrated += 1
+    return migrated
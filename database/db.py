@@ -1,138 +1,509 @@
 """
 Database handler using TinyDB (JSON-based, similar to Firebase)
+
+The parsed JSON is cached in memory by AtomicJSONStorage and re-read only
+when faktury.json changes on disk. With config.DB_JOURNAL, changes are
+appended to faktury.json.log instead of rewriting the whole file. Every
+table has a version counter that is bumped on each mutation, so callers
+can cheaply tell whether data they hold is stale. Subscribers get a ChangeEvent for every mutation.
 """
 
-from tinydb import TinyDB, Query
+from contextlib import contextmanager
+from datetime import datetime
+from tinydb import TinyDB
+from tinydb.table import Document, Table
 from tinydb.operations import set as db_set
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
 import config
 from database.models import Invoice, Driver, FuelEntry, Vehicle, Company
+from database.deadlines import is_paid_on_time
+from database.events import ChangeEvent, ChangeNotifier, INSERTED, UPDATED, REMOVED, RELOADED
+from database.records import Record
+from database.query import Filters, Ranges, criteria, date_range, matches, page, parse_sort, sort_key
+from database import indexes
+from database.indexes import HashIndex, SortedIndex
+from database.sqlite_db import SQLiteDatabase
+from database.storage import AtomicJSONStorage, JournaledJSONStorage
+
+
+# Secondary indexes kept in memory and maintained on every mutation:
+# HashIndex for equality lookups, SortedIndex for range queries
+SECONDARY_INDEXES = {
+    'invoices': [(HashIndex, 'nip'), (HashIndex, 'is_paid'), (HashIndex, 'driver_id'),
+                 (SortedIndex, 'deadline')],
+    'fuel_entries': [(HashIndex, 'driver_id'), (HashIndex, 'vehicle_id'), (SortedIndex, 'date')],
+    'companies': [(HashIndex, 'nip')],
+}
+
 
+class StoredDocument(Document, Record):
+    """TinyDB document with the Record API (cached parsed dates)"""
 
-class Database:
+
+class Database(ChangeNotifier):
     """Database handler for all data operations"""
     
     def __init__(self, db_path: Path = config.DB_PATH):
-        self.db = TinyDB(db_path)
+        self._init_events()
+        storage = JournaledJSONStorage if config.DB_JOURNAL else AtomicJSONStorage
+        self.db = TinyDB(db_path, storage=storage)
+        self._storage: AtomicJSONStorage = self.db.storage
         self.invoices = self.db.table('invoices')
         self.drivers = self.db.table('drivers')
         self.fuel_entries = self.db.table('fuel_entries')
         self.vehicles = self.db.table('vehicles')
         self.companies = self.db.table('companies')
+        for table in self._tables():
+            table.document_class = StoredDocument
+        
+        # In-memory indexes: table name -> {record id -> TinyDB doc_id}
+        # and table name -> {field -> secondary index}
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._build_indexes()
+        
+        # Per-table version counters and the doc_ids of recent queries per version
+        self._versions: Dict[str, int] = {table.name: 0 for table in self._tables()}
+        self._query_cache: Dict[tuple, tuple] = {}
+    
+    # BATCHING
+    @contextmanager
+    def batch(self):
+        """Group mutations so the database file is written once, atomically
+        
+        Usage:
+            with db.batch():
+                db.add_fuel_entry(...)
+                db.mark_as_paid(...)
+        
+        If the block raises, none of its changes are written.
+        """
+        if self._storage.in_batch:
+            # Nested batch joins the outer one
+            yield self
+            return
+        
+        self._storage.begin()
+        self._hold_events()
+        try:
+            yield self
+        except BaseException:
+            self._storage.rollback()
+            self._reset()
+            self._drop_events([table.name for table in self._tables()])
+            raise
+        self._storage.commit()
+        self._release_events()
+    
+    # CACHING
+    def _tables(self) -> List[Table]:
+        return [self.invoices, self.drivers, self.fuel_entries, self.vehicles, self.companies]
+    
+    def table_version(self, name: str) -> int:
+        """Version counter of a table; changes whenever the table changes"""
+        self._sync()
+        return self._versions[name]
+    
+    def _logged(self, table: Table, doc_ids: List[int]):
+        """Tell the storage which documents the last write changed"""
+        self._storage.log(table.name, doc_ids)
+    
+    def _touch(self, table: Table):
+        """Record that a table was modified"""
+        self._versions[table.name] += 1
+    
+    def _changed(self, table: Table, kind: str, record_id: str,
+                 old: Optional[Dict] = None, new: Optional[Dict] = None):
+        """Bump the table version and notify subscribers"""
+        self._touch(table)
+        self._emit(ChangeEvent(table.name, kind, record_id, old, new))
+    
+    def refresh(self) -> bool:
+        """Pick up changes made to the database file by another process
+        
+        Emits RELOADED for every table and returns True if there were any.
+        """
+        if not self._storage.refresh():
+            return False
+        self._reset()
+        for table in self._tables():
+            self._emit(ChangeEvent(table.name, RELOADED))
+        return True
+    
+    def _sync(self):
+        """refresh() before every read and write"""
+        self.refresh()
+    
+    def _reset(self):
+        """Invalidate everything derived from the stored data"""
+        self.db.clear_cache()
+        for table in self._tables():
+            # Stored next doc_id may collide with documents added externally
+            table._next_id = None
+            self._touch(table)
+        self._build_indexes()
+    
+    def _all(self, table: Table) -> List[Dict]:
+        """All documents of a table (fresh copies; the storage caches the file)"""
+        self._sync()
+        return table.all()
+    
+    # QUERIES
+    def _select(self, table: Table, filters: Filters, ranges: Ranges,
+                sort: Optional[str]) -> List[int]:
+        """doc_ids of matching documents in sort order, cached until the table changes
+        
+        Paging through a result only filters and sorts the table once; only
+        the ids are kept, so callers always get their own documents.
+        """
+        self._sync()
+        version = self._versions[table.name]
+        key = (table.name, tuple(sorted(filters.items())), tuple(sorted(ranges.items())), sort)
+        cached = self._query_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        doc_ids = indexes.candidates(self._indexes.get(table.name, {}), filters, ranges)
+        if doc_ids is None:
+            docs = table.all()
+        else:
+            # Only the indexed candidates, in insertion (doc_id) order
+            docs = [table.get(doc_id=doc_id) for doc_id in sorted(doc_ids)]
+        records = [doc for doc in docs if doc is not None and matches(doc, filters, ranges)]
+        field, descending = parse_sort(sort)
+        if field:
+            records.sort(key=sort_key(field), reverse=descending)
+        
+        if len(self._query_cache) >= 32:
+            self._query_cache.clear()
+        selected = [doc.doc_id for doc in records]
+        self._query_cache[key] = (version, selected)
+        return selected
+    
+    def _docs(self, table: Table, doc_ids: List[int]) -> Iterator[Dict]:
+        """Fresh documents for doc_ids, skipping any removed since"""
+        for doc_id in doc_ids:
+            doc = table.get(doc_id=doc_id)
+            if doc is not None:
+                yield doc
+    
+    def _query(self, table: Table, filters: Filters, ranges: Ranges, sort: Optional[str],
+               limit: Optional[int], offset: int) -> List[Dict]:
+        """One page of matching documents"""
+        doc_ids = page(self._select(table, filters, ranges, sort), limit, offset)
+        return list(self._docs(table, doc_ids))
+    
+    # INDEXES
+    def _build_indexes(self):
+        """Build id and secondary indexes for all tables"""
+        for table in (self.invoices, self.drivers, self.fuel_entries, self.vehicles):
+            self._build_id_index(table)
+        for name, declared in SECONDARY_INDEXES.items():
+            self._indexes[name] = indexes.build(declared)
+            for doc in self.db.table(name).all():
+                self._index(name, doc.doc_id, None, doc)
+    
+    def _build_id_index(self, table: Table):
+        """Build the record id -> doc_id index for a table"""
+        self._ids[table.name] = {
+            doc['id']: doc.doc_id for doc in table.all() if 'id' in doc
+        }
+    
+    def _index(self, table_name: str, doc_id: int, old: Optional[Dict], new: Optional[Dict]):
+        """Move a document from its old to its new secondary index entries"""
+        for index in self._indexes.get(table_name, {}).values():
+            if old is not None:
+                index.remove(doc_id, old)
+            if new is not None:
+                index.add(doc_id, new)
+    
+    def _insert(self, table: Table, data: Dict) -> int:
+        """Insert a document and register it in the id index"""
+        self._sync()
+        doc_id = table.insert(data)
+        self._logged(table, [doc_id])
+        self._ids[table.name][data['id']] = doc_id
+        new = table.get(doc_id=doc_id)
+        self._index(table.name, doc_id, None, new)
+        self._changed(table, INSERTED, data['id'], new=new)
+        return doc_id
+    
+    def _insert_many(self, table: Table, records: List[Dict]) -> List[int]:
+        """Insert many documents with a single write and index them"""
+        self._sync()
+        doc_ids = table.insert_multiple(records)
+        self._logged(table, doc_ids)
+        index = self._ids[table.name]
+        for data, doc_id in zip(records, doc_ids):
+            index[data['id']] = doc_id
+            new = table.get(doc_id=doc_id)
+            self._index(table.name, doc_id, None, new)
+            self._changed(table, INSERTED, data['id'], new=new)
+        return doc_ids
+    
+    def _get(self, table: Table, record_id: str) -> Optional[Dict]:
+        """Get a document by record id using the index"""
+        self._sync()
+        doc_id = self._ids[table.name].get(record_id)
+        if doc_id is None:
+            return None
+        return table.get(doc_id=doc_id)
+    
+    def _update(self, table: Table, record_id: str, data: Dict) -> bool:
+        """Update a document by record id using the index"""
+        self._sync()
+        index = self._ids[table.name]
+        doc_id = index.get(record_id)
+        if doc_id is None:
+            return False
+        old = table.get(doc_id=doc_id)
+        table.update(data, doc_ids=[doc_id])
+        self._logged(table, [doc_id])
+        new_id = data.get('id', record_id)
+        if new_id != record_id:
+            del index[record_id]
+            index[new_id] = doc_id
+        new = table.get(doc_id=doc_id)
+        self._index(table.name, doc_id, old, new)
+        self._changed(table, UPDATED, record_id, old, new)
+        return True
+    
+    def _remove(self, table: Table, record_id: str) -> bool:
+        """Remove a document by record id using the index"""
+        self._sync()
+        doc_id = self._ids[table.name].pop(record_id, None)
+        if doc_id is None:
+            return False
+        old = table.get(doc_id=doc_id)
+        table.remove(doc_ids=[doc_id])
+        self._logged(table, [doc_id])
+        self._index(table.name, doc_id, old, None)
+        self._changed(table, REMOVED, record_id, old=old)
+        return True
         
     # INVOICES
     def add_invoice(self, invoice: Invoice) -> str:
         """Add new invoice"""
-        self.invoices.insert(invoice.to_dict())
+        self._insert(self.invoices, invoice.to_dict())
         return invoice.id
     
+    def add_invoices_bulk(self, invoices: List[Invoice]) -> List[str]:
+        """Add many invoices with a single database write"""
+        with self.batch():
+            self._insert_many(self.invoices, [invoice.to_dict() for invoice in invoices])
+        return [invoice.id for invoice in invoices]
+    
     def get_invoices(self) -> List[Dict]:
         """Get all invoices"""
-        return self.invoices.all()
+        return self._all(self.invoices)
     
     def get_invoice(self, invoice_id: str) -> Optional[Dict]:
         """Get invoice by ID"""
-        Query_ = Query()
-        result = self.invoices.search(Query_.id == invoice_id)
-        return result[0] if result else None
+        return self._get(self.invoices, invoice_id)
     
     def update_invoice(self, invoice_id: str, data: Dict) -> bool:
         """Update invoice"""
-        Query_ = Query()
-        return self.invoices.update(data, Query_.id == invoice_id)
+        return self._update(self.invoices, invoice_id, data)
     
     def delete_invoice(self, invoice_id: str) -> bool:
         """Delete invoice"""
-        Query_ = Query()
-        return self.invoices.remove(Query_.id == invoice_id)
+        return self._remove(self.invoices, invoice_id)
+    
+    def query_invoices(self, is_paid: Optional[bool] = None, nip: Optional[str] = None,
+                       date_from=None, date_to=None, sort: Optional[str] = None,
+                       limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Get one page of invoices
+        
+        date_from/date_to bound the deadline (to is exclusive); sort is a
+        field name, prefixed with '-' for descending order.
+        """
+        return self._query(self.invoices, criteria(is_paid=is_paid, nip=nip),
+                           date_range('deadline', date_from, date_to), sort, limit, offset)
+    
+    def iter_invoices(self, is_paid: Optional[bool] = None, nip: Optional[str] = None,
+                      date_from=None, date_to=None, sort: Optional[str] = None) -> Iterator[Dict]:
+        """Iterate all invoices matching the query_invoices() filters
+        
+        TinyDB keeps the whole database in memory, so this walks the
+        cached sorted doc_ids rather than a cursor.
+        """
+        doc_ids = self._select(self.invoices, criteria(is_paid=is_paid, nip=nip),
+                               date_range('deadline', date_from, date_to), sort)
+        return self._docs(self.invoices, doc_ids)
+    
+    def count_invoices(self, is_paid: Optional[bool] = None, nip: Optional[str] = None,
+                       date_from=None, date_to=None) -> int:
+        """Count invoices matching the query_invoices() filters"""
+        return len(self._select(self.invoices, criteria(is_paid=is_paid, nip=nip),
+                                date_range('deadline', date_from, date_to), None))
     
     def mark_as_paid(self, invoice_id: str, paid_at: str, paid_on_time: bool) -> bool:
         """Mark invoice as paid"""
-        Query_ = Query()
-        return self.invoices.update({
+        return self._update(self.invoices, invoice_id, {
             'is_paid': True,
             'paid_at': paid_at,
             'paid_on_time': paid_on_time
-        }, Query_.id == invoice_id)
+        })
+    
+    def mark_many_as_paid(self, invoice_ids: List[str], paid_at: str) -> int:
+        """Mark many invoices as paid with a single database write
+        
+        paid_on_time is derived per invoice from its deadline.
+        Returns the number of updated invoices.
+        """
+        self._sync()
+        paid_dt = datetime.fromisoformat(paid_at)
+        index = self._ids[self.invoices.name]
+        doc_ids = [index[invoice_id] for invoice_id in invoice_ids if invoice_id in index]
+        
+        def mark(doc):
+            doc.update(
+                is_paid=True,
+                paid_at=paid_at,
+                paid_on_time=is_paid_on_time(doc, paid_dt)
+            )
+        
+        if doc_ids:
+            old = {doc.doc_id: doc for doc in self.invoices.get(doc_ids=doc_ids)}
+            self.invoices.update(mark, doc_ids=doc_ids)
+            self._logged(self.invoices, doc_ids)
+            for doc in self.invoices.get(doc_ids=doc_ids):
+                self._index(self.invoices.name, doc.doc_id, old[doc.doc_id], doc)
+                self._changed(self.invoices, UPDATED, doc['id'], old[doc.doc_id], doc)
+        return len(doc_ids)
     
     # DRIVERS
     def add_driver(self, driver: Driver) -> str:
         """Add new driver"""
-        self.drivers.insert(driver.to_dict())
+        self._insert(self.drivers, driver.to_dict())
         return driver.id
     
     def get_drivers(self) -> List[Dict]:
         """Get all drivers"""
-        return self.drivers.all()
+        return self._all(self.drivers)
     
     def get_driver(self, driver_id: str) -> Optional[Dict]:
         """Get driver by ID"""
-        Query_ = Query()
-        result = self.drivers.search(Query_.id == driver_id)
-        return result[0] if result else None
+        return self._get(self.drivers, driver_id)
+    
+    def query_drivers(self, sort: Optional[str] = "name", limit: Optional[int] = None,
+                      offset: int = 0) -> List[Dict]:
+        """Get one page of drivers"""
+        return self._query(self.drivers, {}, {}, sort, limit, offset)
+    
+    def iter_drivers(self, sort: Optional[str] = "name") -> Iterator[Dict]:
+        """Iterate all drivers (from memory, see iter_invoices)"""
+        return self._docs(self.drivers, self._select(self.drivers, {}, {}, sort))
+    
+    def count_drivers(self) -> int:
+        """Count drivers"""
+        return len(self._select(self.drivers, {}, {}, None))
     
     def update_driver(self, driver_id: str, data: Dict) -> bool:
         """Update driver"""
-        Query_ = Query()
-        return self.drivers.update(data, Query_.id == driver_id)
+        return self._update(self.drivers, driver_id, data)
     
     def delete_driver(self, driver_id: str) -> bool:
         """Delete driver"""
-        Query_ = Query()
-        return self.drivers.remove(Query_.id == driver_id)
+        return self._remove(self.drivers, driver_id)
     
     # FUEL ENTRIES
     def add_fuel_entry(self, fuel: FuelEntry) -> str:
         """Add new fuel entry"""
-        self.fuel_entries.insert(fuel.to_dict())
+        self._insert(self.fuel_entries, fuel.to_dict())
         return fuel.id
     
+    def add_fuel_entries_bulk(self, entries: List[FuelEntry]) -> List[str]:
+        """Add many fuel entries with a single database write"""
+        with self.batch():
+            self._insert_many(self.fuel_entries, [fuel.to_dict() for fuel in entries])
+        return [fuel.id for fuel in entries]
+    
     def get_fuel_entries(self) -> List[Dict]:
         """Get all fuel entries"""
-        return self.fuel_entries.all()
+        return self._all(self.fuel_entries)
+    
+    def query_fuel_entries(self, driver_id: Optional[str] = None, vehicle_id: Optional[str] = None,
+                           date_from=None, date_to=None, sort: Optional[str] = "-date",
+                           limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Get one page of fuel entries (newest first by default)"""
+        return self._query(self.fuel_entries, criteria(driver_id=driver_id, vehicle_id=vehicle_id),
+                           date_range('date', date_from, date_to), sort, limit, offset)
+    
+    def iter_fuel_entries(self, driver_id: Optional[str] = None, vehicle_id: Optional[str] = None,
+                          date_from=None, date_to=None, sort: Optional[str] = "-date") -> Iterator[Dict]:
+        """Iterate all fuel entries matching the query_fuel_entries() filters (from memory)"""
+        doc_ids = self._select(self.fuel_entries, criteria(driver_id=driver_id, vehicle_id=vehicle_id),
+                               date_range('date', date_from, date_to), sort)
+        return self._docs(self.fuel_entries, doc_ids)
+    
+    def count_fuel_entries(self, driver_id: Optional[str] = None, vehicle_id: Optional[str] = None,
+                           date_from=None, date_to=None) -> int:
+        """Count fuel entries matching the query_fuel_entries() filters"""
+        return len(self._select(self.fuel_entries, criteria(driver_id=driver_id, vehicle_id=vehicle_id),
+                                date_range('date', date_from, date_to), None))
     
     def delete_fuel_entry(self, fuel_id: str) -> bool:
         """Delete fuel entry"""
-        Query_ = Query()
-        return self.fuel_entries.remove(Query_.id == fuel_id)
+        return self._remove(self.fuel_entries, fuel_id)
     
     # VEHICLES
     def add_vehicle(self, vehicle: Vehicle) -> str:
         """Add new vehicle"""
-        self.vehicles.insert(vehicle.to_dict())
+        self._insert(self.vehicles, vehicle.to_dict())
         return vehicle.id
     
     def get_vehicles(self) -> List[Dict]:
         """Get all vehicles"""
-        return self.vehicles.all()
+        return self._all(self.vehicles)
     
     def delete_vehicle(self, vehicle_id: str) -> bool:
         """Delete vehicle"""
-        Query_ = Query()
-        return self.vehicles.remove(Query_.id == vehicle_id)
+        return self._remove(self.vehicles, vehicle_id)
     
     # COMPANIES
+    def _company_doc_id(self, nip: str) -> Optional[int]:
+        """doc_id of a company found through the nip index"""
+        doc_ids = self._indexes['companies']['nip'].lookup(nip)
+        return min(doc_ids) if doc_ids else None
+    
     def get_or_create_company(self, nip: str, name: str) -> Dict:
         """Get or create company by NIP"""
-        Query_ = Query()
-        result = self.companies.search(Query_.nip == nip)
-        if result:
-            return result[0]
+        self._sync()
+        doc_id = self._company_doc_id(nip)
+        if doc_id is not None:
+            return self.companies.get(doc_id=doc_id)
         else:
             company = Company(nip=nip, name=name)
-            self.companies.insert(company.to_dict())
+            doc_id = self.companies.insert(company.to_dict())
+            self._logged(self.companies, [doc_id])
+            self._index(self.companies.name, doc_id, None, company.to_dict())
+            self._changed(self.companies, INSERTED, nip, new=company.to_dict())
             return company.to_dict()
     
     def update_company_score(self, nip: str, score_delta: int) -> bool:
         """Update company score"""
-        Query_ = Query()
-        company = self.companies.search(Query_.nip == nip)
-        if company:
-            new_score = company[0].get('score', 0) + score_delta
-            return self.companies.update({'score': new_score}, Query_.nip == nip)
+        self._sync()
+        doc_id = self._company_doc_id(nip)
+        if doc_id is not None:
+            company = self.companies.get(doc_id=doc_id)
+            new_score = company.get('score', 0) + score_delta
+            self.companies.update({'score': new_score}, doc_ids=[doc_id])
+            self._logged(self.companies, [doc_id])
+            self._changed(self.companies, UPDATED, nip, company, {**company, 'score': new_score})
+            return True
         return False
     
     def close(self):
         """Close database"""
         self.db.close()
+
+
+def create_database():
+    """Open the database backend selected by config.DB_BACKEND"""
+    if config.DB_BACKEND == "sqlite":
+        return SQLiteDatabase()
+    if config.DB_BACKEND == "tinydb":
+        return Database()
+    raise ValueError(f"Unknown database backend: {config.DB_BACKEND}")
@@ -0,0 +1,89 @@
+"""
+Unpaid invoices ordered by deadline
+Kept up to date from database ChangeEvents, so finding overdue and
+near-due invoices never scans or re-parses the whole table
+"""
+
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Tuple
+from database.events import ChangeEvent, INSERTED, UPDATED, REMOVED, RELOADED
+from database.records import Record, parsed_date
+
+
+def local_deadline(invoice: Mapping) -> Optional[datetime]:
+    """Deadline as a naive local datetime (None if missing or invalid)"""
+    deadline = parsed_date(invoice, 'deadline')
+    if deadline is not None and deadline.tzinfo is not None:
+        deadline = deadline.astimezone().replace(tzinfo=None)
+    return deadline
+
+
+def is_paid_on_time(invoice: Mapping, paid_at: datetime) -> bool:
+    """Whether a payment at paid_at meets the invoice's deadline
+
+    Both are compared as naive local times; True only if the invoice has
+    no deadline (or one that is not a date).
+    """
+    deadline = local_deadline(invoice)
+    if deadline is None:
+        return True
+    if paid_at.tzinfo is not None:
+        paid_at = paid_at.astimezone().replace(tzinfo=None)
+    return paid_at <= deadline
+
+
+class DeadlineQueue:
+    """Sorted index of unpaid invoices keyed by parsed deadline"""
+
+    def __init__(self, db):
+        self.db = db
+        self._rebuild()
+        db.subscribe(self.on_change)
+
+    def due_before(self, horizon: datetime, limit: Optional[int] = None) -> List[Tuple[datetime, Dict]]:
+        """(deadline, invoice) pairs with deadline < horizon, earliest first"""
+        end = bisect_left(self.entries, (horizon,))
+        if limit is not None:
+            end = min(end, limit)
+        return [(deadline, self.invoices[invoice_id]) for deadline, invoice_id in self.entries[:end]]
+
+    def count_before(self, horizon: datetime) -> int:
+        """Number of unpaid invoices with deadline < horizon"""
+        return bisect_left(self.entries, (horizon,))
+
+    # Maintenance
+    def on_change(self, event: ChangeEvent):
+        """Apply a database change event"""
+        if event.table != 'invoices':
+            return
+        if event.kind == RELOADED:
+            self._rebuild()
+            return
+        if event.kind in (UPDATED, REMOVED) and event.old is not None:
+            self._remove(event.old)
+        if event.kind in (INSERTED, UPDATED) and event.new is not None:
+            self._add(event.new)
+
+    def _rebuild(self):
+        self.entries: List[Tuple[datetime, str]] = []
+        self.invoices: Dict[str, Dict] = {}
+        for invoice in self.db.get_invoices():
+            self._add(invoice)
+
+    def _add(self, invoice: Record):
+        if invoice.get('is_paid', False):
+            return
+        deadline = local_deadline(invoice)
+        if deadline is None:
+            return
+        insort(self.entries, (deadline, invoice['id']))
+        self.invoices[invoice['id']] = invoice
+
+    def _remove(self, invoice: Record):
+        if self.invoices.pop(invoice.get('id'), None) is None:
+            return
+        entry = (local_deadline(invoice), invoice['id'])
+        i = bisect_left(self.entries, entry)
+        if i < len(self.entries) and self.entries[i] == entry:
+            del self.entries[i]
@@ -0,0 +1,68 @@
+"""
+Change events emitted by the database handlers
+Lets the GUI patch what changed instead of reloading everything
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+
+# Event kinds
+INSERTED = "inserted"
+UPDATED = "updated"
+REMOVED = "removed"
+RELOADED = "reloaded"  # whole table changed (external edit, rolled back batch)
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A single change of one record (or a whole table for RELOADED)"""
+    table: str
+    kind: str
+    id: Optional[str] = None
+    old: Optional[dict] = None  # record before the change (UPDATED, REMOVED)
+    new: Optional[dict] = None  # record after the change (INSERTED, UPDATED)
+
+
+class ChangeNotifier:
+    """Mixin with subscribe/unsubscribe and batch-aware event delivery
+
+    Events raised inside a batch are queued and delivered only after the
+    batch has been written; a rolled back batch delivers RELOADED instead.
+    """
+
+    def _init_events(self):
+        self._listeners: List[Callable[[ChangeEvent], None]] = []
+        self._queued_events: Optional[List[ChangeEvent]] = None
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]):
+        """Call callback(event) after every change"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]):
+        """Stop delivering events to callback"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, event: ChangeEvent):
+        if self._queued_events is not None:
+            self._queued_events.append(event)
+            return
+        for callback in list(self._listeners):
+            callback(event)
+
+    def _hold_events(self):
+        """Start queueing events (batch begins)"""
+        self._queued_events = []
+
+    def _release_events(self):
+        """Deliver queued events (batch committed)"""
+        events, self._queued_events = self._queued_events or [], None
+        for event in events:
+            self._emit(event)
+
+    def _drop_events(self, tables: List[str]):
+        """Discard queued events and announce reloads (batch rolled back)"""
+        self._queued_events = None
+        for table in tables:
+            self._emit(ChangeEvent(table, RELOADED))
@@ -0,0 +1,106 @@
+"""
+In-memory secondary indexes for the TinyDB handler
+Map field values to TinyDB doc_ids so lookups do not scan whole tables
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Set, Tuple
+from database.query import field_value
+
+
+class HashIndex:
+    """Equality index: field value -> doc_ids"""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.entries: Dict[Any, Set[int]] = {}
+
+    def add(self, doc_id: int, record: Dict):
+        try:
+            self.entries.setdefault(field_value(record, self.field), set()).add(doc_id)
+        except TypeError:
+            pass  # unhashable value (list, dict) is never looked up
+
+    def remove(self, doc_id: int, record: Dict):
+        value = field_value(record, self.field)
+        try:
+            doc_ids = self.entries.get(value)
+        except TypeError:
+            return
+        if doc_ids is not None:
+            doc_ids.discard(doc_id)
+            if not doc_ids:
+                del self.entries[value]
+
+    def lookup(self, value) -> Set[int]:
+        """doc_ids of records whose field equals value"""
+        return self.entries.get(value, set())
+
+    def clear(self):
+        self.entries = {}
+
+
+class SortedIndex:
+    """Range index: (field value, doc_id) pairs kept sorted
+
+    Only string (ISO date) values are indexed; ranges never match anything
+    else, and mixing types in one list would make insort() raise.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.entries: List[Tuple[str, int]] = []
+
+    def add(self, doc_id: int, record: Dict):
+        value = record.get(self.field)
+        if isinstance(value, str):
+            insort(self.entries, (value, doc_id))
+
+    def remove(self, doc_id: int, record: Dict):
+        value = record.get(self.field)
+        if not isinstance(value, str):
+            return
+        i = bisect_left(self.entries, (value, doc_id))
+        if i < len(self.entries) and self.entries[i] == (value, doc_id):
+            del self.entries[i]
+
+    def range(self, low=None, high=None) -> List[int]:
+        """doc_ids with low <= value < high in value order; None = open"""
+        start = 0 if low is None else bisect_left(self.entries, (low,))
+        end = len(self.entries) if high is None else bisect_left(self.entries, (high,))
+        return [doc_id for _value, doc_id in self.entries[start:end]]
+
+    def clear(self):
+        self.entries = []
+
+
+def build(entries) -> Dict[str, Any]:
+    """Create fresh indexes from (index class, field) declarations"""
+    return {field: index_class(field) for index_class, field in entries}
+
+
+def candidates(indexes: Dict[str, Any], filters: Dict[str, Any],
+               ranges: Dict[str, tuple]) -> Optional[List[int]]:
+    """Smallest set of doc_ids that can satisfy the criteria
+
+    Returns None if no criterion is indexed (caller has to scan). The
+    result is a superset; records still have to be checked against all
+    criteria.
+    """
+    best = None
+    for field, value in filters.items():
+        index = indexes.get(field)
+        if isinstance(index, HashIndex):
+            try:
+                found = index.lookup(value)
+            except TypeError:
+                continue
+            if best is None or len(found) < len(best):
+                best = found
+    for field, (low, high) in ranges.items():
+        index = indexes.get(field)
+        if isinstance(index, SortedIndex):
+            found = index.range(low, high)
+            if best is None or len(found) < len(best):
+                best = found
+    return None if best is None else list(best)
@@ -0,0 +1,236 @@
+"""
+Migration from the TinyDB JSON file to the SQLite backend
+The JSON document is parsed incrementally, one record at a time
+"""
+
+import codecs
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from database.sqlite_db import SQLiteDatabase, TABLES
+
+
+class TinyDBJsonReader:
+    """Incremental reader for TinyDB's {"table": {"doc_id": {...}}} layout
+
+    Only one record is decoded at a time, so memory use is bounded by the
+    largest single record rather than by the whole file.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = 1 << 20):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.total_bytes = self.path.stat().st_size
+        self.bytes_read = 0
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._file = None
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Tuple[str, str, Dict]]:
+        """Yield (table, doc_id, record) tuples"""
+        with open(self.path, 'rb') as self._file:
+            if not self._peek():
+                return  # empty file = empty database
+            self._expect('{')
+            if self._peek() == '}':
+                return
+            while True:
+                table = self._read_value(str)
+                self._expect(':')
+                yield from self._iter_table(table)
+                if self._next_separator('}'):
+                    return
+
+    def _iter_table(self, table: str) -> Iterator[Tuple[str, str, Dict]]:
+        """Yield records of one table object"""
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            doc_id = self._read_value(str)
+            self._expect(':')
+            record = self._read_value(dict)
+            yield table, doc_id, record
+            if self._next_separator('}'):
+                return
+
+    def _fill(self, min_chars: int) -> bool:
+        """Read more data into the buffer; returns False at end of file"""
+        if self._eof:
+            return False
+        # Drop the consumed prefix before growing the buffer
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        chunk = self._file.read(max(self.chunk_size, min_chars))
+        self.bytes_read += len(chunk)
+        self._buf += self._utf8.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+        return True
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(0):
+                return ''
+
+    def _expect(self, char: str):
+        """Consume an expected structural character"""
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Nieprawidłowy JSON: oczekiwano '{char}', znaleziono '{found}'")
+        self._pos += 1
+
+    def _next_separator(self, closing: str) -> bool:
+        """Consume ',' or the closing bracket; True if the object ended"""
+        found = self._peek()
+        if found == ',':
+            self._pos += 1
+            return False
+        self._expect(closing)
+        return True
+
+    def _read_value(self, expected_type: type):
+        """Decode the next string or object, reading more data as needed"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete value: grow the buffer geometrically and retry
+                if not self._fill(len(self._buf) - self._pos):
+                    raise
+                continue
+            if not isinstance(value, expected_type):
+                raise ValueError(f"Nieprawidłowy JSON: oczekiwano {expected_type.__name__}")
+            self._pos = end
+            return value
+
+
+def _canonical(value):
+    """Normalize a value so JSON and SQLite copies hash identically"""
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def record_checksum(record: Dict) -> int:
+    """SHA-256 of a record's canonical JSON form as an integer"""
+    payload = json.dumps(_canonical(record), sort_keys=True, ensure_ascii=False)
+    return int.from_bytes(hashlib.sha256(payload.encode('utf-8')).digest(), 'big')
+
+
+class TableDigest:
+    """Order-independent row count and checksum of a table"""
+
+    def __init__(self):
+        self.count = 0
+        self.checksum = 0
+
+    def add(self, record: Dict):
+        self.count += 1
+        self.checksum = (self.checksum + record_checksum(record)) % (1 << 256)
+
+    def __eq__(self, other):
+        return self.count == other.count and self.checksum == other.checksum
+
+    def hexdigest(self) -> str:
+        return f"{self.checksum:064x}"
+
+
+def migrate(json_path: Path, sqlite_path: Path, batch_size: int = 500,
+            progress: Optional[Callable[[str], None]] = print,
+            progress_every: float = 1.0) -> Dict[str, int]:
+    """Stream all records from the JSON file into a SQLite database
+
+    Records are inserted in transactions of batch_size rows. Returns the
+    number of migrated rows per table.
+    """
+    reader = TinyDBJsonReader(json_path)
+    db = SQLiteDatabase(sqlite_path)
+    counts: Dict[str, int] = {}
+    batch = []
+    batch_table = None
+    started = last_report = time.perf_counter()
+    total = 0
+
+    def flush():
+        if batch:
+            db.insert_records(batch_table, batch)
+            batch.clear()
+
+    try:
+        for table, _doc_id, record in reader:
+            if table not in TABLES:
+                if table not in counts and progress:
+                    progress(f"Pomijam nieznaną tabelę: {table}")
+                counts.setdefault(table, 0)
+                continue
+            if table != batch_table:
+                flush()
+                batch_table = table
+            batch.append(record)
+            counts[table] = counts.get(table, 0) + 1
+            total += 1
+            if len(batch) >= batch_size:
+                flush()
+
+            now = time.perf_counter()
+            if progress and now - last_report >= progress_every:
+                last_report = now
+                percent = reader.bytes_read / reader.total_bytes * 100 if reader.total_bytes else 100
+                progress(f"{percent:5.1f}% | {table}: {counts[table]} | "
+                         f"razem {total} ({total / (now - started):,.0f} rekordów/s)")
+        flush()
+    finally:
+        db.close()
+
+    if progress:
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else total
+        progress(f"Zmigrowano {total} rekordów w {elapsed:.1f} s ({rate:,.0f} rekordów/s)")
+    return {table: count for table, count in counts.items() if table in TABLES}
+
+
+def verify(json_path: Path, sqlite_path: Path,
+           progress: Optional[Callable[[str], None]] = print) -> bool:
+    """Compare row counts and checksums of every table in both stores"""
+    source = {table: TableDigest() for table in TABLES}
+    for table, _doc_id, record in TinyDBJsonReader(json_path):
+        if table in source:
+            source[table].add(record)
+
+    target = {table: TableDigest() for table in TABLES}
+    db = SQLiteDatabase(sqlite_path)
+    try:
+        for table in TABLES:
+            for record in db.iter_records(table):
+                target[table].add(record)
+    finally:
+        db.close()
+
+    ok = True
+    for table in TABLES:
+        match = source[table] == target[table]
+        ok = ok and match
+        if progress:
+            status = "OK" if match else "NIEZGODNOŚĆ"
+            progress(f"{table:<14} JSON {source[table].count:>8} | SQLite {target[table].count:>8} | "
+                     f"{source[table].hexdigest()[:16]} / {target[table].hexdigest()[:16]} | {status}")
+    return ok
@@ -24,8 +24,8 @@ class Invoice:
     is_paid: bool = False
     paid_at: Optional[str] = None
     paid_on_time: Optional[bool] = None
-    invoice_images: Optional[str] = None  # Base64 encoded
-    cargo_images: Optional[str] = None  # Base64 encoded
+    invoice_images: Optional[List[str]] = None  # SHA-256 hashes in BlobStore
+    cargo_images: Optional[List[str]] = None  # SHA-256 hashes in BlobStore
     contact_phone: Optional[str] = None
     loading_location: Optional[dict] = None  # {city: str, address: str}
     unloading_location: Optional[dict] = None
@@ -0,0 +1,97 @@
+"""
+Filtering, sorting and paging helpers shared by the database handlers
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# field -> value that must match exactly
+Filters = Dict[str, Any]
+# field -> (lower bound inclusive, upper bound exclusive); None = open
+Ranges = Dict[str, Tuple[Optional[str], Optional[str]]]
+
+# Value assumed for fields missing (or null) in old or partial rows, so
+# filters agree with the aggregates that read them with the same default
+DEFAULTS: Dict[str, Any] = {'is_paid': False}
+
+
+def field_value(record: Dict, name: str):
+    """record's value for name, DEFAULTS applying when it is missing"""
+    value = record.get(name)
+    return DEFAULTS.get(name) if value is None else value
+
+
+def iso(value) -> Optional[str]:
+    """Accept ISO strings as well as date/datetime bounds"""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def criteria(**values) -> Filters:
+    """Keep only the criteria that were given (not None)"""
+    return {name: value for name, value in values.items() if value is not None}
+
+
+def date_range(field: str, date_from=None, date_to=None) -> Ranges:
+    """Range on an ISO date field; date_to is exclusive"""
+    if date_from is None and date_to is None:
+        return {}
+    return {field: (iso(date_from), iso(date_to))}
+
+
+def parse_sort(sort: Optional[str]) -> Tuple[Optional[str], bool]:
+    """'field' or '-field' -> (field, descending)"""
+    if not sort:
+        return None, False
+    if sort.startswith('-'):
+        return sort[1:], True
+    return sort, False
+
+
+def sort_key(field: str) -> Callable[[Dict], tuple]:
+    """Sort key ordering values like SQLite: missing, numbers, strings, others
+
+    Ranking by type first keeps old rows holding a number or a list in a
+    date field from making the sort raise TypeError.
+    """
+    def key(record: Dict) -> tuple:
+        value = record.get(field)
+        if value is None:
+            return (0, 0)
+        if isinstance(value, (int, float)):
+            return (1, value)
+        if isinstance(value, str):
+            return (2, value)
+        return (3, repr(value))
+    return key
+
+
+def in_range(value, low: Optional[str], high: Optional[str]) -> bool:
+    """low <= value < high, with None bounds open and non-string values excluded"""
+    if not isinstance(value, str):
+        return False
+    if low is not None and value < low:
+        return False
+    if high is not None and value >= high:
+        return False
+    return True
+
+
+def matches(record: Dict, filters: Filters, ranges: Ranges) -> bool:
+    """Whether a record satisfies all equality filters and ranges"""
+    for name, value in filters.items():
+        if field_value(record, name) != value:
+            return False
+    for name, (low, high) in ranges.items():
+        if not in_range(record.get(name), low, high):
+            return False
+    return True
+
+
+def page(records: List, limit: Optional[int], offset: int) -> List:
+    """Slice one page out of an ordered result"""
+    end = None if limit is None else offset + limit
+    return records[offset:end]
+
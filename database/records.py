@@ -0,0 +1,289 @@
+"""
+Record types returned by the database handlers and held by the GUI
+ISO date fields are parsed at most once per loaded record
+"""
+
+from collections.abc import Mapping
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from database.models import Invoice, Driver, FuelEntry, Vehicle
+from database.snapshot_cache import gc_paused
+
+
+def parse_datetime(value) -> Optional[datetime]:
+    """Parse an ISO date/datetime string ('Z' suffix allowed); None if invalid"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def parsed_date(record: Mapping, field: str) -> Optional[datetime]:
+    """Date field of any mapping as datetime; Records answer from their cache"""
+    parsed = getattr(record, 'parsed', None)
+    if parsed is not None:
+        return parsed(field)
+    return parse_datetime(record.get(field))
+
+
+def formatted_date(record: Mapping, field: str, fmt: str, default: str = '') -> str:
+    """Date field of any mapping formatted with strftime, or default if not a date"""
+    value = parsed_date(record, field)
+    return value.strftime(fmt) if value is not None else default
+
+
+class Record(dict):
+    """A stored record (plain dict API) with cached parsed date fields
+
+    parsed('deadline') parses the ISO string the first time and returns the
+    cached datetime afterwards. Records are snapshots; changing a field
+    drops the cache.
+    """
+
+    def parsed(self, field: str) -> Optional[datetime]:
+        """Field value as datetime (None if missing or invalid)"""
+        cache = self.__dict__.setdefault('_parsed', {})
+        try:
+            return cache[field]
+        except KeyError:
+            value = cache[field] = parse_datetime(self.get(field))
+            return value
+
+    def formatted(self, field: str, fmt: str, default: str = '') -> str:
+        """Date field formatted with strftime, or default if not a date"""
+        value = self.parsed(field)
+        return value.strftime(fmt) if value is not None else default
+
+    def __setitem__(self, key, value):
+        self.__dict__.pop('_parsed', None)
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        self.__dict__.pop('_parsed', None)
+        super().update(*args, **kwargs)
+
+
+class _Missing:
+    """Marker for fields absent from the stored row"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __reduce__(self):
+        return 'MISSING'  # unpickles to the module-level singleton
+
+
+MISSING = _Missing()
+
+
+def _compile_fill(names: Tuple[str, ...]):
+    """fill(record, **row) storing each field of row (or MISSING) in its slot
+
+    Generated once per record type (like namedtuple and dataclasses do):
+    the interpreter matches the row's keys to keyword parameters in C, so
+    there is no per-field lookup or MISSING check in Python, and unknown
+    keys arrive in **extra. record is positional-only, so a row key of
+    that name lands in extra too.
+    """
+    params = ", ".join(f"{name}=MISSING" for name in names)
+    lines = [f"def fill(record, /, {params}, **extra):"]
+    lines += [f"    record.{name} = {name}" for name in names]
+    lines += ["    record._extra = extra or None", "    record._parsed = None"]
+    namespace = {'MISSING': MISSING}
+    exec("\n".join(lines), namespace)
+    return namespace['fill']
+
+
+def _restore(cls, values, extra):
+    """Unpickle a CompactRecord (also works for frozen types)"""
+    record = cls.__new__(cls)
+    for name, value in zip(cls.FIELDS, values):
+        object.__setattr__(record, name, value)
+    object.__setattr__(record, '_extra', extra)
+    object.__setattr__(record, '_parsed', None)
+    return record
+
+
+class CompactRecord(Mapping):
+    """Slotted record with the dict read API
+
+    One slot per model field instead of a per-record dict, which cuts the
+    memory of large lists of records several times. Fields missing from
+    the stored row stay absent (get() returns the default); keys unknown to
+    the model are kept in a small side dict.
+    """
+
+    __slots__ = ('_extra', '_parsed')
+    FIELDS: Tuple[str, ...] = ()
+    frozen = False
+    _field_set = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'FIELDS' in cls.__dict__:
+            cls._field_set = frozenset(cls.FIELDS)
+            cls._fill = staticmethod(_compile_fill(cls.FIELDS))
+            cls._mutable = cls
+
+    @classmethod
+    def from_row(cls, row: Mapping) -> 'CompactRecord':
+        """Build from a stored dict (string keys) without copying nested values"""
+        # Filled as the mutable type; frozen types share its slot layout
+        record = object.__new__(cls._mutable)
+        cls._fill(record, **row)
+        if cls is not cls._mutable:
+            record.__class__ = cls
+        return record
+
+    def to_row(self) -> Dict[str, Any]:
+        """Shallow dict of the present fields (no recursive deep copy)"""
+        row = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not MISSING:
+                row[name] = value
+        if self._extra:
+            row.update(self._extra)
+        return row
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            value = getattr(self, key)
+            if value is not MISSING:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            value = getattr(self, key)
+            return default if value is MISSING else value
+        if self._extra:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if getattr(self, name) is not MISSING:
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        return _restore, (type(self), tuple(getattr(self, name) for name in self.FIELDS), self._extra)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_row()!r})"
+
+    def parsed(self, field: str) -> Optional[datetime]:
+        """Field value as datetime (None if missing or invalid)"""
+        cache = self._parsed
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, '_parsed', cache)
+        raw = self.get(field)
+        cached = cache.get(field)
+        # Keyed on the raw value, so assigning the field needs no invalidation
+        if cached is None or cached[0] is not raw:
+            cached = cache[field] = (raw, parse_datetime(raw))
+        return cached[1]
+
+    def formatted(self, field: str, fmt: str, default: str = '') -> str:
+        """Date field formatted with strftime, or default if not a date"""
+        value = self.parsed(field)
+        return value.strftime(fmt) if value is not None else default
+
+
+def _field_names(model) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(model))
+
+
+class InvoiceRecord(CompactRecord):
+    __slots__ = FIELDS = _field_names(Invoice)
+
+
+class DriverRecord(CompactRecord):
+    __slots__ = FIELDS = _field_names(Driver)
+
+
+class FuelEntryRecord(CompactRecord):
+    __slots__ = FIELDS = _field_names(FuelEntry)
+
+
+class VehicleRecord(CompactRecord):
+    __slots__ = FIELDS = _field_names(Vehicle)
+
+
+class _Frozen:
+    """Mixin rejecting attribute assignment"""
+    __slots__ = ()
+    frozen = True
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenInvoiceRecord(_Frozen, InvoiceRecord):
+    __slots__ = ()
+
+
+class FrozenDriverRecord(_Frozen, DriverRecord):
+    __slots__ = ()
+
+
+class FrozenFuelEntryRecord(_Frozen, FuelEntryRecord):
+    __slots__ = ()
+
+
+class FrozenVehicleRecord(_Frozen, VehicleRecord):
+    __slots__ = ()
+
+
+# table name -> (mutable type, frozen type)
+RECORD_TYPES = {
+    'invoices': (InvoiceRecord, FrozenInvoiceRecord),
+    'drivers': (DriverRecord, FrozenDriverRecord),
+    'fuel_entries': (FuelEntryRecord, FrozenFuelEntryRecord),
+    'vehicles': (VehicleRecord, FrozenVehicleRecord),
+}
+
+
+def compact(table: str, row: Mapping, frozen: bool = False) -> CompactRecord:
+    """Compact record for a row of one of the RECORD_TYPES tables"""
+    return RECORD_TYPES[table][frozen].from_row(row)
+
+
+def compact_by_id(table: str, rows: Iterable[Mapping]) -> Dict[str, CompactRecord]:
+    """{id: compact record} for many rows of one table
+
+    Built with the cyclic GC paused: it would otherwise run many times over
+    the new records and find nothing to free.
+    """
+    record_type = RECORD_TYPES[table][0]
+    with gc_paused():
+        return {row['id']: record_type.from_row(row) for row in rows}
+
+
+def freeze(table: str, records: Iterable[Mapping]) -> Tuple[CompactRecord, ...]:
+    """Read-only snapshot of records, safe to hand to a worker thread
+
+    Later edits replace the GUI's records instead of changing them, so the
+    snapshot keeps showing the state at the time it was taken.
+    """
+    frozen_type = RECORD_TYPES[table][1]
+    with gc_paused():
+        return tuple(frozen_type.from_row(record) for record in records)
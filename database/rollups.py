@@ -0,0 +1,153 @@
+"""
+Monthly and per-driver rollups for the balance view
+Buckets are computed once and kept up to date from database ChangeEvents;
+a changed record only touches the buckets it falls into
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+from database.aggregates import _cents, _month
+from database.events import ChangeEvent, INSERTED, UPDATED, REMOVED, RELOADED
+from database.records import Record
+
+
+def _meters(distance) -> int:
+    """calculated_distance (km) in whole meters, so sums do not drift"""
+    try:
+        return round(float(distance or 0) * 1000)
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class Bucket:
+    """Totals of one month or one driver (amounts in grosze)"""
+    invoice_count: int = 0
+    paid_cents: int = 0
+    unpaid_cents: int = 0
+    distance_m: int = 0
+    fuel_count: int = 0
+    fuel_cents: int = 0
+
+    @property
+    def revenue(self) -> float:
+        return (self.paid_cents + self.unpaid_cents) / 100
+
+    @property
+    def paid(self) -> float:
+        return self.paid_cents / 100
+
+    @property
+    def unpaid(self) -> float:
+        return self.unpaid_cents / 100
+
+    @property
+    def fuel(self) -> float:
+        return self.fuel_cents / 100
+
+    @property
+    def distance(self) -> float:
+        return self.distance_m / 1000
+
+    @property
+    def profit(self) -> float:
+        """Invoiced revenue minus fuel cost"""
+        return (self.paid_cents + self.unpaid_cents - self.fuel_cents) / 100
+
+    @property
+    def cost_per_km(self) -> Optional[float]:
+        """Fuel cost per invoiced kilometer (None without distance)"""
+        if self.distance_m <= 0:
+            return None
+        return self.fuel_cents / self.distance_m * 10  # grosze/m -> PLN/km
+
+    def is_empty(self) -> bool:
+        return not self.invoice_count and not self.fuel_count
+
+
+class Rollups:
+    """Invoice and fuel totals bucketed by month and by driver
+
+    Invoices fall into the month of their issue_date, fuel entries into
+    the month of their date. version changes whenever any bucket does, so
+    views can skip redrawing unchanged data.
+    """
+
+    TABLES = ('invoices', 'fuel_entries')
+
+    def __init__(self, db):
+        self.db = db
+        self.months: Dict[Tuple[int, int], Bucket] = {}
+        self.drivers: Dict[str, Bucket] = {}
+        self.version = 0
+        for table in self.TABLES:
+            self._rebuild(table)
+        db.subscribe(self.on_change)
+
+    def month(self, year: int, month: int) -> Bucket:
+        """Bucket of a calendar month (empty if nothing falls into it)"""
+        return self.months.get((year, month)) or Bucket()
+
+    def month_range(self, end: Tuple[int, int], count: int) -> Iterator[Tuple[Tuple[int, int], Bucket]]:
+        """The count months up to and including end, oldest first"""
+        year, month = end
+        index = year * 12 + month - 1 - (count - 1)
+        for i in range(index, index + count):
+            key = (i // 12, i % 12 + 1)
+            yield key, self.month(*key)
+
+    # Maintenance
+    def on_change(self, event: ChangeEvent):
+        """Apply a database change event"""
+        if event.table not in self.TABLES:
+            return
+        if event.kind == RELOADED:
+            self._rebuild(event.table)
+        else:
+            if event.kind in (UPDATED, REMOVED) and event.old is not None:
+                self._apply(event.table, event.old, -1)
+            if event.kind in (INSERTED, UPDATED) and event.new is not None:
+                self._apply(event.table, event.new, +1)
+        self.version += 1
+
+    def _rebuild(self, table: str):
+        """Recompute one table's share of every bucket"""
+        for buckets in (self.months, self.drivers):
+            for key, bucket in list(buckets.items()):
+                if table == 'invoices':
+                    bucket.invoice_count = bucket.paid_cents = bucket.unpaid_cents = bucket.distance_m = 0
+                else:
+                    bucket.fuel_count = bucket.fuel_cents = 0
+                if bucket.is_empty():
+                    del buckets[key]
+        records = self.db.get_invoices() if table == 'invoices' else self.db.get_fuel_entries()
+        for record in records:
+            self._apply(table, record, +1)
+
+    def _apply(self, table: str, record: Record, sign: int):
+        """Add (sign=+1) or subtract (sign=-1) one record's contribution"""
+        if table == 'invoices':
+            month = record.parsed('issue_date')
+            month = (month.year, month.month) if month is not None else None
+        else:
+            month = _month(record)
+        driver_id = record.get('driver_id')
+        for buckets, key in ((self.months, month), (self.drivers, driver_id)):
+            if key is None:
+                continue
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = Bucket()
+            cents = _cents(record.get('amount'))
+            if table == 'invoices':
+                bucket.invoice_count += sign
+                if record.get('is_paid', False):
+                    bucket.paid_cents += sign * cents
+                else:
+                    bucket.unpaid_cents += sign * cents
+                bucket.distance_m += sign * _meters(record.get('calculated_distance'))
+            else:
+                bucket.fuel_count += sign
+                bucket.fuel_cents += sign * cents
+            if bucket.is_empty():
+                del buckets[key]
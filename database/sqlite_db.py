@@ -0,0 +1,560 @@
+"""
+Database handler using SQLite
+Drop-in alternative to the TinyDB handler in database/db.py
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Dict, Any, get_type_hints
+import config
+from database.models import Invoice, Driver, FuelEntry, Vehicle, Company
+from database.deadlines import is_paid_on_time
+from database.events import ChangeEvent, ChangeNotifier, INSERTED, UPDATED, REMOVED, RELOADED
+from database.records import Record
+from database.query import DEFAULTS, Filters, Ranges, criteria, date_range, parse_sort
+
+
+def _load_json(value: str):
+    """Decode a JSON column, keeping legacy plain-text values as they are"""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+class _TableSpec:
+    """Column layout of one SQLite table derived from a model dataclass"""
+    
+    def __init__(self, name: str, model: type, key: str):
+        self.name = name
+        self.key = key
+        hints = get_type_hints(model)
+        self.columns: Dict[str, str] = {}
+        for f in fields(model):
+            self.columns[f.name] = self._kind(hints[f.name])
+    
+    @staticmethod
+    def _kind(hint) -> str:
+        """Map a model annotation to a column codec"""
+        args = getattr(hint, '__args__', None)
+        if args and type(None) in args:
+            # Optional[X] -> X
+            hint = next(a for a in args if a is not type(None))
+        if hint is bool:
+            return 'bool'
+        if hint is int:
+            return 'int'
+        if hint is float:
+            return 'real'
+        if hint is str:
+            return 'text'
+        return 'json'
+    
+    def ddl(self) -> str:
+        """CREATE TABLE statement"""
+        sql_types = {'bool': 'INTEGER', 'int': 'INTEGER', 'real': 'REAL', 'text': 'TEXT', 'json': 'TEXT'}
+        cols = []
+        for name, kind in self.columns.items():
+            col = f"{name} {sql_types[kind]}"
+            if name == self.key:
+                col += " PRIMARY KEY"
+            cols.append(col)
+        # Fields unknown to the model are kept as JSON so nothing is lost
+        cols.append("extra TEXT")
+        return f"CREATE TABLE IF NOT EXISTS {self.name} ({', '.join(cols)})"
+    
+    def encode(self, data: Dict) -> Dict[str, Any]:
+        """Convert a record dict into column values"""
+        row = {}
+        extra = {}
+        for name, value in data.items():
+            kind = self.columns.get(name)
+            if kind is None:
+                extra[name] = value
+            elif value is None:
+                row[name] = None
+            elif kind == 'bool':
+                row[name] = int(bool(value))
+            elif kind == 'json':
+                row[name] = json.dumps(value, ensure_ascii=False)
+            else:
+                row[name] = value
+        if extra:
+            row['extra'] = json.dumps(extra, ensure_ascii=False)
+        return row
+    
+    def decode(self, row: sqlite3.Row) -> Record:
+        """Convert a database row back into a record dict
+        
+        NULL columns are left out, as fields missing from a TinyDB
+        document are, so callers' .get(field, default) keeps working.
+        """
+        data = Record()
+        for name, kind in self.columns.items():
+            value = row[name]
+            if value is None:
+                continue
+            if kind == 'bool':
+                value = bool(value)
+            elif kind == 'json':
+                value = _load_json(value)
+            data[name] = value
+        if row['extra']:
+            data.update(json.loads(row['extra']))
+        return data
+
+
+TABLES = {
+    'invoices': _TableSpec('invoices', Invoice, 'id'),
+    'drivers': _TableSpec('drivers', Driver, 'id'),
+    'fuel_entries': _TableSpec('fuel_entries', FuelEntry, 'id'),
+    'vehicles': _TableSpec('vehicles', Vehicle, 'id'),
+    'companies': _TableSpec('companies', Company, 'nip'),
+}
+
+INDEXES = [
+    ('invoices', 'nip'),
+    ('invoices', 'is_paid'),
+    ('invoices', 'deadline'),
+    ('invoices', 'driver_id'),
+    ('invoices', 'created_at'),
+    ('fuel_entries', 'date'),
+    ('fuel_entries', 'driver_id'),
+    ('fuel_entries', 'vehicle_id'),
+]
+
+
+class SQLiteDatabase(ChangeNotifier):
+    """SQLite database handler with the same public API as database.db.Database"""
+    
+    def __init__(self, db_path: Path = config.SQLITE_DB_PATH):
+        self._init_events()
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._batch_depth = 0
+        self._create_schema()
+        
+        # Per-table version counters; data_version changes when another
+        # connection commits
+        self._versions: Dict[str, int] = {name: 0 for name in TABLES}
+        self._data_version = self._read_data_version()
+    
+    # BATCHING
+    @contextmanager
+    def batch(self):
+        """Group mutations into a single transaction
+        
+        If the block raises, the whole transaction is rolled back.
+        """
+        if self._batch_depth:
+            # Nested batch joins the outer one
+            yield self
+            return
+        
+        self._batch_depth = 1
+        self._hold_events()
+        try:
+            with self.conn:
+                yield self
+        except BaseException:
+            self._batch_depth = 0
+            self._touch_all()
+            self._drop_events(list(TABLES))
+            raise
+        self._batch_depth = 0
+        self._release_events()
+    
+    @contextmanager
+    def _transaction(self, table: str):
+        """Commit after the block unless a batch is open"""
+        if self._batch_depth:
+            yield
+        else:
+            with self.conn:
+                yield
+        self._versions[table] += 1
+    
+    def _notify(self, table: str, kind: str, key: str,
+                old: Optional[Dict] = None, new: Optional[Dict] = None):
+        """Notify subscribers about a changed record"""
+        self._emit(ChangeEvent(table, kind, key, old, new))
+    
+    # VERSIONS
+    def table_version(self, name: str) -> int:
+        """Version counter of a table; changes whenever the table changes"""
+        self.refresh()
+        return self._versions[name]
+    
+    def refresh(self) -> bool:
+        """Pick up commits made by another connection (another process)
+        
+        Emits RELOADED for every table and returns True if there were any.
+        """
+        data_version = self._read_data_version()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        self._touch_all()
+        for table in TABLES:
+            self._emit(ChangeEvent(table, RELOADED))
+        return True
+    
+    def _read_data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _touch_all(self):
+        for name in self._versions:
+            self._versions[name] += 1
+    
+    def _create_schema(self):
+        """Create tables and indexes if missing"""
+        with self.conn:
+            for spec in TABLES.values():
+                self.conn.execute(spec.ddl())
+            for table, column in INDEXES:
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})"
+                )
+    
+    # GENERIC HELPERS
+    def _insert(self, table: str, data: Dict):
+        """Insert a record"""
+        row = TABLES[table].encode(data)
+        columns = ', '.join(row)
+        placeholders = ', '.join('?' for _ in row)
+        with self._transaction(table):
+            self.conn.execute(
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                list(row.values())
+            )
+        self._notify(table, INSERTED, data[TABLES[table].key], new=Record(data))
+    
+    def insert_records(self, table: str, records: List[Dict]) -> int:
+        """Insert many raw records into a table in a single transaction"""
+        spec = TABLES[table]
+        columns = [*spec.columns, 'extra']
+        placeholders = ', '.join('?' for _ in columns)
+        rows = []
+        for data in records:
+            row = spec.encode(data)
+            rows.append([row.get(name) for name in columns])
+        with self._transaction(table):
+            self.conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+        for data in records:
+            self._notify(table, INSERTED, data[spec.key], new=Record(data))
+        return len(rows)
+    
+    def iter_records(self, table: str):
+        """Iterate over all records of a table without loading them at once"""
+        spec = TABLES[table]
+        cursor = self.conn.execute(f"SELECT * FROM {table} ORDER BY rowid")
+        for row in cursor:
+            yield spec.decode(row)
+    
+    def _all(self, table: str) -> List[Dict]:
+        """Get all records in insertion order"""
+        spec = TABLES[table]
+        cursor = self.conn.execute(f"SELECT * FROM {table} ORDER BY rowid")
+        return [spec.decode(row) for row in cursor]
+    
+    def _where(self, table: str, filters: Filters, ranges: Ranges):
+        """WHERE clause and parameters for equality filters and ranges"""
+        spec = TABLES[table]
+        clauses = []
+        params = []
+        for name, value in filters.items():
+            if name in DEFAULTS and value == DEFAULTS[name]:
+                # NULL (missing) counts as the default, as in the TinyDB handler
+                clauses.append(f"({name} = ? OR {name} IS NULL)")
+            else:
+                clauses.append(f"{name} = ?")
+            params.append(spec.encode({name: value})[name])
+        for name, (low, high) in ranges.items():
+            if low is not None:
+                clauses.append(f"{name} >= ?")
+                params.append(low)
+            if high is not None:
+                clauses.append(f"{name} < ?")
+                params.append(high)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    
+    def _order(self, table: str, sort: Optional[str]) -> str:
+        """ORDER BY expression; ties keep insertion order like the TinyDB handler"""
+        field, descending = parse_sort(sort)
+        if not field:
+            return "rowid"
+        if field not in TABLES[table].columns:
+            raise ValueError(f"Unknown sort field: {field}")
+        return f"{field} {'DESC' if descending else 'ASC'}, rowid"
+    
+    def _query(self, table: str, filters: Filters, ranges: Ranges, sort: Optional[str],
+               limit: Optional[int], offset: int) -> List[Dict]:
+        """One page of matching records, filtered and sorted by SQLite"""
+        spec = TABLES[table]
+        where, params = self._where(table, filters, ranges)
+        cursor = self.conn.execute(
+            f"SELECT * FROM {table}{where} ORDER BY {self._order(table, sort)} LIMIT ? OFFSET ?",
+            [*params, -1 if limit is None else limit, offset]
+        )
+        return [spec.decode(row) for row in cursor]
+    
+    def _iter_query(self, table: str, filters: Filters, ranges: Ranges,
+                    sort: Optional[str]) -> Iterator[Record]:
+        """All matching records, streamed from a single cursor"""
+        spec = TABLES[table]
+        where, params = self._where(table, filters, ranges)
+        cursor = self.conn.execute(
+            f"SELECT * FROM {table}{where} ORDER BY {self._order(table, sort)}", params
+        )
+        for row in cursor:
+            yield spec.decode(row)
+    
+    def _count(self, table: str, filters: Filters, ranges: Ranges) -> int:
+        """Count matching records"""
+        where, params = self._where(table, filters, ranges)
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+    
+    def _get(self, table: str, key: str) -> Optional[Dict]:
+        """Get a record by its primary key"""
+        spec = TABLES[table]
+        row = self.conn.execute(
+            f"SELECT * FROM {table} WHERE {spec.key} = ?", (key,)
+        ).fetchone()
+        return spec.decode(row) if row else None
+    
+    def _update(self, table: str, key: str, data: Dict) -> bool:
+        """Update fields of a record by its primary key"""
+        spec = TABLES[table]
+        current = self._get(table, key)
+        if current is None:
+            return False
+        row = spec.encode(data)
+        if 'extra' in row:
+            # Merge unknown fields into the stored ones
+            stored = {k: v for k, v in current.items() if k not in spec.columns}
+            stored.update(json.loads(row['extra']))
+            row['extra'] = json.dumps(stored, ensure_ascii=False)
+        if not row:
+            return True
+        assignments = ', '.join(f"{name} = ?" for name in row)
+        with self._transaction(table):
+            self.conn.execute(
+                f"UPDATE {table} SET {assignments} WHERE {spec.key} = ?",
+                [*row.values(), key]
+            )
+        self._notify(table, UPDATED, key, current, self._get(table, data.get(spec.key, key)))
+        return True
+    
+    def _remove(self, table: str, key: str) -> bool:
+        """Remove a record by its primary key"""
+        spec = TABLES[table]
+        current = self._get(table, key)
+        if current is None:
+            return False
+        with self._transaction(table):
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE {spec.key} = ?", (key,)
+            )
+        self._notify(table, REMOVED, key, old=current)
+        return True
+    
+    # INVOICES
+    def add_invoice(self, invoice: Invoice) -> str:
+        """Add new invoice"""
+        self._insert('invoices', invoice.to_dict())
+        return invoice.id
+    
+    def add_invoices_bulk(self, invoices: List[Invoice]) -> List[str]:
+        """Add many invoices in a single transaction"""
+        self.insert_records('invoices', [invoice.to_dict() for invoice in invoices])
+        return [invoice.id for invoice in invoices]
+    
+    def get_invoices(self) -> List[Dict]:
+        """Get all invoices"""
+        return self._all('invoices')
+    
+    def get_invoice(self, invoice_id: str) -> Optional[Dict]:
+        """Get invoice by ID"""
+        return self._get('invoices', invoice_id)
+    
+    def update_invoice(self, invoice_id: str, data: Dict) -> bool:
+        """Update invoice"""
+        return self._update('invoices', invoice_id, data)
+    
+    def delete_invoice(self, invoice_id: str) -> bool:
+        """Delete invoice"""
+        return self._remove('invoices', invoice_id)
+    
+    def query_invoices(self, is_paid: Optional[bool] = None, nip: Optional[str] = None,
+                       date_from=None, date_to=None, sort: Optional[str] = None,
+                       limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Get one page of invoices
+        
+        date_from/date_to bound the deadline (to is exclusive); sort is a
+        field name, prefixed with '-' for descending order.
+        """
+        return self._query('invoices', criteria(is_paid=is_paid, nip=nip),
+                           date_range('deadline', date_from, date_to), sort, limit, offset)
+    
+    def iter_invoices(self, is_paid: Optional[bool] = None, nip: Optional[str] = None,
+                      date_from=None, date_to=None, sort: Optional[str] = None) -> Iterator[Record]:
+        """Stream all invoices matching the query_invoices() filters"""
+        return self._iter_query('invoices', criteria(is_paid=is_paid, nip=nip),
+                                date_range('deadline', date_from, date_to), sort)
+    
+    def count_invoices(self, is_paid: Optional[bool] = None, nip: Optional[str] = None,
+                       date_from=None, date_to=None) -> int:
+        """Count invoices matching the query_invoices() filters"""
+        return self._count('invoices', criteria(is_paid=is_paid, nip=nip),
+                           date_range('deadline', date_from, date_to))
+    
+    def mark_as_paid(self, invoice_id: str, paid_at: str, paid_on_time: bool) -> bool:
+        """Mark invoice as paid"""
+        return self._update('invoices', invoice_id, {
+            'is_paid': True,
+            'paid_at': paid_at,
+            'paid_on_time': paid_on_time
+        })
+    
+    def mark_many_as_paid(self, invoice_ids: List[str], paid_at: str) -> int:
+        """Mark many invoices as paid in a single transaction
+        
+        paid_on_time is derived per invoice from its deadline.
+        Returns the number of updated invoices.
+        """
+        paid_dt = datetime.fromisoformat(paid_at)
+        updated = 0
+        with self.batch():
+            for invoice_id in invoice_ids:
+                row = self.conn.execute(
+                    "SELECT deadline FROM invoices WHERE id = ?", (invoice_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                self.mark_as_paid(invoice_id, paid_at, is_paid_on_time(dict(row), paid_dt))
+                updated += 1
+        return updated
+    
+    # DRIVERS
+    def add_driver(self, driver: Driver) -> str:
+        """Add new driver"""
+        self._insert('drivers', driver.to_dict())
+        return driver.id
+    
+    def get_drivers(self) -> List[Dict]:
+        """Get all drivers"""
+        return self._all('drivers')
+    
+    def get_driver(self, driver_id: str) -> Optional[Dict]:
+        """Get driver by ID"""
+        return self._get('drivers', driver_id)
+    
+    def query_drivers(self, sort: Optional[str] = "name", limit: Optional[int] = None,
+                      offset: int = 0) -> List[Dict]:
+        """Get one page of drivers"""
+        return self._query('drivers', {}, {}, sort, limit, offset)
+    
+    def iter_drivers(self, sort: Optional[str] = "name") -> Iterator[Record]:
+        """Stream all drivers"""
+        return self._iter_query('drivers', {}, {}, sort)
+    
+    def count_drivers(self) -> int:
+        """Count drivers"""
+        return self._count('drivers', {}, {})
+    
+    def update_driver(self, driver_id: str, data: Dict) -> bool:
+        """Update driver"""
+        return self._update('drivers', driver_id, data)
+    
+    def delete_driver(self, driver_id: str) -> bool:
+        """Delete driver"""
+        return self._remove('drivers', driver_id)
+    
+    # FUEL ENTRIES
+    def add_fuel_entry(self, fuel: FuelEntry) -> str:
+        """Add new fuel entry"""
+        self._insert('fuel_entries', fuel.to_dict())
+        return fuel.id
+    
+    def add_fuel_entries_bulk(self, entries: List[FuelEntry]) -> List[str]:
+        """Add many fuel entries in a single transaction"""
+        self.insert_records('fuel_entries', [fuel.to_dict() for fuel in entries])
+        return [fuel.id for fuel in entries]
+    
+    def get_fuel_entries(self) -> List[Dict]:
+        """Get all fuel entries"""
+        return self._all('fuel_entries')
+    
+    def query_fuel_entries(self, driver_id: Optional[str] = None, vehicle_id: Optional[str] = None,
+                           date_from=None, date_to=None, sort: Optional[str] = "-date",
+                           limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Get one page of fuel entries (newest first by default)"""
+        return self._query('fuel_entries', criteria(driver_id=driver_id, vehicle_id=vehicle_id),
+                           date_range('date', date_from, date_to), sort, limit, offset)
+    
+    def iter_fuel_entries(self, driver_id: Optional[str] = None, vehicle_id: Optional[str] = None,
+                          date_from=None, date_to=None, sort: Optional[str] = "-date") -> Iterator[Record]:
+        """Stream all fuel entries matching the query_fuel_entries() filters"""
+        return self._iter_query('fuel_entries', criteria(driver_id=driver_id, vehicle_id=vehicle_id),
+                                date_range('date', date_from, date_to), sort)
+    
+    def count_fuel_entries(self, driver_id: Optional[str] = None, vehicle_id: Optional[str] = None,
+                           date_from=None, date_to=None) -> int:
+        """Count fuel entries matching the query_fuel_entries() filters"""
+        return self._count('fuel_entries', criteria(driver_id=driver_id, vehicle_id=vehicle_id),
+                           date_range('date', date_from, date_to))
+    
+    def delete_fuel_entry(self, fuel_id: str) -> bool:
+        """Delete fuel entry"""
+        return self._remove('fuel_entries', fuel_id)
+    
+    # VEHICLES
+    def add_vehicle(self, vehicle: Vehicle) -> str:
+        """Add new vehicle"""
+        self._insert('vehicles', vehicle.to_dict())
+        return vehicle.id
+    
+    def get_vehicles(self) -> List[Dict]:
+        """Get all vehicles"""
+        return self._all('vehicles')
+    
+    def delete_vehicle(self, vehicle_id: str) -> bool:
+        """Delete vehicle"""
+        return self._remove('vehicles', vehicle_id)
+    
+    # COMPANIES
+    def get_or_create_company(self, nip: str, name: str) -> Dict:
+        """Get or create company by NIP"""
+        result = self._get('companies', nip)
+        if result:
+            return result
+        else:
+            company = Company(nip=nip, name=name)
+            self._insert('companies', company.to_dict())
+            return company.to_dict()
+    
+    def update_company_score(self, nip: str, score_delta: int) -> bool:
+        """Update company score"""
+        current = self._get('companies', nip)
+        if current is None:
+            return False
+        with self._transaction('companies'):
+            self.conn.execute(
+                "UPDATE companies SET score = COALESCE(score, 0) + ? WHERE nip = ?",
+                (score_delta, nip)
+            )
+        self._notify('companies', UPDATED, nip, current, self._get('companies', nip))
+        return True
+    
+    def close(self):
+        """Close database"""
+        self.conn.close()
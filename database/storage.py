@@ -0,0 +1,455 @@
+"""
+TinyDB storage backends used by database.db.Database
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from tinydb.storages import Storage
+
+from database.snapshot_cache import SnapshotCache, digest, gc_paused
+from utils import timing
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: files another process has open cannot be deleted or
+    # replaced anyway, so compaction fails instead of losing appends
+    fcntl = None
+
+
+class AtomicJSONStorage(Storage):
+    """JSON file storage with atomic writes, write batching and a read cache
+
+    Every write goes to a temporary file that is fsync'ed and renamed over
+    the database file, so a crash never leaves a half-written faktury.json.
+    Between begin() and commit() writes are only kept in memory and the
+    file is written once on commit.
+
+    The parsed document is kept in memory and only re-read when the file's
+    mtime or size differs from what this storage last read or wrote.
+    Loading prefers the binary SnapshotCache when it matches the file's
+    checksum. A stale cache is rewritten on close(), not while loading, so
+    a cold start costs no more than parsing the JSON (and never with
+    write_cache=False, e.g. for command line tools).
+    """
+
+    def __init__(self, path, create_dirs: bool = False, write_cache: bool = True, **kwargs):
+        super().__init__()
+        self.path = Path(path)
+        self.write_cache = write_cache
+        self.kwargs = kwargs
+        if create_dirs:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+
+        self._batch_depth = 0
+        self._pending: Optional[Dict[str, Dict[str, Any]]] = None
+
+        # Read cache and the (mtime_ns, size) of the file it came from
+        self._cached = False
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+        self._stat: Optional[tuple] = None
+
+        # Checksum of the file the in-memory data matches while the binary
+        # cache lags behind (None: cache up to date or data diverged)
+        self.cache = SnapshotCache(self.path)
+        self._uncached_digest: Optional[bytes] = None
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        if self._pending is not None:
+            return self._pending
+        if not self._cached:
+            self._stat = self._file_stat()
+            self._data = self._read_file()
+            self._cached = True
+        return self._data
+
+    def write(self, data: Dict[str, Dict[str, Any]]):
+        if self.in_batch:
+            self._pending = data
+        else:
+            self._write_file(data)
+
+    def refresh(self) -> bool:
+        """Drop the cache if the file was changed by someone else
+
+        Returns True if cached data was discarded.
+        """
+        if self.in_batch or not self._cached:
+            return False
+        if self._file_stat() == self._stat:
+            return False
+        self._invalidate()
+        return True
+
+    def _invalidate(self):
+        self._cached = False
+        self._data = None
+
+    def _file_stat(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def begin(self):
+        """Start buffering writes"""
+        self._batch_depth += 1
+
+    def commit(self):
+        """End a batch; the outermost commit writes the file once"""
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._pending is not None:
+            data, self._pending = self._pending, None
+            self._write_file(data)
+
+    def log(self, table: str, doc_ids: Iterable[int]):
+        """Describe the documents changed by the last write (used by journaling storages)"""
+
+    def rollback(self):
+        """Abort the batch and drop all buffered writes"""
+        self._batch_depth = 0
+        self._pending = None
+        # TinyDB updates the cached dict in place, so it is dirty too
+        self._invalidate()
+
+    def close(self):
+        if self._pending is not None:
+            self._batch_depth = 1
+            self.commit()
+        self._store_cache()
+
+    def _read_file(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        data, json_digest, cached = self._load_snapshot()
+        self._uncached_digest = None if cached else json_digest
+        return data
+
+    def _load_snapshot(self):
+        """(data, checksum, loaded from the cache) of the JSON file"""
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        if not content:
+            # Empty file: let TinyDB initialize the database
+            return None, None, False
+        json_digest = digest(content)
+        data = self.cache.load(json_digest)
+        if data is not None:
+            timing.phase(f"{self.path.name}: pamięć podręczna")
+            return data, json_digest, True
+        with gc_paused():
+            data = json.loads(content)
+        timing.phase(f"{self.path.name}: JSON")
+        return data, json_digest, False
+
+    def _store_cache(self):
+        """Bring the binary cache up to date with the last written file"""
+        if self.write_cache and self._uncached_digest is not None and self._data is not None:
+            self.cache.store(self._uncached_digest, self._data)
+        self._uncached_digest = None
+
+    def _write_file(self, data: Dict[str, Dict[str, Any]]):
+        serialized = json.dumps(data, **self.kwargs).encode('utf-8')
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(serialized)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            self._invalidate()
+            raise
+        self._data = data
+        self._cached = True
+        self._stat = self._file_stat()
+        self._uncached_digest = digest(serialized)
+
+
+# Compact once the log outgrows the snapshot, but not for tiny databases
+COMPACT_MIN_BYTES = 1024 * 1024
+
+
+def _replay(data: Dict[str, Dict[str, Any]], path: Path) -> int:
+    """Apply a change log to data; returns the length of its valid part
+
+    Each line is {"table": {"doc_id": document or null}}. A line cut short
+    by a crash during an append ends the log.
+    """
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return 0
+    valid = 0
+    for line in content.split(b"\n")[:-1]:
+        for table, docs in json.loads(line).items():
+            stored = data.setdefault(table, {})
+            for doc_id, doc in docs.items():
+                if doc is None:
+                    stored.pop(doc_id, None)
+                else:
+                    stored[doc_id] = doc
+        valid += len(line) + 1
+    return valid
+
+
+class JournalBusy(RuntimeError):
+    """The journal is open in another process"""
+
+
+def _lock(path: Path, exclusive: bool):
+    """Open and lock path (POSIX advisory lock, released on close)
+
+    A shared lock waits for an exclusive holder; an exclusive lock fails
+    at once with JournalBusy while anyone else holds the file.
+    """
+    f = open(path, 'ab')
+    if fcntl is not None:
+        try:
+            fcntl.flock(f, (fcntl.LOCK_EX | fcntl.LOCK_NB) if exclusive else fcntl.LOCK_SH)
+        except BlockingIOError:
+            f.close()
+            raise JournalBusy(f"Baza {path.stem} jest otwarta w innym programie") from None
+    return f
+
+
+class JournaledJSONStorage(AtomicJSONStorage):
+    """faktury.json snapshot plus an append-only log of changed documents
+
+    Database calls log() after each write with the doc_ids it changed; the
+    new documents (or deletions) are appended to faktury.json.log as one
+    JSON line and fsync'ed, so a write costs O(changed documents) instead
+    of rewriting the whole file. A batch is appended as a single line and
+    is therefore all-or-nothing.
+
+    Once the log is larger than the snapshot it is renamed to
+    faktury.json.log.1 and a background thread folds it into a new
+    snapshot. Loading reads the snapshot and replays .log.1 and .log;
+    replaying is idempotent, so a crash at any point of a compaction
+    loses nothing. close() folds the log into faktury.json, leaving a
+    self-contained file for tools that read it directly.
+
+    Writes that are not followed by log() (e.g. TinyDB calls bypassing
+    Database) are persisted with a full snapshot instead.
+
+    Every open storage holds a shared lock on faktury.json.lock; with
+    exclusive=True opening fails (JournalBusy) while another process has
+    the journal open, since compacting would unlink the log under it.
+    """
+
+    def __init__(self, path, create_dirs: bool = False, compact_bytes: int = COMPACT_MIN_BYTES,
+                 write_cache: bool = True, exclusive: bool = False, **kwargs):
+        super().__init__(path, create_dirs, write_cache, **kwargs)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.old_log_path = self.path.with_name(self.path.name + ".log.1")
+        self.compact_bytes = compact_bytes
+        self._lock_file = _lock(self.path.with_name(self.path.name + ".lock"), exclusive)
+
+        self._log = None
+        self._changes: Dict[str, Dict[str, Any]] = {}
+        self._unlogged = False
+        self._snapshot_due = False
+        self._wrote = False
+
+        # Guards the files against the compaction thread
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self.compaction_error: Optional[BaseException] = None
+
+    def write(self, data: Dict[str, Dict[str, Any]]):
+        if self._unlogged:
+            # The previous write was never described by log()
+            self._snapshot_due = True
+        self._unlogged = True
+        if self.in_batch:
+            self._pending = data
+            return
+        self._data = data
+        self._cached = True
+        if self._snapshot_due:
+            self._flush()
+
+    def log(self, table: str, doc_ids: Iterable[int]):
+        docs = (self.read() or {}).get(table, {})
+        changes = self._changes.setdefault(table, {})
+        for doc_id in doc_ids:
+            changes[str(doc_id)] = docs.get(str(doc_id))
+        self._unlogged = False
+        if not self.in_batch:
+            self._flush()
+
+    def refresh(self) -> bool:
+        with self._lock:
+            return super().refresh()
+
+    def commit(self):
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            if self._pending is not None:
+                self._data, self._pending = self._pending, None
+                self._cached = True
+            self._flush()
+
+    def rollback(self):
+        super().rollback()
+        self._changes = {}
+        self._unlogged = self._snapshot_due = False
+
+    def compact(self):
+        """Fold the log into the snapshot now"""
+        data = self.read()
+        if data is not None and self._has_log():
+            self._snapshot(data)
+
+    def close(self):
+        super().close()
+        if self._unlogged:
+            self._snapshot_due = True
+            self._flush()
+        self._join_compactor()
+        if self._wrote:
+            self.compact()
+        self._close_log()
+        self._lock_file.close()
+
+    def _file_stat(self) -> Optional[tuple]:
+        return (super()._file_stat(), self._stat_of(self.log_path))
+
+    @staticmethod
+    def _stat_of(path: Path) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _has_log(self) -> bool:
+        return self.old_log_path.exists() or bool(self._stat_of(self.log_path))
+
+    def _read_file(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            data = super()._read_file()
+            if self._has_log():
+                # The replayed data no longer matches the snapshot file
+                self._uncached_digest = None
+                data = data or {}
+                _replay(data, self.old_log_path)
+                valid = _replay(data, self.log_path)
+                log_stat = self._stat_of(self.log_path)
+                if log_stat is not None and valid < log_stat[1]:
+                    # Drop a torn last line so new appends start on a fresh line
+                    self._close_log()
+                    os.truncate(self.log_path, valid)
+                timing.phase(f"{self.log_path.name}: odtworzenie")
+            self._stat = self._file_stat()
+            return data
+
+    def _flush(self):
+        """Persist everything written since the last flush"""
+        if self._snapshot_due or self._unlogged:
+            self._snapshot(self._data)
+        elif self._changes:
+            line = json.dumps(self._changes, separators=(',', ':')).encode('utf-8') + b"\n"
+            with self._lock:
+                if self._log is None:
+                    self._log = open(self.log_path, 'ab')
+                self._log.write(line)
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self._stat = self._file_stat()
+            self._wrote = True
+            self._uncached_digest = None
+            self._maybe_compact()
+        self._changes = {}
+        self._unlogged = self._snapshot_due = False
+
+    def _snapshot(self, data: Dict[str, Dict[str, Any]]):
+        """Write the whole database to the snapshot and drop the logs"""
+        self._join_compactor()
+        with self._lock:
+            self._write_file(data)
+            self._close_log()
+            self.log_path.unlink(missing_ok=True)
+            self.old_log_path.unlink(missing_ok=True)
+            self._stat = self._file_stat()
+        self._wrote = False
+        # Later appends change only the log, so the cache stays valid
+        self._store_cache()
+
+    def _maybe_compact(self):
+        """Start a background compaction once the log outgrows the snapshot"""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        snapshot_stat, log_stat = self._stat
+        snapshot_size = snapshot_stat[1] if snapshot_stat else 0
+        if log_stat is None or log_stat[1] < max(self.compact_bytes, snapshot_size):
+            return
+        with self._lock:
+            # A leftover .log.1 (failed compaction) is compacted first
+            if not self.old_log_path.exists():
+                self._close_log()
+                os.replace(self.log_path, self.old_log_path)
+                self._stat = self._file_stat()
+        self._compactor = threading.Thread(target=self._compact_old_log, name="journal-compaction",
+                                           daemon=True)
+        self._compactor.start()
+
+    def _compact_old_log(self):
+        """Background thread: snapshot + .log.1 -> new snapshot"""
+        tmp_path = None
+        try:
+            data = self._load_snapshot()[0] or {}
+            _replay(data, self.old_log_path)
+            serialized = json.dumps(data, **self.kwargs).encode('utf-8')
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(serialized)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock:
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+                self.old_log_path.unlink()
+                self._stat = self._file_stat()
+            if self.write_cache:
+                self.cache.store(digest(serialized), data)
+            self.compaction_error = None
+        except Exception as e:
+            # .log.1 stays and is replayed on load; the next compaction retries
+            self.compaction_error = e
+        finally:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def _join_compactor(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def _close_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def compact_journal(path: Path):
+    """Fold a leftover change log into the JSON file (for tools reading it directly)
+
+    Raises JournalBusy if the database is open in another process; the
+    snapshot cache is left as it is.
+    """
+    storage = JournaledJSONStorage(path, write_cache=False, exclusive=True)
+    try:
+        storage.compact()
+    finally:
+        storage.close()
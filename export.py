@@ -0,0 +1,99 @@
+"""
+Faktury 2.0 - export tool
+Streams records from the database to a CSV file or stdout (from a single
+SQLite cursor; the TinyDB backend holds its data in memory anyway), e.g.
+for piping into other tools, and renders
+per-customer / per-month PDF reports in parallel
+
+Usage:
+    python export.py invoices [--status paid|unpaid] [--output PATH|-] [--compression none|gzip|zstd]
+    python export.py fuel [--output PATH|-]
+    python export.py drivers [--output PATH|-]
+    python export.py reports [--by nip|month|nip_month] [--status paid|unpaid] [--output DIR] [--workers N]
+
+The compression of a file output defaults to its suffix (.gz, .zst).
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from database.db import create_database
+from services.batch_export import PARTITIONS, export_batch
+from services.export_service import ExportService
+from services.sinks import COMPRESSIONS
+
+
+def main(argv=None) -> int:
+    """Export command line entry"""
+    parser = argparse.ArgumentParser(description="Eksport CSV i raportów PDF z bazy faktur")
+    parser.add_argument("table", choices=("invoices", "fuel", "drivers", "reports"), help="Eksportowane dane")
+    parser.add_argument("--output", "-o",
+                        help="Plik wynikowy (.csv, .csv.gz, .csv.zst) lub '-' dla stdout (domyślnie); "
+                             "dla raportów: katalog")
+    parser.add_argument("--compression", choices=COMPRESSIONS,
+                        help="Kompresja pliku (domyślnie wg rozszerzenia)")
+    parser.add_argument("--status", choices=("paid", "unpaid"), help="Tylko opłacone / nieopłacone faktury")
+    parser.add_argument("--by", choices=PARTITIONS, default="nip_month",
+                        help="Podział raportów PDF: wg NIP, miesiąca lub obu")
+    parser.add_argument("--workers", type=int, help="Liczba procesów (domyślnie liczba rdzeni)")
+    args = parser.parse_args(argv)
+
+    if args.table == "reports":
+        return export_reports(args)
+
+    sink = sys.stdout.buffer if args.output in (None, "-") else args.output
+    if sink is sys.stdout.buffer and args.compression not in (None, "none"):
+        print("Kompresja wymaga pliku wynikowego (--output)", file=sys.stderr)
+        return 1
+
+    service = ExportService()
+    db = create_database()
+    try:
+        if args.table == "invoices":
+            is_paid = None if args.status is None else args.status == "paid"
+            count = service.stream_invoices_csv(
+                db.iter_invoices(is_paid=is_paid, sort="-created_at"),
+                sink, compression=args.compression
+            )
+        elif args.table == "fuel":
+            count = service.stream_fuel_entries_csv(
+                db.iter_fuel_entries(), sink, compression=args.compression
+            )
+        else:
+            count = service.stream_drivers_csv(
+                db.iter_drivers(), sink, compression=args.compression
+            )
+    except BrokenPipeError:
+        # Reader stopped early (e.g. '| head'); silence the final flush of stdout
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        db.close()
+
+    print(f"Wyeksportowano {count} rekordów", file=sys.stderr)
+    return 0
+
+
+def export_reports(args) -> int:
+    """Render one PDF per partition and print the manifest path"""
+    db = create_database()
+    try:
+        is_paid = None if args.status is None else args.status == "paid"
+        invoices = db.iter_invoices(is_paid=is_paid)
+        manifest = export_batch(invoices, by=args.by, directory=args.output, max_workers=args.workers)
+    finally:
+        db.close()
+
+    with open(manifest, encoding="utf-8") as f:
+        summary = json.load(f)
+    failed = [entry for entry in summary["files"] if "error" in entry]
+    print(f"{summary['reports']} raportów ({summary['invoices']} faktur) w {summary['seconds']} s: {manifest}")
+    for entry in failed:
+        print(f"Błąd {entry['file']}: {entry['error']}", file=sys.stderr)
+    return 2 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Balance View Component
+Monthly revenue, fuel cost and profit with per-driver and per-customer totals
+The chart figure is created once and updated in place
+"""
+
+import customtkinter as ctk
+from datetime import date, datetime
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from config import COLORS
+from database.rollups import Rollups
+from services.analytics import InvoiceFrame
+
+
+def _money(value: float) -> str:
+    return f"{value:,.2f} PLN"
+
+
+def _per_km(value) -> str:
+    return f"{value:.2f} PLN/km" if value is not None else "—"
+
+
+def _days(value: float) -> str:
+    return f"{value:.0f}" if value == value else "—"  # NaN: nothing paid yet
+
+
+class BalanceView(ctk.CTkFrame):
+    """Balance tab: chart of the last MONTHS months plus month, driver and customer tables"""
+
+    MONTHS = 12
+    MONTH_COLUMNS = ("Miesiąc", "Przychód", "Opłacone", "Nieopłacone", "Paliwo", "Zysk", "Koszt/km")
+    DRIVER_COLUMNS = ("Kierowca", "Faktury", "Przychód", "Paliwo", "Zysk", "Koszt/km")
+    CUSTOMERS = 15
+    CUSTOMER_COLUMNS = ("Klient", "NIP", "Faktury", "Przychód", "Nieopłacone", "Po terminie",
+                        "Mediana dni", "90% dni")
+
+    def __init__(self, parent, rollups: Rollups, **kwargs):
+        super().__init__(parent, fg_color=COLORS["bg_primary"], **kwargs)
+
+        self.rollups = rollups
+        self.drawn = None  # (rollups version, last month, driver names) shown
+        self.customers_drawn = None  # (rollups version, today) shown
+        self.driver_rows = []
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Create the chart and the table skeletons once"""
+        scroll_frame = ctk.CTkScrollableFrame(self, fg_color=COLORS["bg_primary"])
+        scroll_frame.pack(fill="both", expand=True)
+
+        # Chart: paid/unpaid stacked bars, fuel bars and a profit line
+        self.figure = Figure(figsize=(12, 4), dpi=100, facecolor=COLORS["bg_secondary"])
+        self.axes = self.figure.add_subplot(111)
+        self.axes.set_facecolor(COLORS["bg_secondary"])
+        self.axes.tick_params(colors=COLORS["text_secondary"])
+        for spine in self.axes.spines.values():
+            spine.set_color(COLORS["border"])
+
+        positions = range(self.MONTHS)
+        zeros = [0] * self.MONTHS
+        self.paid_bars = self.axes.bar([x - 0.2 for x in positions], zeros, width=0.4,
+                                       color=COLORS["success"], label="Opłacone")
+        self.unpaid_bars = self.axes.bar([x - 0.2 for x in positions], zeros, width=0.4,
+                                         color=COLORS["warning"], label="Nieopłacone")
+        self.fuel_bars = self.axes.bar([x + 0.2 for x in positions], zeros, width=0.4,
+                                       color=COLORS["error"], label="Paliwo")
+        self.profit_line, = self.axes.plot(list(positions), zeros, color=COLORS["info"],
+                                           marker="o", label="Zysk")
+        self.axes.axhline(0, color=COLORS["border"], linewidth=1)
+        self.axes.set_xticks(list(positions))
+        self.axes.legend(loc="upper left", facecolor=COLORS["bg_tertiary"],
+                         edgecolor=COLORS["border"], labelcolor=COLORS["text_primary"])
+        self.figure.tight_layout()
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=scroll_frame)
+        self.canvas.get_tk_widget().pack(fill="x", padx=10, pady=(10, 20))
+
+        # Monthly table: one fixed row per month of the chart
+        ctk.CTkLabel(
+            scroll_frame,
+            text="📅 Miesiące",
+            font=("Arial", 18, "bold"),
+            text_color=COLORS["text_primary"]
+        ).pack(anchor="w", padx=10)
+        month_table = self.create_table(scroll_frame, self.MONTH_COLUMNS)
+        self.month_rows = [self.create_row(month_table, row + 1, len(self.MONTH_COLUMNS))
+                           for row in range(self.MONTHS)]
+
+        # Driver table: rows are added as drivers appear and hidden when unused
+        ctk.CTkLabel(
+            scroll_frame,
+            text="🚛 Kierowcy",
+            font=("Arial", 18, "bold"),
+            text_color=COLORS["text_primary"]
+        ).pack(anchor="w", padx=10, pady=(20, 0))
+        self.driver_table = self.create_table(scroll_frame, self.DRIVER_COLUMNS)
+
+        # Customer table: the CUSTOMERS largest by revenue, computed column-wise
+        ctk.CTkLabel(
+            scroll_frame,
+            text="🏢 Klienci",
+            font=("Arial", 18, "bold"),
+            text_color=COLORS["text_primary"]
+        ).pack(anchor="w", padx=10, pady=(20, 0))
+        customer_table = self.create_table(scroll_frame, self.CUSTOMER_COLUMNS)
+        self.customer_rows = [self.create_row(customer_table, row + 1, len(self.CUSTOMER_COLUMNS))
+                              for row in range(self.CUSTOMERS)]
+
+    def create_table(self, parent, columns):
+        """Grid frame with a header row"""
+        table = ctk.CTkFrame(parent, fg_color=COLORS["bg_secondary"])
+        table.pack(fill="x", padx=10, pady=10)
+        table.grid_columnconfigure(tuple(range(len(columns))), weight=1)
+        for col, title in enumerate(columns):
+            ctk.CTkLabel(
+                table,
+                text=title,
+                font=("Arial", 12, "bold"),
+                text_color=COLORS["text_secondary"]
+            ).grid(row=0, column=col, padx=8, pady=6, sticky="w")
+        return table
+
+    def create_row(self, table, row, columns):
+        """Row of labels whose text is set by update()"""
+        labels = []
+        for col in range(columns):
+            label = ctk.CTkLabel(table, text="", font=("Arial", 12), text_color=COLORS["text_primary"])
+            label.grid(row=row, column=col, padx=8, pady=2, sticky="w")
+            labels.append(label)
+        return labels
+
+    def update(self, driver_names=None, invoices=None):
+        """Show the current rollups; does nothing if they did not change
+
+        invoices (an iterable of invoice records) is only read when the
+        rollups or the date changed since the customer table was filled.
+        """
+        now = datetime.now()
+        if invoices is not None:
+            self.update_customers(invoices, now.date())
+        driver_names = driver_names or {}
+        state = (self.rollups.version, (now.year, now.month), tuple(sorted(driver_names.items())))
+        if state == self.drawn:
+            return
+        self.drawn = state
+
+        months = list(self.rollups.month_range((now.year, now.month), self.MONTHS))
+        self.update_chart(months)
+
+        for labels, ((year, month), bucket) in zip(self.month_rows, reversed(months)):
+            values = (f"{month:02d}.{year}", _money(bucket.revenue), _money(bucket.paid),
+                      _money(bucket.unpaid), _money(bucket.fuel), _money(bucket.profit),
+                      _per_km(bucket.cost_per_km))
+            for label, value in zip(labels, values):
+                label.configure(text=value)
+            labels[5].configure(text_color=COLORS["success"] if bucket.profit >= 0 else COLORS["error"])
+
+        self.update_drivers(driver_names)
+
+    def update_chart(self, months):
+        """Move the existing bars and line to the new values and redraw"""
+        for i, (_key, bucket) in enumerate(months):
+            self.paid_bars[i].set_height(bucket.paid)
+            self.unpaid_bars[i].set_y(bucket.paid)
+            self.unpaid_bars[i].set_height(bucket.unpaid)
+            self.fuel_bars[i].set_height(bucket.fuel)
+        self.profit_line.set_ydata([bucket.profit for _key, bucket in months])
+        self.axes.set_xticklabels([f"{month:02d}.{year % 100:02d}" for (year, month), _bucket in months])
+
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.canvas.draw_idle()
+
+    def update_drivers(self, driver_names):
+        """Fill driver rows, most revenue first, reusing the row widgets"""
+        drivers = sorted(self.rollups.drivers.items(), key=lambda item: -item[1].revenue)
+        while len(self.driver_rows) < len(drivers):
+            self.driver_rows.append(
+                self.create_row(self.driver_table, len(self.driver_rows) + 1, len(self.DRIVER_COLUMNS))
+            )
+        for labels, (driver_id, bucket) in zip(self.driver_rows, drivers):
+            values = (driver_names.get(driver_id, driver_id), str(bucket.invoice_count),
+                      _money(bucket.revenue), _money(bucket.fuel), _money(bucket.profit),
+                      _per_km(bucket.cost_per_km))
+            for label, value in zip(labels, values):
+                label.configure(text=value)
+                label.grid()
+        for labels in self.driver_rows[len(drivers):]:
+            for label in labels:
+                label.grid_remove()
+
+    def update_customers(self, invoices, today: date):
+        """Fill the customer table from a columnar frame of all invoices"""
+        state = (self.rollups.version, today)
+        if state == self.customers_drawn:
+            return
+        self.customers_drawn = state
+
+        customers = InvoiceFrame.from_records(invoices).by_customer(today, limit=self.CUSTOMERS)
+        for labels, customer in zip(self.customer_rows, customers):
+            values = (customer.company_name or "—", customer.nip or "—", str(customer.invoice_count),
+                      _money(customer.revenue), _money(customer.unpaid), _money(customer.overdue),
+                      _days(customer.median_payment_days), _days(customer.p90_payment_days))
+            for label, value in zip(labels, values):
+                label.configure(text=value)
+                label.grid()
+            labels[5].configure(text_color=COLORS["error"] if customer.overdue else COLORS["text_primary"])
+        for labels in self.customer_rows[len(customers):]:
+            for label in labels:
+                label.grid_remove()
@@ -5,8 +5,8 @@ Matches React's FinancialSummary.tsx
 """
 
 import customtkinter as ctk
-from datetime import datetime
 from config import COLORS
+from database.aggregates import Aggregates
 
 
 class FinancialSummary(ctk.CTkFrame):
@@ -118,52 +118,27 @@ class FinancialSummary(ctk.CTkFrame):
             'subtitle': subtitle_label
         }
     
-    def update(self, invoices: list, fuel_entries: list):
-        """Update all metrics based on data"""
-        # Filter paid and unpaid
-        unpaid = [inv for inv in invoices if not inv.get('is_paid', False)]
-        paid = [inv for inv in invoices if inv.get('is_paid', False)]
-        
-        # Calculate totals
-        unpaid_total = sum(inv.get('amount', 0) for inv in unpaid)
-        paid_total = sum(inv.get('amount', 0) for inv in paid)
+    def update(self, aggregates: Aggregates):
+        """Update all metrics from the maintained aggregates"""
+        unpaid_total = aggregates.unpaid_total
+        paid_total = aggregates.paid_total
         
         # Fuel this month
-        now = datetime.now()
-        fuel_this_month = sum(
-            entry.get('amount', 0)
-            for entry in fuel_entries
-            if datetime.fromisoformat(entry.get('date', '')).year == now.year
-            and datetime.fromisoformat(entry.get('date', '')).month == now.month
-        )
+        fuel_this_month = aggregates.fuel_this_month()
         
         # Profit (paid - fuel)
         profit = paid_total - fuel_this_month
         
-        # Average payment time (for paid invoices)
-        payment_times = []
-        for inv in paid:
-            if inv.get('paid_at') and inv.get('issue_date'):
-                try:
-                    paid_date = datetime.fromisoformat(inv['paid_at'].replace('Z', '+00:00'))
-                    issue_date = datetime.fromisoformat(inv['issue_date'].replace('Z', '+00:00'))
-                    days = (paid_date - issue_date).days
-                    payment_times.append(days)
-                except:
-                    pass
-        
-        avg_payment_time = sum(payment_times) / len(payment_times) if payment_times else 0
-        
-        # On-time percentage
-        on_time_count = sum(1 for inv in paid if inv.get('paid_on_time', False))
-        on_time_percent = (on_time_count / len(paid) * 100) if paid else 0
+        # Average payment time and on-time percentage (for paid invoices)
+        avg_payment_time = aggregates.avg_payment_days
+        on_time_percent = aggregates.on_time_percent
         
         # Update UI
         self.metric_cards['unpaid']['value'].configure(text=f"{unpaid_total:,.2f} PLN")
-        self.metric_cards['unpaid']['subtitle'].configure(text=f"{len(unpaid)} faktur")
+        self.metric_cards['unpaid']['subtitle'].configure(text=f"{aggregates.unpaid_count} faktur")
         
         self.metric_cards['paid']['value'].configure(text=f"{paid_total:,.2f} PLN")
-        self.metric_cards['paid']['subtitle'].configure(text=f"{len(paid)} faktur")
+        self.metric_cards['paid']['subtitle'].configure(text=f"{aggregates.paid_count} faktur")
         
         self.metric_cards['fuel']['value'].configure(text=f"{fuel_this_month:,.2f} PLN")
         
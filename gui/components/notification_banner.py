@@ -7,51 +7,62 @@ Matches React's NotificationBanner.tsx
 import customtkinter as ctk
 from datetime import datetime, timedelta
 from config import COLORS
+from database.deadlines import DeadlineQueue
 
 
 class NotificationBanner(ctk.CTkFrame):
     """Banner showing important notifications about invoices"""
     
-    def __init__(self, parent, **kwargs):
+    # Notifications shown; the rest is only counted
+    MAX_SHOWN = 5
+    # Re-evaluate overdue/upcoming state as time passes
+    REFRESH_MS = 60_000
+    
+    def __init__(self, parent, deadlines: DeadlineQueue, **kwargs):
         super().__init__(parent, fg_color="transparent", **kwargs)
         
+        self.deadlines = deadlines
         self.notifications = []
+        self.total = 0
         self.container = None
+        self.after(self.REFRESH_MS, self.tick)
         
-    def update(self, invoices: list):
-        """Update notifications based on invoices"""
-        # Clear previous notifications
-        self.notifications = []
+    def tick(self):
+        """Timer: refresh from the deadline queue (no table scan)"""
+        self.update()
+        self.after(self.REFRESH_MS, self.tick)
         
+    def update(self):
+        """Update notifications from the unpaid invoices closest to their deadline"""
         now = datetime.now()
         
-        for inv in invoices:
-            # Skip paid invoices
-            if inv.get('is_paid', False):
-                continue
-            
-            try:
-                deadline = datetime.fromisoformat(inv.get('deadline', '').replace('Z', '+00:00'))
-            except:
-                continue
-            
+        # days_until <= 3 <=> deadline < now + 4 days
+        horizon = now + timedelta(days=4)
+        
+        notifications = []
+        for deadline, inv in self.deadlines.due_before(horizon, limit=self.MAX_SHOWN):
             days_until = (deadline - now).days
             
             # Overdue invoices
             if days_until < 0:
-                self.notifications.append({
+                notifications.append({
                     'type': 'overdue',
                     'message': f"⚠️ Faktura przeterminowana: {inv.get('company_name', 'N/A')} ({abs(days_until)} dni temu)",
                     'color': COLORS['error']
                 })
             # Due in 3 days or less
-            elif days_until <= 3:
-                self.notifications.append({
+            else:
+                notifications.append({
                     'type': 'upcoming',
                     'message': f"⏰ Nadchodząca płatność: {inv.get('company_name', 'N/A')} (za {days_until} dni)",
                     'color': COLORS['warning']
                 })
+        total = self.deadlines.count_before(horizon)
         
+        if notifications == self.notifications and total == self.total and self.winfo_children():
+            return  # nothing changed, keep the widgets
+        self.notifications = notifications
+        self.total = total
         self.render()
     
     def render(self):
@@ -88,8 +99,8 @@ class NotificationBanner(ctk.CTkFrame):
         )
         title.pack(anchor="w", padx=15, pady=(10, 5))
         
-        # Notifications (limit to 5)
-        for notification in self.notifications[:5]:
+        # Notifications (limited to MAX_SHOWN, earliest deadline first)
+        for notification in self.notifications:
             notif_label = ctk.CTkLabel(
                 self.container,
                 text=notification['message'],
@@ -99,11 +110,11 @@ class NotificationBanner(ctk.CTkFrame):
             )
             notif_label.pack(anchor="w", padx=15, pady=2)
         
-        # Show count if more than 5
-        if len(self.notifications) > 5:
+        # Show count of the rest
+        if self.total > len(self.notifications):
             more_label = ctk.CTkLabel(
                 self.container,
-                text=f"... i {len(self.notifications) - 5} więcej",
+                text=f"... i {self.total - len(self.notifications)} więcej",
                 font=("Segoe UI", 11, "italic"),
                 text_color=COLORS["text_subtle"],
                 anchor="w"
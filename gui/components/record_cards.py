@@ -0,0 +1,324 @@
+"""
+Reusable record cards
+Widgets are built once and re-filled with set_item(), so a VirtualList
+can recycle them while scrolling
+"""
+
+import customtkinter as ctk
+from typing import Callable, Optional
+from config import COLORS
+from database.blob_store import image_hashes
+from database.records import Record
+
+
+class InvoiceCard(ctk.CTkFrame):
+    """Card with company, status badge, details and invoice actions
+
+    With a ThumbnailCache the card shows the first image of an invoice that
+    has any; its thumbnail is requested when the card is filled, i.e. when
+    the invoice scrolls into view.
+    """
+    
+    def __init__(self, parent, on_mark_paid: Callable, on_edit: Callable, on_delete: Callable,
+                 thumbnails=None, on_show_images: Optional[Callable] = None, **kwargs):
+        super().__init__(
+            parent,
+            fg_color=COLORS["bg_secondary"],
+            border_width=1,
+            border_color=COLORS["border"],
+            **kwargs
+        )
+        self.item: Optional[dict] = None
+        self.thumbnails = thumbnails
+        
+        # Header
+        header_frame = ctk.CTkFrame(self, fg_color="transparent")
+        header_frame.pack(fill="x", padx=20, pady=(15, 5))
+        
+        self.company_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=("Arial", 18, "bold"),
+            text_color=COLORS["text_primary"]
+        )
+        self.company_label.pack(side="left")
+        
+        self.badge = ctk.CTkLabel(
+            header_frame,
+            text="",
+            corner_radius=6,
+            padx=10,
+            pady=5,
+            font=("Arial", 11, "bold")
+        )
+        self.badge.pack(side="right")
+        
+        # Details
+        details_frame = ctk.CTkFrame(self, fg_color="transparent")
+        details_frame.pack(fill="x", padx=20, pady=5)
+        
+        self.details_label = ctk.CTkLabel(
+            details_frame,
+            text="",
+            font=("Arial", 12),
+            text_color=COLORS["text_secondary"]
+        )
+        self.details_label.pack(anchor="w")
+        
+        # Actions
+        actions_frame = ctk.CTkFrame(self, fg_color="transparent")
+        actions_frame.pack(fill="x", padx=20, pady=(5, 15))
+        
+        self.mark_paid_button = ctk.CTkButton(
+            actions_frame,
+            text="Oznacz jako opłaconą",
+            command=lambda: on_mark_paid(self.item),
+            fg_color=COLORS["success"],
+            hover_color=COLORS["success"] + "CC",
+            width=180,
+            height=32
+        )
+        
+        self.edit_button = ctk.CTkButton(
+            actions_frame,
+            text="Edytuj",
+            command=lambda: on_edit(self.item),
+            fg_color=COLORS["accent_blue"],
+            hover_color=COLORS["accent_blue_hover"],
+            width=100,
+            height=32
+        )
+        self.edit_button.pack(side="left", padx=(0, 10))
+        
+        ctk.CTkButton(
+            actions_frame,
+            text="Usuń",
+            command=lambda: on_delete(self.item),
+            fg_color=COLORS["error"],
+            hover_color=COLORS["error"] + "CC",
+            width=100,
+            height=32
+        ).pack(side="left")
+        
+        self.images_button = ctk.CTkButton(
+            actions_frame,
+            text="",
+            command=lambda: on_show_images(self.item),
+            fg_color=COLORS["bg_tertiary"],
+            hover_color=COLORS["border"],
+            text_color=COLORS["text_primary"],
+            compound="left",
+            width=100,
+            height=32
+        )
+    
+    def set_item(self, invoice: dict):
+        """Show another invoice in this card"""
+        self.item = invoice
+        self.company_label.configure(text=invoice.get('company_name', 'N/A'))
+        
+        # Status badge
+        is_paid = invoice.get('is_paid', False)
+        badge_color = COLORS["success"] if is_paid else COLORS["warning"]
+        self.badge.configure(
+            text="✅ Opłacono" if is_paid else "⏳ Oczekujące",
+            fg_color=badge_color + "33",  # Add transparency
+            text_color=badge_color
+        )
+        
+        self.details_label.configure(
+            text=f"NIP: {invoice.get('nip', 'N/A')} | Kwota: {invoice.get('amount', 0):.2f} PLN | Termin: {invoice.get('deadline', 'N/A')}"
+        )
+        
+        if is_paid:
+            self.mark_paid_button.pack_forget()
+        elif not self.mark_paid_button.winfo_manager():
+            self.mark_paid_button.pack(side="left", padx=(0, 10), before=self.edit_button)
+        
+        self.set_images(invoice)
+    
+    def set_images(self, invoice: dict):
+        """Images button with the first thumbnail (hidden without images)"""
+        digests = image_hashes(invoice.get('invoice_images')) + image_hashes(invoice.get('cargo_images'))
+        if not digests or self.thumbnails is None:
+            self.images_button.pack_forget()
+            return
+        
+        self.images_button.configure(text=f"📷 {len(digests)}", image=None)
+        if not self.images_button.winfo_manager():
+            self.images_button.pack(side="right")
+        
+        def show_thumbnail(image):
+            # The card may have been recycled for another invoice meanwhile
+            if self.item is invoice:
+                self.images_button.configure(image=image)
+        
+        self.thumbnails.request(digests[0], show_thumbnail)
+
+
+class FuelCard(ctk.CTkFrame):
+    """Card with date, station, liters, amount and notes of a fuel entry"""
+    
+    def __init__(self, parent, on_delete: Callable, **kwargs):
+        super().__init__(
+            parent,
+            fg_color=COLORS["bg_secondary"],
+            corner_radius=8,
+            border_width=1,
+            border_color=COLORS["border"],
+            **kwargs
+        )
+        self.item: Optional[dict] = None
+        
+        # Content
+        content = ctk.CTkFrame(self, fg_color="transparent")
+        content.pack(fill="x", padx=15, pady=12)
+        
+        # Left: Info
+        left = ctk.CTkFrame(content, fg_color="transparent")
+        left.pack(side="left", fill="x", expand=True)
+        
+        self.title_label = ctk.CTkLabel(
+            left,
+            text="",
+            font=("Arial", 14, "bold"),
+            text_color=COLORS["text_primary"]
+        )
+        self.title_label.pack(anchor="w")
+        
+        self.amount_label = ctk.CTkLabel(
+            left,
+            text="",
+            font=("Arial", 12),
+            text_color=COLORS["text_secondary"]
+        )
+        self.amount_label.pack(anchor="w", pady=(5, 0))
+        
+        self.notes_label = ctk.CTkLabel(
+            left,
+            text="",
+            font=("Arial", 11),
+            text_color=COLORS["text_subtle"]
+        )
+        
+        # Right: Actions
+        actions = ctk.CTkFrame(content, fg_color="transparent")
+        actions.pack(side="right")
+        
+        ctk.CTkButton(
+            actions,
+            text="Usuń",
+            command=lambda: on_delete(self.item),
+            fg_color=COLORS["error"],
+            hover_color=COLORS["error"] + "CC",
+            width=100,
+            height=32
+        ).pack()
+    
+    def set_item(self, fuel: Record):
+        """Show another fuel entry in this card"""
+        self.item = fuel
+        
+        fuel_date = fuel.formatted('date', "%d.%m.%Y", "N/A")
+        
+        self.title_label.configure(text=f"📅 {fuel_date} • {fuel.get('station', 'N/A')}")
+        self.amount_label.configure(text=f"⛽ {fuel.get('liters', 0):.2f} L • {fuel.get('amount', 0):.2f} PLN")
+        
+        # Notes if any
+        if fuel.get('notes'):
+            self.notes_label.configure(text=f"📝 {fuel.get('notes')}")
+            self.notes_label.pack(anchor="w", pady=(5, 0))
+        else:
+            self.notes_label.pack_forget()
+
+
+class DriverCard(ctk.CTkFrame):
+    """Card with name, phone, vehicle and daily cost of a driver"""
+    
+    def __init__(self, parent, on_delete: Callable, **kwargs):
+        super().__init__(
+            parent,
+            fg_color=COLORS["bg_secondary"],
+            corner_radius=8,
+            border_width=1,
+            border_color=COLORS["border"],
+            **kwargs
+        )
+        self.item: Optional[dict] = None
+        
+        # Content
+        content = ctk.CTkFrame(self, fg_color="transparent")
+        content.pack(fill="x", padx=15, pady=12)
+        
+        # Left: Info
+        left = ctk.CTkFrame(content, fg_color="transparent")
+        left.pack(side="left", fill="x", expand=True)
+        
+        self.name_label = ctk.CTkLabel(
+            left,
+            text="",
+            font=("Arial", 16, "bold"),
+            text_color=COLORS["text_primary"]
+        )
+        self.name_label.pack(anchor="w")
+        
+        self.phone_label = ctk.CTkLabel(
+            left,
+            text="",
+            font=("Arial", 12),
+            text_color=COLORS["text_secondary"]
+        )
+        self.phone_label.pack(anchor="w", pady=(5, 0))
+        
+        self.car_label = ctk.CTkLabel(
+            left,
+            text="",
+            font=("Arial", 11),
+            text_color=COLORS["text_subtle"]
+        )
+        
+        self.cost_label = ctk.CTkLabel(
+            left,
+            text="",
+            font=("Arial", 11, "bold"),
+            text_color=COLORS["info"]
+        )
+        
+        # Right: Actions
+        actions = ctk.CTkFrame(content, fg_color="transparent")
+        actions.pack(side="right")
+        
+        ctk.CTkButton(
+            actions,
+            text="Usuń",
+            command=lambda: on_delete(self.item),
+            fg_color=COLORS["error"],
+            hover_color=COLORS["error"] + "CC",
+            width=100,
+            height=32
+        ).pack()
+    
+    def set_item(self, driver: dict):
+        """Show another driver in this card"""
+        self.item = driver
+        self.name_label.configure(text=f"👤 {driver.get('name', 'N/A')}")
+        self.phone_label.configure(text=f"📞 {driver.get('phone', 'N/A')}")
+        
+        # Optional lines are re-packed in order so they keep their position
+        self.car_label.pack_forget()
+        self.cost_label.pack_forget()
+        
+        # Vehicle info
+        if driver.get('car_brand') or driver.get('registration_number'):
+            car_info = ""
+            if driver.get('car_brand'):
+                car_info += f"🚗 {driver.get('car_brand', '')}"
+            if driver.get('registration_number'):
+                car_info += f" • 🔖 {driver.get('registration_number', '')}"
+            self.car_label.configure(text=car_info)
+            self.car_label.pack(anchor="w", pady=(5, 0))
+        
+        # Daily cost
+        if driver.get('daily_cost'):
+            self.cost_label.configure(text=f"💰 {driver.get('daily_cost', 0):.2f} PLN/dzień")
+            self.cost_label.pack(anchor="w", pady=(5, 0))
@@ -0,0 +1,79 @@
+"""
+In-memory thumbnail cache for the GUI
+CTkImages of recently shown thumbnails, bounded by a byte budget; misses
+are loaded or generated on the image pipeline's threads
+"""
+
+import customtkinter as ctk
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+
+from services.image_pipeline import executor
+from services.thumbnails import ThumbnailStore
+
+
+class ThumbnailCache:
+    """LRU of CTkImage thumbnails keyed by image hash
+
+    request() calls back on the Tk thread with the CTkImage, immediately
+    on a hit, otherwise once a worker has read or generated the thumbnail.
+    The least recently used images are dropped when their estimated size
+    exceeds budget_bytes.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, widget, thumbs: ThumbnailStore, display_size: Tuple[int, int] = (40, 40),
+                 budget_bytes: int = 16 * 1024 * 1024):
+        self.widget = widget
+        self.thumbs = thumbs
+        self.display_size = display_size
+        self.budget_bytes = budget_bytes
+        self.images: "OrderedDict[str, Tuple[ctk.CTkImage, int]]" = OrderedDict()
+        self.used_bytes = 0
+        self.pending: Dict[str, Tuple[Future, List[Callable]]] = {}
+        self.polling = False
+
+    def request(self, digest: str, callback: Callable[[ctk.CTkImage], None]):
+        """Get a thumbnail; callback(image) runs on the Tk thread"""
+        cached = self.images.get(digest)
+        if cached is not None:
+            self.images.move_to_end(digest)
+            callback(cached[0])
+            return
+        if digest in self.pending:
+            self.pending[digest][1].append(callback)
+            return
+        self.pending[digest] = (executor().submit(self.thumbs.load, digest), [callback])
+        if not self.polling:
+            self.polling = True
+            self.widget.after(self.POLL_MS, self.poll)
+
+    def poll(self):
+        """Turn finished thumbnails into CTkImages and run their callbacks"""
+        for digest, (future, callbacks) in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[digest]
+            try:
+                thumb = future.result()
+            except Exception:
+                continue  # missing or unreadable blob: the card keeps its placeholder
+            image = self.add(digest, thumb)
+            for callback in callbacks:
+                callback(image)
+        self.polling = bool(self.pending)
+        if self.polling:
+            self.widget.after(self.POLL_MS, self.poll)
+
+    def add(self, digest: str, thumb) -> ctk.CTkImage:
+        image = ctk.CTkImage(light_image=thumb, dark_image=thumb, size=self.display_size)
+        # The PIL image plus the scaled copy CTkImage renders for Tk
+        cost = thumb.width * thumb.height * 4 * 2
+        self.images[digest] = (image, cost)
+        self.used_bytes += cost
+        while self.used_bytes > self.budget_bytes and len(self.images) > 1:
+            _digest, (_image, evicted) = self.images.popitem(last=False)
+            self.used_bytes -= evicted
+        return image
@@ -0,0 +1,194 @@
+"""
+Virtualized list component
+Only the rows visible in the viewport (plus a small overscan) exist as
+widgets; they are recycled and re-filled while scrolling
+"""
+
+import tkinter as tk
+import customtkinter as ctk
+from typing import Callable, Dict, List, Sequence
+from config import COLORS
+
+
+class PagedItems(Sequence):
+    """Lazy sequence over a database query, fetched one page at a time
+    
+    fetch(offset, limit) returns the records of a page. Only the pages the
+    list actually shows are loaded; a few recent pages are kept.
+    """
+    
+    def __init__(self, fetch: Callable[[int, int], List], count: int,
+                 page_size: int = 100, max_pages: int = 8):
+        self.fetch = fetch
+        self.count = count
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages: Dict[int, List] = {}
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        number, position = divmod(index, self.page_size)
+        records = self.pages.get(number)
+        if records is None:
+            if len(self.pages) >= self.max_pages:
+                # Dicts keep insertion order: drop the oldest page
+                del self.pages[next(iter(self.pages))]
+            records = self.fetch(number * self.page_size, self.page_size)
+            self.pages[number] = records
+        if position >= len(records):
+            raise IndexError(index)
+        return records[position]
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list of fixed-height rows backed by a pool of cards
+    
+    create_card(parent) must return a widget with set_item(item). At most
+    (visible rows + 2 * overscan) cards are ever created, no matter how
+    many items the list holds.
+    """
+    
+    def __init__(self, parent, create_card: Callable, row_height: int, gap: int = 10,
+                 padx: int = 0, overscan: int = 3, empty_text: str = "",
+                 empty_font=("Arial", 14), **kwargs):
+        super().__init__(parent, fg_color=COLORS["bg_primary"], **kwargs)
+        
+        self.create_card = create_card
+        self.row_height = row_height
+        self.gap = gap
+        self.padx = padx
+        self.overscan = overscan
+        self.items: Sequence = []
+        
+        # row index -> [card, canvas window id, item shown]
+        self.rows = {}
+        self.pool = []
+        self.region = None
+        self.card_size = None
+        
+        self.canvas = tk.Canvas(
+            self,
+            bg=COLORS["bg_primary"],
+            highlightthickness=0,
+            bd=0,
+            yscrollincrement=20
+        )
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        
+        self.empty_label = ctk.CTkLabel(
+            self.canvas,
+            text=empty_text,
+            font=empty_font,
+            text_color=COLORS["text_secondary"]
+        )
+        self.empty_window = None
+        
+        self.canvas.bind("<Configure>", lambda event: self.render())
+        self.bind_wheel(self.canvas)
+    
+    def set_items(self, items: Sequence):
+        """Replace the list content; scroll position is kept"""
+        self.items = items
+        for row in self.rows.values():
+            row[2] = None  # force re-fill of visible cards
+        self.render()
+    
+    def scaled(self, value: int) -> int:
+        """Pixel size adjusted to CustomTkinter widget scaling"""
+        return round(self._apply_widget_scaling(value))
+    
+    def on_scroll(self, first, last):
+        """Scrollbar update from the canvas; materialise newly visible rows"""
+        self.scrollbar.set(first, last)
+        self.render()
+    
+    def render(self):
+        """Place cards for the visible rows and recycle the rest"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        row_height = self.scaled(self.row_height)
+        region = (0, 0, width, max(len(self.items) * row_height, height))
+        if region != self.region:
+            # Only on change: setting it re-triggers on_scroll
+            self.region = region
+            self.canvas.configure(scrollregion=region)
+        
+        if not self.items:
+            self.recycle(list(self.rows))
+            if self.empty_window is None:
+                self.empty_window = self.canvas.create_window(0, 0, window=self.empty_label, anchor="n")
+            self.canvas.coords(self.empty_window, width / 2, self.scaled(50))
+            return
+        if self.empty_window is not None:
+            self.canvas.delete(self.empty_window)
+            self.empty_window = None
+        
+        top = max(0, int(self.canvas.canvasy(0)))
+        first = max(0, top // row_height - self.overscan)
+        last = min(len(self.items), (top + height) // row_height + 1 + self.overscan)
+        
+        self.recycle([index for index in self.rows if not first <= index < last])
+        
+        padx = self.scaled(self.padx)
+        gap = self.scaled(self.gap)
+        card_size = (max(width - 2 * padx, 1), row_height - gap)
+        if card_size != self.card_size:
+            self.card_size = card_size
+            for row in list(self.rows.values()) + self.pool:
+                self.canvas.itemconfigure(row[1], width=card_size[0], height=card_size[1])
+        
+        for index in range(first, last):
+            item = self.items[index]
+            row = self.rows.get(index)
+            if row is None:
+                row = self.pool.pop() if self.pool else self.new_row()
+                self.rows[index] = row
+                self.canvas.coords(row[1], padx, index * row_height + gap // 2)
+                self.canvas.itemconfigure(row[1], state="normal")
+            if row[2] is not item:
+                row[0].set_item(item)
+                row[2] = item
+    
+    def recycle(self, indexes):
+        """Hide the cards of the given rows and return them to the pool"""
+        for index in indexes:
+            row = self.rows.pop(index)
+            self.canvas.itemconfigure(row[1], state="hidden")
+            self.pool.append(row)
+    
+    def new_row(self):
+        """Create a card and its canvas window"""
+        card = self.create_card(self.canvas)
+        window = self.canvas.create_window(0, 0, window=card, anchor="nw")
+        if self.card_size is not None:
+            self.canvas.itemconfigure(window, width=self.card_size[0], height=self.card_size[1])
+        self.bind_wheel(card)
+        return [card, window, None]
+    
+    def bind_wheel(self, widget):
+        """Scroll the list with the mouse wheel over a widget and its children"""
+        # tk.Misc.bind: CTk widgets forward bind() to their inner widgets,
+        # which are visited by the recursion anyway
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tk.Misc.bind(widget, sequence, self.on_wheel, "+")
+        for child in widget.winfo_children():
+            self.bind_wheel(child)
+    
+    def on_wheel(self, event):
+        """Mouse wheel handler (Windows/macOS delta, X11 buttons 4/5)"""
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-3, "units")
+        elif event.num == 5 or event.delta < 0:
+            self.canvas.yview_scroll(3, "units")
+        return "break"
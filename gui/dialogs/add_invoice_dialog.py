@@ -5,25 +5,26 @@ Matches React's AddInvoiceDialog.tsx functionality
 
 import customtkinter as ctk
 from datetime import datetime, timedelta
-from tkinter import filedialog, messagebox
-from typing import Optional, Callable
-import base64
-from PIL import Image
-import io
+from tkinter import messagebox
+from typing import Optional, Callable, List
 
 from config import COLORS
 from database.models import Invoice
+from database.blob_store import BlobStore
+from gui.dialogs.image_ingest import ImageIngestMixin
 
 
-class AddInvoiceDialog(ctk.CTkToplevel):
+class AddInvoiceDialog(ImageIngestMixin, ctk.CTkToplevel):
     """Dialog for adding a new invoice"""
     
     def __init__(self, parent, on_save: Callable[[Invoice], None]):
         super().__init__(parent)
         
         self.on_save = on_save
-        self.invoice_images: Optional[str] = None
-        self.cargo_images: Optional[str] = None
+        self.blob_store = BlobStore()
+        self.pending_images = {}
+        self.invoice_images: Optional[List[str]] = None
+        self.cargo_images: Optional[List[str]] = None
         
         # Configure window
         self.title("Dodaj Fakturę")
@@ -215,49 +216,6 @@ class AddInvoiceDialog(ctk.CTkToplevel):
         )
         self.cargo_images_label.pack(anchor="w", pady=(5, 0))
     
-    def select_images(self, image_type: str):
-        """Open file dialog to select images"""
-        files = filedialog.askopenfilenames(
-            title=f"Wybierz zdjęcia {'faktury' if image_type == 'invoice' else 'towaru'}",
-            filetypes=[("Image files", "*.png *.jpg *.jpeg *.gif *.bmp")]
-        )
-        
-        if files:
-            # Convert images to base64
-            encoded_images = []
-            for file_path in files:
-                try:
-                    with Image.open(file_path) as img:
-                        # Resize if too large
-                        max_size = (1920, 1920)
-                        img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                        
-                        # Convert to base64
-                        buffer = io.BytesIO()
-                        img.save(buffer, format="PNG")
-                        img_bytes = buffer.getvalue()
-                        encoded = base64.b64encode(img_bytes).decode('utf-8')
-                        encoded_images.append(f"data:image/png;base64,{encoded}")
-                except Exception as e:
-                    messagebox.showerror("Błąd", f"Nie można wczytać {file_path}: {e}")
-            
-            # Join all images with separator
-            encoded_str = "|||".join(encoded_images)
-            
-            # Store and update UI
-            if image_type == "invoice":
-                self.invoice_images = encoded_str
-                self.invoice_images_label.configure(
-                    text=f"Wybrano {len(encoded_images)} zdjęć",
-                    text_color=COLORS["success"]
-                )
-            else:
-                self.cargo_images = encoded_str
-                self.cargo_images_label.configure(
-                    text=f"Wybrano {len(encoded_images)} zdjęć",
-                    text_color=COLORS["success"]
-                )
-    
     def create_buttons(self):
         """Create action buttons"""
         btn_frame = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
@@ -278,7 +236,7 @@ class AddInvoiceDialog(ctk.CTkToplevel):
         cancel_btn.pack(side="left", fill="x", expand=True, padx=(0, 5))
         
         # Save button
-        save_btn = ctk.CTkButton(
+        self.save_button = ctk.CTkButton(
             btn_frame,
             text="Zapisz Fakturę",
             command=self.save_invoice,
@@ -287,7 +245,7 @@ class AddInvoiceDialog(ctk.CTkToplevel):
             height=40,
             font=("Segoe UI", 13, "bold")
         )
-        save_btn.pack(side="right", fill="x", expand=True, padx=(5, 0))
+        self.save_button.pack(side="right", fill="x", expand=True, padx=(5, 0))
     
     def get_entry_value(self, field_name: str) -> str:
         """Get value from entry field"""
@@ -302,6 +260,10 @@ class AddInvoiceDialog(ctk.CTkToplevel):
     
     def save_invoice(self):
         """Validate and save invoice"""
+        # Selected images are still being processed; try again when they may be done
+        if not self.images_ready(self.save_invoice):
+            return
+        
         # Get values
         company_name = self.get_entry_value("company_name")
         nip = self.get_entry_value("nip")
@@ -5,17 +5,16 @@ Matches React's EditInvoiceDialog.tsx functionality
 
 import customtkinter as ctk
 from datetime import datetime, timedelta
-from tkinter import filedialog, messagebox
+from tkinter import messagebox
 from typing import Optional, Callable
-import base64
-from PIL import Image
-import io
 
 from config import COLORS
 from database.models import Invoice
+from database.blob_store import BlobStore, image_count
+from gui.dialogs.image_ingest import ImageIngestMixin
 
 
-class EditInvoiceDialog(ctk.CTkToplevel):
+class EditInvoiceDialog(ImageIngestMixin, ctk.CTkToplevel):
     """Dialog for editing an existing invoice"""
     
     def __init__(self, parent, invoice: Invoice, on_save: Callable[[Invoice], None]):
@@ -23,6 +22,8 @@ class EditInvoiceDialog(ctk.CTkToplevel):
         
         self.invoice = invoice
         self.on_save = on_save
+        self.blob_store = BlobStore()
+        self.pending_images = {}
         self.invoice_images = invoice.invoice_images
         self.cargo_images = invoice.cargo_images
         
@@ -207,44 +208,6 @@ class EditInvoiceDialog(ctk.CTkToplevel):
         )
         self.cargo_images_label.pack(anchor="w", pady=(5, 0))
     
-    def select_images(self, image_type: str):
-        """Open file dialog to select images"""
-        files = filedialog.askopenfilenames(
-            title=f"Wybierz zdjęcia {'faktury' if image_type == 'invoice' else 'towaru'}",
-            filetypes=[("Image files", "*.png *.jpg *.jpeg *.gif *.bmp")]
-        )
-        
-        if files:
-            encoded_images = []
-            for file_path in files:
-                try:
-                    with Image.open(file_path) as img:
-                        max_size = (1920, 1920)
-                        img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                        
-                        buffer = io.BytesIO()
-                        img.save(buffer, format="PNG")
-                        img_bytes = buffer.getvalue()
-                        encoded = base64.b64encode(img_bytes).decode('utf-8')
-                        encoded_images.append(f"data:image/png;base64,{encoded}")
-                except Exception as e:
-                    messagebox.showerror("Błąd", f"Nie można wczytać {file_path}: {e}")
-            
-            encoded_str = "|||".join(encoded_images)
-            
-            if image_type == "invoice":
-                self.invoice_images = encoded_str
-                self.invoice_images_label.configure(
-                    text=f"Wybrano {len(encoded_images)} zdjęć",
-                    text_color=COLORS["success"]
-                )
-            else:
-                self.cargo_images = encoded_str
-                self.cargo_images_label.configure(
-                    text=f"Wybrano {len(encoded_images)} zdjęć",
-                    text_color=COLORS["success"]
-                )
-    
     def populate_fields(self):
         """Populate fields with invoice data"""
         # Company info
@@ -286,7 +249,7 @@ class EditInvoiceDialog(ctk.CTkToplevel):
         
         # Update image labels
         if self.invoice.invoice_images:
-            count = len(self.invoice.invoice_images.split("|||"))
+            count = image_count(self.invoice.invoice_images)
             self.invoice_images_label.configure(
                 text=f"Obecne: {count} zdjęć",
                 text_color=COLORS["success"]
@@ -295,7 +258,7 @@ class EditInvoiceDialog(ctk.CTkToplevel):
             self.invoice_images_label.configure(text="Brak zdjęć")
         
         if self.invoice.cargo_images:
-            count = len(self.invoice.cargo_images.split("|||"))
+            count = image_count(self.invoice.cargo_images)
             self.cargo_images_label.configure(
                 text=f"Obecne: {count} zdjęć",
                 text_color=COLORS["success"]
@@ -321,7 +284,7 @@ class EditInvoiceDialog(ctk.CTkToplevel):
         )
         cancel_btn.pack(side="left", fill="x", expand=True, padx=(0, 5))
         
-        save_btn = ctk.CTkButton(
+        self.save_button = ctk.CTkButton(
             btn_frame,
             text="Zapisz Zmiany",
             command=self.save_invoice,
@@ -330,7 +293,7 @@ class EditInvoiceDialog(ctk.CTkToplevel):
             height=40,
             font=("Segoe UI", 13, "bold")
         )
-        save_btn.pack(side="right", fill="x", expand=True, padx=(5, 0))
+        self.save_button.pack(side="right", fill="x", expand=True, padx=(5, 0))
     
     def get_entry_value(self, field_name: str) -> str:
         """Get value from entry field"""
@@ -345,6 +308,10 @@ class EditInvoiceDialog(ctk.CTkToplevel):
     
     def save_invoice(self):
         """Validate and save invoice"""
+        # Selected images are still being processed; try again when they may be done
+        if not self.images_ready(self.save_invoice):
+            return
+        
         # Get values
         company_name = self.get_entry_value("company_name")
         nip = self.get_entry_value("nip")
@@ -0,0 +1,102 @@
+"""
+Export Progress Dialog
+Shows the progress of a background ExportJob and lets the user cancel it
+"""
+
+import customtkinter as ctk
+from tkinter import messagebox
+from typing import Callable, Optional
+
+from config import COLORS
+from services.export_job import ExportJob, PROGRESS, DONE, FAILED, CANCELLED
+
+
+class ExportProgressDialog(ctk.CTkToplevel):
+    """Non-modal progress window polling an ExportJob with after()"""
+
+    POLL_MS = 100
+
+    def __init__(self, parent, job: ExportJob, title: str, on_finish: Optional[Callable[[], None]] = None):
+        super().__init__(parent)
+
+        self.job = job
+        self.on_finish = on_finish
+
+        # Configure window
+        self.title(title)
+        self.geometry("420x170")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.setup_ui(title)
+        self.after(self.POLL_MS, self.poll)
+
+    def setup_ui(self, title):
+        """Create dialog UI"""
+        main_frame = ctk.CTkFrame(self, fg_color=COLORS["bg_primary"])
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        ctk.CTkLabel(
+            main_frame,
+            text=title,
+            font=("Segoe UI", 16, "bold"),
+            text_color=COLORS["text_primary"]
+        ).pack(anchor="w")
+
+        self.progress_bar = ctk.CTkProgressBar(main_frame, progress_color=COLORS["accent_blue"])
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x", pady=(15, 5))
+
+        self.status_label = ctk.CTkLabel(
+            main_frame,
+            text="Przygotowywanie...",
+            font=("Segoe UI", 11),
+            text_color=COLORS["text_secondary"]
+        )
+        self.status_label.pack(anchor="w")
+
+        self.cancel_button = ctk.CTkButton(
+            main_frame,
+            text="Anuluj",
+            command=self.cancel,
+            fg_color=COLORS["error"],
+            hover_color="#E53935",
+            width=120
+        )
+        self.cancel_button.pack(side="right", pady=(10, 0))
+
+    def cancel(self):
+        """Ask the job to stop; the dialog closes once it has"""
+        self.job.cancel()
+        self.cancel_button.configure(state="disabled", text="Anulowanie...")
+
+    def poll(self):
+        """Apply queued job messages on the Tk thread"""
+        for message in self.job.poll():
+            kind = message[0]
+            if kind == PROGRESS:
+                _kind, done, total = message
+                self.progress_bar.set(done / total if total else 1)
+                if done < total:
+                    self.status_label.configure(text=f"Przetworzono {done} z {total}")
+                else:
+                    self.status_label.configure(text="Zapisywanie pliku...")
+            elif kind == DONE:
+                self.finish()
+                messagebox.showinfo("Sukces", f"Eksport zapisany:\n{message[1]}")
+                return
+            elif kind == FAILED:
+                self.finish()
+                messagebox.showerror("Błąd", f"Nie udało się wyeksportować:\n{str(message[1])}")
+                return
+            elif kind == CANCELLED:
+                self.finish()
+                messagebox.showinfo("Anulowano", "Eksport anulowany")
+                return
+        self.after(self.POLL_MS, self.poll)
+
+    def finish(self):
+        self.destroy()
+        if self.on_finish is not None:
+            self.on_finish()
@@ -0,0 +1,95 @@
+"""
+Background image selection shared by the invoice dialogs
+"""
+
+import os
+from tkinter import filedialog, messagebox
+from typing import Callable
+
+from config import COLORS
+from services.image_pipeline import ingest_images
+
+
+class ImageIngestMixin:
+    """select_images() processing files on the image pipeline's threads
+
+    Expects blob_store, invoice_images/cargo_images, the matching
+    *_images_label attributes, save_button and pending_images = {}
+    (image_type -> (paths, futures) still being processed). The dialog
+    polls the futures with after(), showing per-file progress;
+    save_invoice waits for pending images through images_ready().
+    """
+
+    POLL_MS = 100
+
+    def select_images(self, image_type: str):
+        """Open file dialog to select images"""
+        files = filedialog.askopenfilenames(
+            title=f"Wybierz zdjęcia {'faktury' if image_type == 'invoice' else 'towaru'}",
+            filetypes=[("Image files", "*.png *.jpg *.jpeg *.webp *.gif *.bmp")]
+        )
+        if not files:
+            return
+
+        # A new selection replaces a still running one of the same type
+        batch = (list(files), ingest_images(self.blob_store, files))
+        self.pending_images[image_type] = batch
+        self.poll_images(image_type, batch)
+
+    def poll_images(self, image_type: str, batch):
+        """Show progress; store the hashes once every file is done"""
+        if not self.winfo_exists() or self.pending_images.get(image_type) is not batch:
+            return
+        files, futures = batch
+        label = getattr(self, f"{image_type}_images_label")
+
+        done = [future.done() for future in futures]
+        if not all(done):
+            current = os.path.basename(files[done.index(False)])
+            label.configure(
+                text=f"Przetwarzanie {sum(done)}/{len(files)}: {current}",
+                text_color=COLORS["text_subtle"]
+            )
+            self.after(self.POLL_MS, self.poll_images, image_type, batch)
+            return
+
+        del self.pending_images[image_type]
+        hashes = []
+        for path, future in zip(files, futures):
+            try:
+                digest = future.result()
+            except Exception as e:
+                messagebox.showerror("Błąd", f"Nie można wczytać {path}: {e}")
+                continue
+            if digest not in hashes:
+                hashes.append(digest)
+
+        setattr(self, f"{image_type}_images", hashes or None)
+        label.configure(
+            text=f"Wybrano {len(hashes)} zdjęć",
+            text_color=COLORS["success"]
+        )
+
+    def images_ready(self, retry: Callable[[], None]) -> bool:
+        """True if no images are pending; otherwise call retry once they are
+
+        The save button stays disabled while waiting, so repeated clicks
+        cannot queue a second save.
+        """
+        if not self.pending_images:
+            return True
+        if self.save_button.cget("state") != "disabled":
+            self.save_button.configure(state="disabled")
+            self.after(self.POLL_MS, self.retry_when_ready, retry)
+        return False
+
+    def retry_when_ready(self, retry: Callable[[], None]):
+        """Wait for pending images, then re-enable saving and retry"""
+        if not self.winfo_exists():
+            return
+        if self.pending_images:
+            self.after(self.POLL_MS, self.retry_when_ready, retry)
+            return
+        # Enabled again first, so a failed validation can be fixed and saved
+        self.save_button.configure(state="normal")
+        retry()
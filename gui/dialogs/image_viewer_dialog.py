@@ -0,0 +1,100 @@
+"""
+Image Viewer Dialog
+Shows invoice and cargo images at full resolution, one at a time
+"""
+
+import customtkinter as ctk
+import io
+from typing import List
+from PIL import Image
+
+from config import COLORS
+from database.blob_store import BlobStore
+from services.image_encoding import fit
+
+
+class ImageViewerDialog(ctk.CTkToplevel):
+    """Viewer decoding only the image being shown"""
+
+    VIEW_SIZE = (960, 640)
+
+    def __init__(self, parent, store: BlobStore, digests: List[str], title: str = "Zdjęcia"):
+        super().__init__(parent)
+
+        self.store = store
+        self.digests = digests
+        self.index = 0
+
+        # Configure window
+        self.title(title)
+        self.geometry("1000x760")
+        self.transient(parent)
+
+        self.setup_ui()
+        self.bind("<Left>", lambda _event: self.show(self.index - 1))
+        self.bind("<Right>", lambda _event: self.show(self.index + 1))
+        self.show(0)
+
+    def setup_ui(self):
+        """Create dialog UI"""
+        main_frame = ctk.CTkFrame(self, fg_color=COLORS["bg_primary"])
+        main_frame.pack(fill="both", expand=True)
+
+        self.image_label = ctk.CTkLabel(
+            main_frame,
+            text="",
+            font=("Segoe UI", 14),
+            text_color=COLORS["text_secondary"]
+        )
+        self.image_label.pack(fill="both", expand=True, padx=20, pady=20)
+
+        nav_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        nav_frame.pack(fill="x", padx=20, pady=(0, 20))
+
+        self.prev_button = ctk.CTkButton(
+            nav_frame,
+            text="◀ Poprzednie",
+            command=lambda: self.show(self.index - 1),
+            fg_color=COLORS["accent_blue"],
+            hover_color=COLORS["accent_blue_hover"],
+            width=140
+        )
+        self.prev_button.pack(side="left")
+
+        self.counter_label = ctk.CTkLabel(
+            nav_frame,
+            text="",
+            font=("Segoe UI", 13),
+            text_color=COLORS["text_primary"]
+        )
+        self.counter_label.pack(side="left", expand=True)
+
+        self.next_button = ctk.CTkButton(
+            nav_frame,
+            text="Następne ▶",
+            command=lambda: self.show(self.index + 1),
+            fg_color=COLORS["accent_blue"],
+            hover_color=COLORS["accent_blue_hover"],
+            width=140
+        )
+        self.next_button.pack(side="right")
+
+    def show(self, index: int):
+        """Decode and show one image"""
+        if not 0 <= index < len(self.digests):
+            return
+        self.index = index
+        self.counter_label.configure(text=f"{index + 1} / {len(self.digests)}")
+        self.prev_button.configure(state="normal" if index > 0 else "disabled")
+        self.next_button.configure(state="normal" if index < len(self.digests) - 1 else "disabled")
+
+        try:
+            with Image.open(io.BytesIO(self.store.get(self.digests[index]))) as img:
+                img.load()
+                image = ctk.CTkImage(light_image=img, dark_image=img, size=fit(img.size, self.VIEW_SIZE))
+        except (KeyError, OSError) as e:
+            self.image_label.configure(image=None, text=f"Nie można wczytać zdjęcia: {e}")
+            return
+        self.image_label.configure(image=image, text="")
+        # Keep a reference; Tk does not own the image
+        self.image = image
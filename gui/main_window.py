@@ -6,16 +6,31 @@ Equivalent to App.tsx in React version
 import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime
-from database.db import Database
+from database.aggregates import Aggregates
+from database.blob_store import BlobStore, image_hashes
+from database.db import create_database
+from database.deadlines import DeadlineQueue, is_paid_on_time
+from database.events import ChangeEvent, REMOVED, RELOADED
 from database.models import Invoice, Driver, FuelEntry, Vehicle
+from database.records import compact, compact_by_id, freeze
+from database.rollups import Rollups
 from gui.dialogs.add_invoice_dialog import AddInvoiceDialog
 from gui.dialogs.edit_invoice_dialog import EditInvoiceDialog
 from gui.dialogs.add_driver_dialog import AddDriverDialog
 from gui.dialogs.add_fuel_dialog import AddFuelDialog
+from gui.dialogs.export_progress_dialog import ExportProgressDialog
+from gui.dialogs.image_viewer_dialog import ImageViewerDialog
 from gui.components.notification_banner import NotificationBanner
 from gui.components.financial_summary import FinancialSummary
-from services.export_service import ExportService
+from gui.components.balance_view import BalanceView
+from gui.components.record_cards import InvoiceCard, FuelCard, DriverCard
+from gui.components.thumbnail_cache import ThumbnailCache
+from gui.components.virtual_list import PagedItems, VirtualList
+from services.export_job import ExportJob
+from services.export_service import ExportService, STREAMING_PDF_ROWS, ordered
+from services.thumbnails import ThumbnailStore
 import config
+from utils import timing
 
 
 class MainWindow(ctk.CTk):
@@ -29,23 +44,51 @@ class MainWindow(ctk.CTk):
         self.geometry("1600x1000")
         self.minsize(1280, 800)
         
-        # Database
-        self.db = Database()
+        # Database and aggregates kept up to date from its change events
+        self.db = create_database()
+        timing.phase("baza danych")
+        self.aggregates = Aggregates(self.db)
+        self.deadlines = DeadlineQueue(self.db)
+        self.rollups = Rollups(self.db)
+        timing.phase("agregaty")
         
         # Services
         self.export_service = ExportService()
+        self.export_job = None
+        
+        # Images; thumbnails of visible invoice cards are cached in memory
+        self.blob_store = BlobStore()
+        self.thumbnails = ThumbnailCache(self, ThumbnailStore(self.blob_store), display_size=(24, 24))
         
         # State
         self.current_tab = "outstanding"
-        self.invoices = []
-        self.drivers = []
-        self.fuel_entries = []
-        self.vehicles = []
+        # table name -> {id: compact record}, kept in sync by on_db_change
+        self.records = {table: {} for table in ("invoices", "drivers", "fuel_entries", "vehicles")}
+        
+        # Virtual list of the current tab and whether its items are stale
+        self.list_view = None
+        self.list_dirty = False
+        self.summary_refresh_pending = False
+        # A rollback or reload reports every table; they share one reload
+        self.reload_pending = False
+        
+        # Balance tab is built once and kept (with its chart) across tab switches
+        self.balance_view = None
         
         # Setup UI
         self.setup_ui()
         self.load_data()
+        self.db.subscribe(self.on_db_change)
         self.update_clock()
+        # Closing folds the database journal into faktury.json
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        timing.phase("interfejs")
+        self.after_idle(self.startup_done)
+        
+    def startup_done(self):
+        """First idle moment after the window was built"""
+        timing.phase("pierwsze rysowanie")
+        timing.report()
         
     def setup_ui(self):
         """Setup main UI layout"""
@@ -57,7 +100,7 @@ class MainWindow(ctk.CTk):
         self.create_header(main_frame)
         
         # Notification Banner
-        self.notification_banner = NotificationBanner(main_frame)
+        self.notification_banner = NotificationBanner(main_frame, self.deadlines)
         
         # Financial Summary (6 cards)
         self.financial_summary = FinancialSummary(main_frame, height=260)
@@ -294,7 +337,12 @@ class MainWindow(ctk.CTk):
         
         # Clear content
         for widget in self.content_frame.winfo_children():
-            widget.destroy()
+            if widget is self.balance_view:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+        self.list_view = None
+        self.list_dirty = False
         
         # Show appropriate content
         if tab_id == "outstanding":
@@ -312,139 +360,51 @@ class MainWindow(ctk.CTk):
         
     def show_outstanding_invoices(self):
         """Show outstanding (unpaid) invoices"""
-        outstanding = [inv for inv in self.invoices if not inv.get('is_paid', False)]
-        
-        # Scrollable frame
-        scroll_frame = ctk.CTkScrollableFrame(
+        self.list_view = VirtualList(
             self.content_frame,
-            fg_color=config.COLORS["bg_primary"]
+            create_card=self.create_invoice_card,
+            row_height=145,
+            gap=20,
+            padx=10,
+            empty_text="Brak oczekujących faktur",
+            empty_font=("Arial", 18)
         )
-        scroll_frame.pack(fill="both", expand=True)
-        
-        if not outstanding:
-            ctk.CTkLabel(
-                scroll_frame,
-                text="Brak oczekujących faktur",
-                font=("Arial", 18),
-                text_color=config.COLORS["text_secondary"]
-            ).pack(pady=50)
-        else:
-            for invoice in outstanding:
-                self.create_invoice_card(scroll_frame, invoice)
+        self.list_view.pack(fill="both", expand=True)
+        self.list_view.set_items(self.tab_items("outstanding"))
                 
     def show_paid_invoices(self):
         """Show paid invoices"""
-        paid = [inv for inv in self.invoices if inv.get('is_paid', False)]
-        
-        scroll_frame = ctk.CTkScrollableFrame(
+        self.list_view = VirtualList(
             self.content_frame,
-            fg_color=config.COLORS["bg_primary"]
+            create_card=self.create_invoice_card,
+            row_height=145,
+            gap=20,
+            padx=10,
+            empty_text="Brak opłaconych faktur",
+            empty_font=("Arial", 18)
         )
-        scroll_frame.pack(fill="both", expand=True)
-        
-        if not paid:
-            ctk.CTkLabel(
-                scroll_frame,
-                text="Brak opłaconych faktur",
-                font=("Arial", 18),
-                text_color=config.COLORS["text_secondary"]
-            ).pack(pady=50)
-        else:
-            for invoice in paid:
-                self.create_invoice_card(scroll_frame, invoice)
+        self.list_view.pack(fill="both", expand=True)
+        self.list_view.set_items(self.tab_items("paid"))
                 
-    def create_invoice_card(self, parent, invoice):
-        """Create invoice card component"""
-        card = ctk.CTkFrame(
+    def create_invoice_card(self, parent):
+        """Create a recyclable invoice card"""
+        return InvoiceCard(
             parent,
-            fg_color=config.COLORS["bg_secondary"],
-            border_width=1,
-            border_color=config.COLORS["border"]
+            on_mark_paid=self.mark_as_paid,
+            on_edit=self.edit_invoice,
+            on_delete=self.delete_invoice,
+            thumbnails=self.thumbnails,
+            on_show_images=self.show_images
         )
-        card.pack(fill="x", padx=10, pady=10)
-        
-        # Header
-        header_frame = ctk.CTkFrame(card, fg_color="transparent")
-        header_frame.pack(fill="x", padx=20, pady=(15, 5))
-        
-        # Company name
-        ctk.CTkLabel(
-            header_frame,
-            text=invoice.get('company_name', 'N/A'),
-            font=("Arial", 18, "bold"),
-            text_color=config.COLORS["text_primary"]
-        ).pack(side="left")
-        
-        # Status badge
-        is_paid = invoice.get('is_paid', False)
-        badge_color = config.COLORS["success"] if is_paid else config.COLORS["warning"]
-        badge_text = "✅ Opłacono" if is_paid else "⏳ Oczekujące"
-        
-        badge = ctk.CTkLabel(
-            header_frame,
-            text=badge_text,
-            fg_color=badge_color + "33",  # Add transparency
-            text_color=badge_color,
-            corner_radius=6,
-            padx=10,
-            pady=5,
-            font=("Arial", 11, "bold")
-        )
-        badge.pack(side="right")
-        
-        # Details
-        details_frame = ctk.CTkFrame(card, fg_color="transparent")
-        details_frame.pack(fill="x", padx=20, pady=5)
-        
-        details_text = f"NIP: {invoice.get('nip', 'N/A')} | Kwota: {invoice.get('amount', 0):.2f} PLN | Termin: {invoice.get('deadline', 'N/A')}"
-        ctk.CTkLabel(
-            details_frame,
-            text=details_text,
-            font=("Arial", 12),
-            text_color=config.COLORS["text_secondary"]
-        ).pack(anchor="w")
-        
-        # Actions
-        actions_frame = ctk.CTkFrame(card, fg_color="transparent")
-        actions_frame.pack(fill="x", padx=20, pady=(5, 15))
-        
-        if not is_paid:
-            ctk.CTkButton(
-                actions_frame,
-                text="Oznacz jako opłaconą",
-                command=lambda inv=invoice: self.mark_as_paid(inv),
-                fg_color=config.COLORS["success"],
-                hover_color=config.COLORS["success"] + "CC",
-                width=180,
-                height=32
-            ).pack(side="left", padx=(0, 10))
-        
-        ctk.CTkButton(
-            actions_frame,
-            text="Edytuj",
-            command=lambda inv=invoice: self.edit_invoice(inv),
-            fg_color=config.COLORS["accent_blue"],
-            hover_color=config.COLORS["accent_blue_hover"],
-            width=100,
-            height=32
-        ).pack(side="left", padx=(0, 10))
-        
-        ctk.CTkButton(
-            actions_frame,
-            text="Usuń",
-            command=lambda inv=invoice: self.delete_invoice(inv),
-            fg_color=config.COLORS["error"],
-            hover_color=config.COLORS["error"] + "CC",
-            width=100,
-            height=32
-        ).pack(side="left")
+    
+    def show_images(self, invoice):
+        """Open the image viewer for an invoice"""
+        digests = image_hashes(invoice.get('invoice_images')) + image_hashes(invoice.get('cargo_images'))
+        if digests:
+            ImageViewerDialog(self, self.blob_store, digests, title=f"Zdjęcia - {invoice.get('company_name', '')}")
         
     def show_fuel_entries(self):
         """Show fuel entries tab"""
-        # Clear content
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        
         # Header with add button
         header = ctk.CTkFrame(self.content_frame, fg_color="transparent")
         header.pack(fill="x", pady=(0, 15))
@@ -466,86 +426,18 @@ class MainWindow(ctk.CTk):
         ).pack(side="right")
         
         # Scrollable list
-        scroll_frame = ctk.CTkScrollableFrame(
+        self.list_view = VirtualList(
             self.content_frame,
-            fg_color=config.COLORS["bg_primary"]
+            create_card=self.create_fuel_card,
+            row_height=100,
+            empty_text="Brak wpisów tankowania\nDodaj pierwszy wpis klikając przycisk powyżej"
         )
-        scroll_frame.pack(fill="both", expand=True)
-        
-        # Show fuel entries
-        if not self.fuel_entries:
-            ctk.CTkLabel(
-                scroll_frame,
-                text="Brak wpisów tankowania\nDodaj pierwszy wpis klikając przycisk powyżej",
-                font=("Arial", 14),
-                text_color=config.COLORS["text_secondary"]
-            ).pack(pady=50)
-        else:
-            for fuel in sorted(self.fuel_entries, key=lambda x: x.get('date', ''), reverse=True):
-                self.create_fuel_card(scroll_frame, fuel)
+        self.list_view.pack(fill="both", expand=True)
+        self.list_view.set_items(self.tab_items("fuel"))
     
-    def create_fuel_card(self, parent, fuel: dict):
-        """Create a fuel entry card"""
-        card = ctk.CTkFrame(
-            parent,
-            fg_color=config.COLORS["bg_secondary"],
-            corner_radius=8,
-            border_width=1,
-            border_color=config.COLORS["border"]
-        )
-        card.pack(fill="x", padx=0, pady=5)
-        
-        # Content
-        content = ctk.CTkFrame(card, fg_color="transparent")
-        content.pack(fill="x", padx=15, pady=12)
-        
-        # Left: Info
-        left = ctk.CTkFrame(content, fg_color="transparent")
-        left.pack(side="left", fill="x", expand=True)
-        
-        # Date and station
-        try:
-            fuel_date = datetime.fromisoformat(fuel.get('date', '')).strftime("%d.%m.%Y")
-        except:
-            fuel_date = "N/A"
-        
-        ctk.CTkLabel(
-            left,
-            text=f"📅 {fuel_date} • {fuel.get('station', 'N/A')}",
-            font=("Arial", 14, "bold"),
-            text_color=config.COLORS["text_primary"]
-        ).pack(anchor="w")
-        
-        # Amount and liters
-        ctk.CTkLabel(
-            left,
-            text=f"⛽ {fuel.get('liters', 0):.2f} L • {fuel.get('amount', 0):.2f} PLN",
-            font=("Arial", 12),
-            text_color=config.COLORS["text_secondary"]
-        ).pack(anchor="w", pady=(5, 0))
-        
-        # Notes if any
-        if fuel.get('notes'):
-            ctk.CTkLabel(
-                left,
-                text=f"📝 {fuel.get('notes')}",
-                font=("Arial", 11),
-                text_color=config.COLORS["text_subtle"]
-            ).pack(anchor="w", pady=(5, 0))
-        
-        # Right: Actions
-        actions = ctk.CTkFrame(content, fg_color="transparent")
-        actions.pack(side="right")
-        
-        ctk.CTkButton(
-            actions,
-            text="Usuń",
-            command=lambda f=fuel: self.delete_fuel(f),
-            fg_color=config.COLORS["error"],
-            hover_color=config.COLORS["error"] + "CC",
-            width=100,
-            height=32
-        ).pack()
+    def create_fuel_card(self, parent):
+        """Create a recyclable fuel entry card"""
+        return FuelCard(parent, on_delete=self.delete_fuel)
     
     def add_fuel_clicked(self):
         """Handle add fuel button click"""
@@ -554,24 +446,16 @@ class MainWindow(ctk.CTk):
     def on_fuel_added(self, fuel: FuelEntry):
         """Callback when fuel is added"""
         self.db.add_fuel_entry(fuel)
-        self.load_data()
-        self.show_tab(self.current_tab)
         messagebox.showinfo("Sukces", "Tankowanie dodane!")
     
     def delete_fuel(self, fuel: dict):
         """Delete fuel entry"""
         if messagebox.askyesno("Potwierdź", "Czy na pewno usunąć ten wpis tankowania?"):
             self.db.delete_fuel_entry(fuel['id'])
-            self.load_data()
-            self.show_tab(self.current_tab)
             messagebox.showinfo("Sukces", "Tankowanie usunięte!")
         
     def show_drivers(self):
         """Show drivers tab"""
-        # Clear content
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        
         # Header with add button
         header = ctk.CTkFrame(self.content_frame, fg_color="transparent")
         header.pack(fill="x", pady=(0, 15))
@@ -593,96 +477,18 @@ class MainWindow(ctk.CTk):
         ).pack(side="right")
         
         # Scrollable list
-        scroll_frame = ctk.CTkScrollableFrame(
+        self.list_view = VirtualList(
             self.content_frame,
-            fg_color=config.COLORS["bg_primary"]
+            create_card=self.create_driver_card,
+            row_height=125,
+            empty_text="Brak kierowców\nDodaj pierwszego kierowcę klikając przycisk powyżej"
         )
-        scroll_frame.pack(fill="both", expand=True)
-        
-        # Show drivers
-        if not self.drivers:
-            ctk.CTkLabel(
-                scroll_frame,
-                text="Brak kierowców\nDodaj pierwszego kierowcę klikając przycisk powyżej",
-                font=("Arial", 14),
-                text_color=config.COLORS["text_secondary"]
-            ).pack(pady=50)
-        else:
-            for driver in sorted(self.drivers, key=lambda x: x.get('name', '')):
-                self.create_driver_card(scroll_frame, driver)
+        self.list_view.pack(fill="both", expand=True)
+        self.list_view.set_items(self.tab_items("drivers"))
     
-    def create_driver_card(self, parent, driver: dict):
-        """Create a driver card"""
-        card = ctk.CTkFrame(
-            parent,
-            fg_color=config.COLORS["bg_secondary"],
-            corner_radius=8,
-            border_width=1,
-            border_color=config.COLORS["border"]
-        )
-        card.pack(fill="x", padx=0, pady=5)
-        
-        # Content
-        content = ctk.CTkFrame(card, fg_color="transparent")
-        content.pack(fill="x", padx=15, pady=12)
-        
-        # Left: Info
-        left = ctk.CTkFrame(content, fg_color="transparent")
-        left.pack(side="left", fill="x", expand=True)
-        
-        # Name
-        ctk.CTkLabel(
-            left,
-            text=f"👤 {driver.get('name', 'N/A')}",
-            font=("Arial", 16, "bold"),
-            text_color=config.COLORS["text_primary"]
-        ).pack(anchor="w")
-        
-        # Phone
-        ctk.CTkLabel(
-            left,
-            text=f"📞 {driver.get('phone', 'N/A')}",
-            font=("Arial", 12),
-            text_color=config.COLORS["text_secondary"]
-        ).pack(anchor="w", pady=(5, 0))
-        
-        # Vehicle info
-        if driver.get('car_brand') or driver.get('registration_number'):
-            car_info = ""
-            if driver.get('car_brand'):
-                car_info += f"🚗 {driver.get('car_brand', '')}"
-            if driver.get('registration_number'):
-                car_info += f" • 🔖 {driver.get('registration_number', '')}"
-            
-            ctk.CTkLabel(
-                left,
-                text=car_info,
-                font=("Arial", 11),
-                text_color=config.COLORS["text_subtle"]
-            ).pack(anchor="w", pady=(5, 0))
-        
-        # Daily cost
-        if driver.get('daily_cost'):
-            ctk.CTkLabel(
-                left,
-                text=f"💰 {driver.get('daily_cost', 0):.2f} PLN/dzień",
-                font=("Arial", 11, "bold"),
-                text_color=config.COLORS["info"]
-            ).pack(anchor="w", pady=(5, 0))
-        
-        # Right: Actions
-        actions = ctk.CTkFrame(content, fg_color="transparent")
-        actions.pack(side="right")
-        
-        ctk.CTkButton(
-            actions,
-            text="Usuń",
-            command=lambda d=driver: self.delete_driver(d),
-            fg_color=config.COLORS["error"],
-            hover_color=config.COLORS["error"] + "CC",
-            width=100,
-            height=32
-        ).pack()
+    def create_driver_card(self, parent):
+        """Create a recyclable driver card"""
+        return DriverCard(parent, on_delete=self.delete_driver)
     
     def add_driver_clicked(self):
         """Handle add driver button click"""
@@ -691,70 +497,140 @@ class MainWindow(ctk.CTk):
     def on_driver_added(self, driver: Driver):
         """Callback when driver is added"""
         self.db.add_driver(driver)
-        self.load_data()
-        self.show_tab(self.current_tab)
         messagebox.showinfo("Sukces", "Kierowca dodany!")
     
     def delete_driver(self, driver: dict):
         """Delete driver"""
         if messagebox.askyesno("Potwierdź", f"Czy na pewno usunąć kierowcę {driver.get('name', 'N/A')}?"):
             self.db.delete_driver(driver['id'])
-            self.load_data()
-            self.show_tab(self.current_tab)
             messagebox.showinfo("Sukces", "Kierowca usunięty!")
         
     def show_balance(self):
         """Show balance/statistics tab"""
-        scroll_frame = ctk.CTkScrollableFrame(
-            self.content_frame,
-            fg_color=config.COLORS["bg_primary"]
-        )
-        scroll_frame.pack(fill="both", expand=True)
-        
-        ctk.CTkLabel(
-            scroll_frame,
-            text="Tab Bilans - W trakcie implementacji",
-            font=("Arial", 18),
-            text_color=config.COLORS["text_secondary"]
-        ).pack(pady=50)
-        
+        if self.balance_view is None:
+            self.balance_view = BalanceView(self.content_frame, self.rollups)
+        self.balance_view.pack(fill="both", expand=True)
+        self.update_balance()
+    
+    def update_balance(self):
+        """Redraw the balance view from the rollups (no-op if unchanged)"""
+        names = {driver_id: driver.get('name', driver_id) for driver_id, driver in self.records["drivers"].items()}
+        self.balance_view.update(names, self.records["invoices"].values())
+        
+    @property
+    def invoices(self):
+        return list(self.records["invoices"].values())
+    
+    @property
+    def drivers(self):
+        return list(self.records["drivers"].values())
+    
+    @property
+    def fuel_entries(self):
+        return list(self.records["fuel_entries"].values())
+    
+    @property
+    def vehicles(self):
+        return list(self.records["vehicles"].values())
+    
     def load_data(self):
-        """Load all data from database"""
-        self.invoices = self.db.get_invoices()
-        self.drivers = self.db.get_drivers()
-        self.fuel_entries = self.db.get_fuel_entries()
-        self.vehicles = self.db.get_vehicles()
+        """Load all data from database as compact records"""
+        self.records = {
+            table: compact_by_id(table, getattr(self.db, f"get_{table}")())
+            for table in self.records
+        }
         self.update_stats()
         self.update_components()
     
+    def on_db_change(self, event: ChangeEvent):
+        """Apply a single database change instead of reloading everything"""
+        if event.kind == RELOADED:
+            self.schedule_reload()
+            return
+        if self.reload_pending:
+            # The pending reload reads this change along with the rest
+            return
+        
+        records = self.records.get(event.table)
+        if records is None:
+            return
+        if event.kind == REMOVED:
+            records.pop(event.id, None)
+        else:
+            records[event.id] = compact(event.table, event.new)
+        
+        view = self.tab_view(self.current_tab)
+        if view is not None and view[0] == event.table:
+            self.list_dirty = True
+        self.schedule_summary_refresh()
+    
+    def schedule_reload(self):
+        """Reload everything once after a burst of RELOADED events"""
+        if not self.reload_pending:
+            self.reload_pending = True
+            self.after_idle(self.reload)
+    
+    def reload(self):
+        """Re-read all tables and redraw the current tab"""
+        self.reload_pending = False
+        self.load_data()
+        self.show_tab(self.current_tab)
+    
+    def schedule_summary_refresh(self):
+        """Refresh list, stats and summary once after a burst of changes"""
+        if not self.summary_refresh_pending:
+            self.summary_refresh_pending = True
+            self.after_idle(self.refresh_summary)
+    
+    def refresh_summary(self):
+        """Update the current list, stats cards, banner and financial summary"""
+        self.summary_refresh_pending = False
+        if self.list_dirty and self.list_view is not None:
+            self.list_dirty = False
+            self.list_view.set_items(self.tab_items(self.current_tab))
+        self.update_stats()
+        self.update_components()
+        if self.current_tab == "balance" and self.balance_view is not None:
+            self.update_balance()
+    
+    def tab_view(self, tab_id):
+        """(table, filters, sort) of a list tab"""
+        return {
+            "outstanding": ("invoices", {"is_paid": False}, None),
+            "paid": ("invoices", {"is_paid": True}, None),
+            "fuel": ("fuel_entries", {}, "-date"),
+            "drivers": ("drivers", {}, "name"),
+        }.get(tab_id)
+    
+    def tab_items(self, tab_id):
+        """Records of a list tab, fetched from the database page by page"""
+        table, filters, sort = self.tab_view(tab_id)
+        query = getattr(self.db, f"query_{table}")
+        count = getattr(self.db, f"count_{table}")
+        return PagedItems(
+            lambda offset, limit: query(**filters, sort=sort, limit=limit, offset=offset),
+            count(**filters)
+        )
+    
     def update_components(self):
         """Update notification banner and financial summary"""
-        self.notification_banner.update(self.invoices)
-        self.financial_summary.update(self.invoices, self.fuel_entries)
+        self.notification_banner.update()
+        self.financial_summary.update(self.aggregates)
         
     def update_stats(self):
         """Update statistics cards"""
-        unpaid = [inv for inv in self.invoices if not inv.get('is_paid', False)]
-        paid = [inv for inv in self.invoices if inv.get('is_paid', False)]
-        
-        unpaid_total = sum(inv.get('amount', 0) for inv in unpaid)
-        paid_total = sum(inv.get('amount', 0) for inv in paid)
-        
-        fuel_this_month = sum(
-            entry.get('amount', 0) for entry in self.fuel_entries
-            if datetime.fromisoformat(entry.get('date', datetime.now().isoformat())).month == datetime.now().month
-        )
-        
-        self.unpaid_card["value"].configure(text=f"{len(unpaid)}")
-        self.paid_card["value"].configure(text=f"{len(paid)}")
-        self.drivers_card["value"].configure(text=f"{len(self.drivers)}")
-        self.fuel_card["value"].configure(text=f"{fuel_this_month:.2f} PLN")
+        self.unpaid_card["value"].configure(text=f"{self.aggregates.unpaid_count}")
+        self.paid_card["value"].configure(text=f"{self.aggregates.paid_count}")
+        self.drivers_card["value"].configure(text=f"{self.aggregates.driver_count}")
+        self.fuel_card["value"].configure(text=f"{self.aggregates.fuel_this_month():.2f} PLN")
         
     def update_clock(self):
         """Update clock display"""
         now = datetime.now()
         self.clock_label.configure(text=now.strftime("%H:%M:%S"))
         self.date_label.configure(text=now.strftime("%A, %d %B %Y"))
+        # Changes made by another process (another window, migrate.py) arrive as RELOADED
+        self.db.refresh()
         self.after(1000, self.update_clock)
         
     def add_invoice_clicked(self):
@@ -764,19 +640,15 @@ class MainWindow(ctk.CTk):
     def on_invoice_added(self, invoice: Invoice):
         """Callback when invoice is added"""
         self.db.add_invoice(invoice)
-        self.load_data()
-        self.show_tab(self.current_tab)
         messagebox.showinfo("Sukces", "Faktura dodana pomyślnie!")
         
     def mark_as_paid(self, invoice):
         """Mark invoice as paid"""
-        paid_at = datetime.now().isoformat()
-        deadline = datetime.fromisoformat(invoice.get('deadline', datetime.now().isoformat()))
-        paid_on_time = datetime.now() <= deadline
+        now = datetime.now()
+        paid_at = now.isoformat()
+        paid_on_time = is_paid_on_time(invoice, now)
         
         self.db.mark_as_paid(invoice['id'], paid_at, paid_on_time)
-        self.load_data()
-        self.show_tab(self.current_tab)
         
         messagebox.showinfo("Sukces", "Faktura oznaczona jako opłacona!")
         
@@ -788,52 +660,64 @@ class MainWindow(ctk.CTk):
     
     def on_invoice_edited(self, invoice: Invoice):
         """Callback when invoice is edited"""
-        self.db.update_invoice(invoice.id, invoice)
-        self.load_data()
-        self.show_tab(self.current_tab)
+        self.db.update_invoice(invoice.id, invoice.to_dict())
         messagebox.showinfo("Sukces", "Faktura zaktualizowana!")
         
     def delete_invoice(self, invoice):
         """Delete invoice"""
         if messagebox.askyesno("Potwierdź", f"Czy na pewno usunąć fakturę {invoice.get('company_name')}?"):
             self.db.delete_invoice(invoice['id'])
-            self.load_data()
-            self.show_tab(self.current_tab)
             messagebox.showinfo("Sukces", "Faktura usunięta!")
     
     def export_pdf(self):
-        """Export invoices to PDF"""
-        try:
-            filepath = self.export_service.export_invoices_pdf(self.invoices)
-            messagebox.showinfo("Sukces", f"Eksport PDF zapisany:\n{filepath}")
-        except Exception as e:
-            messagebox.showerror("Błąd", f"Nie udało się wyeksportować PDF:\n{str(e)}")
+        """Export invoices to PDF in the background"""
+        snapshot = freeze("invoices", self.records["invoices"].values())
+        if len(snapshot) <= STREAMING_PDF_ROWS:
+            self.start_export("Eksport PDF", self.export_service.export_invoices_pdf, snapshot)
+        else:
+            # Large reports are laid out in chunks, newest first like the single table
+            self.start_export(
+                "Eksport PDF",
+                self.export_service.export_invoices_pdf_streaming,
+                ordered(snapshot, "created_at", descending=True),
+                total=len(snapshot)
+            )
     
     def export_csv(self):
-        """Export current tab data to CSV"""
-        try:
-            if self.current_tab in ["outstanding", "paid"]:
-                # Export invoices
-                invoices_to_export = self.invoices
-                if self.current_tab == "outstanding":
-                    invoices_to_export = [inv for inv in self.invoices if not inv.get('is_paid', False)]
-                elif self.current_tab == "paid":
-                    invoices_to_export = [inv for inv in self.invoices if inv.get('is_paid', False)]
-                
-                filepath = self.export_service.export_invoices_csv(invoices_to_export)
-            elif self.current_tab == "fuel":
-                filepath = self.export_service.export_fuel_entries_csv(self.fuel_entries)
-            elif self.current_tab == "drivers":
-                filepath = self.export_service.export_drivers_csv(self.drivers)
-            else:
-                # Default to all invoices
-                filepath = self.export_service.export_invoices_csv(self.invoices)
+        """Export current tab data to CSV in the background"""
+        if self.current_tab in ["outstanding", "paid"]:
+            # Export invoices
+            invoices_to_export = self.records["invoices"].values()
+            if self.current_tab == "outstanding":
+                invoices_to_export = [inv for inv in invoices_to_export if not inv.get('is_paid', False)]
+            elif self.current_tab == "paid":
+                invoices_to_export = [inv for inv in invoices_to_export if inv.get('is_paid', False)]
             
-            messagebox.showinfo("Sukces", f"Eksport CSV zapisany:\n{filepath}")
-        except Exception as e:
-            messagebox.showerror("Błąd", f"Nie udało się wyeksportować CSV:\n{str(e)}")
+            export, table, records = self.export_service.export_invoices_csv, "invoices", invoices_to_export
+        elif self.current_tab == "fuel":
+            export, table, records = self.export_service.export_fuel_entries_csv, "fuel_entries", self.records["fuel_entries"].values()
+        elif self.current_tab == "drivers":
+            export, table, records = self.export_service.export_drivers_csv, "drivers", self.records["drivers"].values()
+        else:
+            # Default to all invoices
+            export, table, records = self.export_service.export_invoices_csv, "invoices", self.records["invoices"].values()
+        
+        self.start_export("Eksport CSV", export, freeze(table, records))
+    
+    def start_export(self, title, export, snapshot, **kwargs):
+        """Run an export on an immutable snapshot in a worker thread"""
+        if self.export_job is not None and self.export_job.running:
+            messagebox.showinfo("Eksport", "Poprzedni eksport jeszcze trwa")
+            return
+        self.export_job = ExportJob(export, snapshot, **kwargs).start()
+        ExportProgressDialog(self, self.export_job, title, on_finish=self.on_export_finished)
+    
+    def on_export_finished(self):
+        self.export_job = None
             
     def on_closing(self):
         """Handle window close"""
+        if self.export_job is not None:
+            self.export_job.cancel()
         self.db.close()
         self.destroy()
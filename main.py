@@ -3,12 +3,15 @@ Faktury 2.0 - System Zarządzania Fakturami
 Main application entry point
 """
 
+from utils import timing
 import customtkinter as ctk
 from gui.main_window import MainWindow
 import config
 
 def main():
     """Main application entry"""
+    timing.phase("importy")
+    
     # Set appearance mode and color theme
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
@@ -0,0 +1,89 @@
+"""
+Faktury 2.0 - Database migration tool
+Moves data/faktury.json into the SQLite backend and inline images
+into the blob store
+
+Usage:
+    python migrate.py migrate [--source PATH] [--target PATH] [--batch-size N] [--force]
+    python migrate.py verify [--source PATH] [--target PATH]
+    python migrate.py images [--gc]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import config
+from database.blob_store import BlobStore, migrate_inline_images, referenced_images
+from database.db import create_database
+from database.migration import migrate, verify
+from database.storage import JournalBusy, compact_journal
+
+
+def main(argv=None) -> int:
+    """Migration command line entry"""
+    parser = argparse.ArgumentParser(description="Migracja bazy faktury.json do SQLite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_cmd = commands.add_parser("migrate", help="Przenieś dane z JSON do SQLite")
+    migrate_cmd.add_argument("--batch-size", type=int, default=500,
+                             help="Liczba rekordów w jednej transakcji")
+    migrate_cmd.add_argument("--force", action="store_true",
+                             help="Nadpisz istniejącą bazę SQLite")
+    migrate_cmd.add_argument("--verify", action="store_true",
+                             help="Po migracji porównaj obie bazy")
+
+    verify_cmd = commands.add_parser("verify", help="Porównaj liczby rekordów i sumy kontrolne")
+
+    for cmd in (migrate_cmd, verify_cmd):
+        cmd.add_argument("--source", type=Path, default=config.DB_PATH,
+                         help="Plik bazy TinyDB (JSON)")
+        cmd.add_argument("--target", type=Path, default=config.SQLITE_DB_PATH,
+                         help="Plik bazy SQLite")
+
+    images_cmd = commands.add_parser("images", help="Przenieś zdjęcia base64 z faktur do magazynu plików")
+    images_cmd.add_argument("--gc", action="store_true",
+                            help="Usuń pliki zdjęć, do których nie odwołuje się żadna faktura")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "images":
+        store = BlobStore()
+        db = create_database()
+        try:
+            migrated = migrate_inline_images(db, store)
+            removed = store.remove_unreferenced(referenced_images(db)) if args.gc else None
+        finally:
+            db.close()
+        print(f"Przeniesiono zdjęcia z {migrated} faktur do {config.BLOBS_DIR}")
+        if removed is not None:
+            print(f"Usunięto {removed} nieużywanych plików zdjęć")
+        return 0
+
+    if not args.source.exists():
+        print(f"Brak pliku źródłowego: {args.source}", file=sys.stderr)
+        return 1
+
+    # Changes still in faktury.json.log are not part of the JSON file yet
+    try:
+        compact_journal(args.source)
+    except JournalBusy as e:
+        print(f"{e}; zamknij aplikację i spróbuj ponownie", file=sys.stderr)
+        return 1
+
+    if args.command == "migrate":
+        if args.target.exists():
+            if not args.force:
+                print(f"Baza docelowa już istnieje: {args.target} (użyj --force)", file=sys.stderr)
+                return 1
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{args.target}{suffix}").unlink(missing_ok=True)
+        migrate(args.source, args.target, batch_size=args.batch_size)
+        if not args.verify:
+            return 0
+
+    return 0 if verify(args.source, args.target) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
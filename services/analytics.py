@@ -0,0 +1,183 @@
+"""
+Columnar invoice analytics
+Invoices held as parallel NumPy arrays so per-customer group-bys and
+percentiles run vectorised instead of as Python loops over records
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+import numpy as np
+
+from database.records import parse_datetime
+
+
+# Epoch-day value of a missing or invalid date
+NO_DATE = np.iinfo(np.int32).min
+
+DATE_FIELDS = ('issue_date', 'deadline', 'paid_at')
+
+
+def _amounts(values: List) -> np.ndarray:
+    """float64 amounts; None and invalid values count as 0"""
+    try:
+        amounts = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        amounts = np.array([_amount(value) for value in values], dtype=np.float64)
+    return np.nan_to_num(amounts, copy=False, nan=0.0)
+
+
+def _amount(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _epoch_days(values: List) -> np.ndarray:
+    """int32 days since 1970-01-01 of ISO date strings (NO_DATE if missing)
+
+    The date part is taken as written, like the exports print it; the
+    whole column is parsed by NumPy in one call unless some value is not
+    ISO, in which case it falls back to parsing value by value.
+    """
+    texts = [value[:10] if isinstance(value, str) else '' for value in values]
+    try:
+        dates = np.array(texts, dtype='datetime64[D]')
+    except ValueError:
+        dates = np.array([_iso_date(value) for value in values], dtype='datetime64[D]')
+    days = dates.astype(np.int64)
+    days[np.isnat(dates)] = NO_DATE
+    return days.astype(np.int32)
+
+
+def _iso_date(value) -> str:
+    parsed = parse_datetime(value)
+    return parsed.date().isoformat() if parsed is not None else ''
+
+
+def epoch_day(value: date) -> int:
+    """Epoch-day number of a date or datetime (for comparing with columns)"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - date(1970, 1, 1)).days
+
+
+def _group_percentile(groups: np.ndarray, values: np.ndarray, q: float, group_count: int) -> np.ndarray:
+    """Linearly interpolated q-th percentile (0..100) of values per group
+
+    One lexsort for all groups instead of a sort per group; groups without
+    values get NaN.
+    """
+    result = np.full(group_count, np.nan)
+    if not len(values):
+        return result
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order].astype(np.float64)
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = np.flatnonzero(counts)
+    position = starts[present] + (counts[present] - 1) * (q / 100)
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    result[present] = values[low] + (values[high] - values[low]) * (position - low)
+    return result
+
+
+@dataclass
+class CustomerStats:
+    """Totals of one customer (NIP); payment days are NaN without paid invoices"""
+    nip: str
+    company_name: str
+    invoice_count: int
+    revenue: float
+    unpaid: float
+    overdue: float
+    median_payment_days: float
+    p90_payment_days: float
+
+
+class InvoiceFrame:
+    """Invoices as parallel arrays, one element per invoice
+
+    amount (float64), is_paid (bool), days[field] (int32 epoch days for
+    issue_date, deadline and paid_at, NO_DATE if missing) and nip (int32
+    codes into nips, with the first company name seen in names).
+    """
+
+    def __init__(self, amount: np.ndarray, is_paid: np.ndarray, days: Dict[str, np.ndarray],
+                 nip: np.ndarray, nips: List[str], names: List[str]):
+        self.amount = amount
+        self.is_paid = is_paid
+        self.days = days
+        self.nip = nip
+        self.nips = nips
+        self.names = names
+
+    @classmethod
+    def from_records(cls, invoices: Iterable[Mapping]) -> 'InvoiceFrame':
+        """Build from invoice records (dicts or compact records)"""
+        invoices = list(invoices)
+        codes: Dict[str, int] = {}
+        names: List[str] = []
+        nip = np.empty(len(invoices), dtype=np.int32)
+        for i, inv in enumerate(invoices):
+            key = inv.get('nip') or ''
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(names)
+                names.append(inv.get('company_name') or '')
+            nip[i] = code
+        return cls(
+            amount=_amounts([inv.get('amount') for inv in invoices]),
+            is_paid=np.fromiter((bool(inv.get('is_paid', False)) for inv in invoices),
+                                dtype=bool, count=len(invoices)),
+            days={field: _epoch_days([inv.get(field) for inv in invoices]) for field in DATE_FIELDS},
+            nip=nip,
+            nips=list(codes),
+            names=names,
+        )
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    # Masks
+    @property
+    def unpaid(self) -> np.ndarray:
+        return ~self.is_paid
+
+    def overdue(self, today: Optional[date] = None) -> np.ndarray:
+        """Unpaid invoices whose deadline has passed"""
+        today = today or date.today()
+        deadline = self.days['deadline']
+        return self.unpaid & (deadline != NO_DATE) & (deadline < epoch_day(today))
+
+    # Aggregates
+    def total(self, mask: Optional[np.ndarray] = None) -> float:
+        amount = self.amount if mask is None else self.amount[mask]
+        return float(amount.sum())
+
+    def payment_days(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Mask of paid invoices with both dates and their issue-to-payment days"""
+        issued, paid = self.days['issue_date'], self.days['paid_at']
+        selected = self.is_paid & (issued != NO_DATE) & (paid != NO_DATE)
+        return selected, paid[selected].astype(np.int64) - issued[selected]
+
+    def by_customer(self, today: Optional[date] = None, limit: Optional[int] = None) -> List[CustomerStats]:
+        """Per-NIP totals and payment-day percentiles, most revenue first"""
+        groups = len(self.nips)
+        revenue = np.bincount(self.nip, weights=self.amount, minlength=groups)
+        unpaid = np.bincount(self.nip, weights=np.where(self.is_paid, 0.0, self.amount), minlength=groups)
+        overdue = np.bincount(self.nip, weights=np.where(self.overdue(today), self.amount, 0.0),
+                              minlength=groups)
+        counts = np.bincount(self.nip, minlength=groups)
+        paid, days = self.payment_days()
+        median = _group_percentile(self.nip[paid], days, 50, groups)
+        p90 = _group_percentile(self.nip[paid], days, 90, groups)
+
+        order = np.argsort(-revenue, kind='stable')[:limit]
+        return [
+            CustomerStats(self.nips[code], self.names[code], int(counts[code]), float(revenue[code]),
+                          float(unpaid[code]), float(overdue[code]), float(median[code]), float(p90[code]))
+            for code in order
+        ]
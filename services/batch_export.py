@@ -0,0 +1,163 @@
+"""
+Batch PDF export
+One report per customer (NIP) and/or month, rendered in parallel by a
+process pool; a manifest lists every file with its size and timing
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from database.records import Record, parse_datetime
+from services.export_service import ExportService, Progress, STREAMING_PDF_ROWS, ordered
+
+PARTITIONS = ('nip', 'month', 'nip_month')
+
+MANIFEST_NAME = "manifest.json"
+
+# ExportService of this worker process, created once by _init_worker
+_service: Optional[ExportService] = None
+
+
+def _safe(text: str) -> str:
+    """Text usable in a file name"""
+    return re.sub(r'[^0-9A-Za-z_-]+', '_', text).strip('_') or 'brak'
+
+
+def partition_key(invoice: Mapping, by: str) -> Tuple[str, str]:
+    """(file name stem, report title) of the partition an invoice falls into"""
+    nip = invoice.get('nip') or ''
+    issued = parse_datetime(invoice.get('issue_date'))
+    month = issued.strftime('%Y-%m') if issued is not None else ''
+    parts, titles = [], []
+    if by in ('nip', 'nip_month'):
+        parts.append(_safe(nip) if nip else 'bez_nip')
+        titles.append(f"NIP {nip}" if nip else "Bez NIP")
+    if by in ('month', 'nip_month'):
+        parts.append(month or 'bez_daty')
+        titles.append(issued.strftime('%m.%Y') if issued is not None else "Bez daty")
+    return 'faktury_' + '_'.join(parts), ' - '.join(titles)
+
+
+def partition(invoices: Iterable[Mapping], by: str) -> Dict[Tuple[str, str], List[dict]]:
+    """Invoices grouped by partition_key, as plain dicts ready to pickle"""
+    if by not in PARTITIONS:
+        raise ValueError(f"Unknown partitioning: {by}")
+    groups: Dict[Tuple[str, str], List[dict]] = defaultdict(list)
+    for invoice in invoices:
+        groups[partition_key(invoice, by)].append(dict(invoice))
+    return _unique_stems(groups)
+
+
+def _unique_stems(groups: Dict[Tuple[str, str], List[dict]]) -> Dict[Tuple[str, str], List[dict]]:
+    """groups with a short hash of the title added to stems shared by several titles
+
+    Different NIPs (e.g. '123-456' and '123 456') can sanitize to the same
+    file name; without this the later report would overwrite the earlier.
+    """
+    titles = defaultdict(list)
+    for stem, title in groups:
+        titles[stem].append(title)
+    unique = {}
+    taken = set(titles)
+    for (stem, title), rows in groups.items():
+        if len(titles[stem]) > 1:
+            base = f"{stem}_{hashlib.sha1(title.encode('utf-8')).hexdigest()[:8]}"
+            stem, n = base, 1
+            while stem in taken:
+                n += 1
+                stem = f"{base}_{n}"
+            taken.add(stem)
+        unique[stem, title] = rows
+    return unique
+
+
+def _init_worker():
+    """Process pool initializer: build the ReportLab stylesheet once per worker"""
+    global _service
+    _service = ExportService()
+
+
+def _render(stem: str, title: str, rows: List[dict], directory: str) -> Dict:
+    """Write one partition's report (runs in a worker process)"""
+    start = time.perf_counter()
+    invoices = [Record(row) for row in rows]
+    filename = f"{stem}.pdf"
+    report_title = f"Raport Faktur - {title}"
+    if len(invoices) > STREAMING_PDF_ROWS:
+        path = _service.export_invoices_pdf_streaming(
+            ordered(invoices, 'created_at', descending=True), filename,
+            total=len(invoices), title=report_title, directory=directory
+        )
+    else:
+        path = _service.export_invoices_pdf(invoices, filename, title=report_title, directory=directory)
+    return {
+        'file': os.path.basename(path),
+        'title': title,
+        'invoices': len(invoices),
+        'amount': round(sum(row.get('amount') or 0 for row in rows), 2),
+        'bytes': os.path.getsize(path),
+        'seconds': round(time.perf_counter() - start, 3),
+        'pid': os.getpid(),
+    }
+
+
+def export_batch(invoices: Iterable[Mapping], by: str = 'nip_month', directory: Optional[str] = None,
+                 max_workers: Optional[int] = None, progress: Progress = None) -> Path:
+    """Render one PDF per partition across a process pool; returns the manifest path
+
+    Partitions are submitted largest first so that long reports do not
+    end up last on a single core. A failed partition is recorded in the
+    manifest with its error instead of stopping the batch. progress(done,
+    total) is called per finished report; if it raises (e.g.
+    ExportCancelled), reports not yet started are cancelled.
+    """
+    started = time.perf_counter()
+    if directory is None:
+        directory = os.path.join("exports", f"raporty_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(directory, exist_ok=True)
+
+    groups = partition(invoices, by)
+    # No more processes than reports; each one pays for its own startup
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(groups)))
+    files = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(_render, stem, title, rows, directory): (stem, title, len(rows))
+            for (stem, title), rows in sorted(groups.items(), key=lambda item: -len(item[1]))
+        }
+        try:
+            for future in as_completed(futures):
+                stem, title, count = futures[future]
+                try:
+                    files.append(future.result())
+                except Exception as e:
+                    files.append({'file': f"{stem}.pdf", 'title': title, 'invoices': count, 'error': str(e)})
+                if progress is not None:
+                    progress(len(files), len(futures))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    manifest = {
+        'created_at': datetime.now().isoformat(),
+        'partition_by': by,
+        'workers': workers,
+        'reports': len(files),
+        'invoices': sum(entry['invoices'] for entry in files),
+        'bytes': sum(entry.get('bytes', 0) for entry in files),
+        'seconds': round(time.perf_counter() - started, 3),
+        'files': sorted(files, key=lambda entry: entry['file']),
+    }
+    manifest_path = Path(directory) / MANIFEST_NAME
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest_path
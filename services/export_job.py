@@ -0,0 +1,80 @@
+"""
+Background export jobs
+Runs an ExportService method in a worker thread; the GUI polls progress
+from a thread-safe queue and can cancel the job
+"""
+
+import queue
+import threading
+from typing import Callable, List, Tuple
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its job was cancelled"""
+
+
+# Messages put on ExportJob.messages
+PROGRESS = 'progress'    # (PROGRESS, done, total)
+DONE = 'done'            # (DONE, filepath)
+FAILED = 'failed'        # (FAILED, exception)
+CANCELLED = 'cancelled'  # (CANCELLED, None)
+
+
+class ExportJob:
+    """One export running in a daemon thread
+
+    export is called as export(*args, progress=callback, **kwargs). The
+    callback reports (done, total) and raises ExportCancelled once cancel()
+    was called, so the export stops at its next progress report. Arguments
+    must be immutable snapshots; the worker never touches Tk widgets.
+    """
+
+    def __init__(self, export: Callable, *args, **kwargs):
+        self.export = export
+        self.args = args
+        self.kwargs = kwargs
+        self.messages: "queue.Queue[Tuple]" = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="export", daemon=True)
+        self.last_progress = None
+
+    def start(self) -> 'ExportJob':
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the export to stop at its next progress report"""
+        self.cancelled.set()
+
+    def progress(self, done: int, total: int):
+        """Progress callback passed to the export (runs in the worker)"""
+        if self.cancelled.is_set():
+            raise ExportCancelled()
+        # Only whole-percent changes are queued, so the GUI is not flooded
+        percent = done * 100 // total if total else 100
+        if percent != self.last_progress:
+            self.last_progress = percent
+            self.messages.put((PROGRESS, done, total))
+
+    def run(self):
+        try:
+            result = self.export(*self.args, progress=self.progress, **self.kwargs)
+        except ExportCancelled:
+            self.messages.put((CANCELLED, None))
+        except Exception as e:
+            self.messages.put((FAILED, e))
+        else:
+            self.messages.put((DONE, result))
+
+    def poll(self) -> List[Tuple]:
+        """Messages queued since the last poll (call from the GUI thread)"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    @property
+    def running(self) -> bool:
+        return self.thread.is_alive()
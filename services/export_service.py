@@ -3,8 +3,12 @@ Export Service - PDF and CSV generation
 Matches React's export.ts functionality
 """
 
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Sequence, Sized
+from database.records import formatted_date
+from services.analytics import InvoiceFrame
+from services.sinks import Sink, open_sink
 import os
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
@@ -18,6 +22,114 @@ import csv
 
 from config import COMPANY_NAME, APP_NAME
 
+# Rows between progress reports; each report is also a cancellation point
+PROGRESS_EVERY = 200
+
+# Invoice rows per table in streamed PDF reports (about four pages)
+CHUNK_ROWS = 200
+
+# Reports with more invoices than this should use export_invoices_pdf_streaming
+STREAMING_PDF_ROWS = 2000
+
+Progress = Optional[Callable[[int, int], None]]
+
+INVOICE_PDF_HEADER = ['Data', 'Firma', 'NIP', 'Kwota', 'Termin', 'Status']
+
+# Customers listed in the summary of a report covering several NIPs
+TOP_CUSTOMERS = 10
+
+CUSTOMER_PDF_HEADER = ['Firma', 'NIP', 'Faktury', 'Razem', 'Nieopłacone', 'Po terminie', 'Dni do zapł.']
+
+INVOICE_CSV_HEADER = [
+    'ID', 'Data wystawienia', 'Firma', 'NIP', 'Kwota',
+    'Termin płatności', 'Termin (dni)', 'Opis', 'Status',
+    'Data opłacenia', 'Terminowa', 'Telefon', 'Dystans'
+]
+
+FUEL_CSV_HEADER = [
+    'ID', 'Data', 'Kwota', 'Litry', 'Stacja',
+    'Kierowca ID', 'Pojazd ID', 'Notatki'
+]
+
+DRIVER_CSV_HEADER = [
+    'ID', 'Imię i nazwisko', 'Telefon', 'Email',
+    'Nr rejestracyjny', 'Marka pojazdu', 'Kolor', 'Koszt dzienny'
+]
+
+INVOICE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E40AF')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9FAFB')])
+])
+
+
+def _rows(records: Iterable, progress: Progress, total: Optional[int] = None):
+    """Iterate records, reporting (done, total) every PROGRESS_EVERY rows"""
+    if total is None:
+        total = len(records)
+    for i, record in enumerate(records):
+        if progress is not None and i % PROGRESS_EVERY == 0:
+            progress(i, total)
+        yield record
+    if progress is not None:
+        progress(total, total)
+
+
+def ordered(records: Sequence, field: str, descending: bool = False) -> Iterator:
+    """records in field order, sorting positions by a precomputed key list
+
+    Each key is read once and the records themselves are never moved or
+    compared; missing values sort as ''.
+    """
+    keys = [record.get(field) or '' for record in records]
+    positions = sorted(range(len(keys)), key=keys.__getitem__, reverse=descending)
+    return (records[i] for i in positions)
+
+
+class _StreamingDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate pulling further flowables from an iterator as it goes"""
+    
+    # Flowables kept queued; ReportLab looks one ahead for keepWithNext
+    LOOKAHEAD = 2
+    
+    def __init__(self, filename, flowables: Iterator, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.pending = flowables
+        self.story = None
+    
+    def build(self, flowables, **kwargs):
+        self.story = flowables
+        super().build(flowables, **kwargs)
+    
+    def filterFlowables(self, flowables):
+        # Called by handle_flowable before each flowable is laid out; it is
+        # also called on ReportLab's internal page-start list, left alone
+        if flowables is not self.story:
+            return
+        while len(flowables) < self.LOOKAHEAD:
+            flowable = next(self.pending, None)
+            if flowable is None:
+                break
+            flowables.append(flowable)
+
+
+@contextmanager
+def _output(filepath: str):
+    """Remove the partially written file if the export fails or is cancelled"""
+    try:
+        yield filepath
+    except BaseException:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+
 
 class ExportService:
     """Service for exporting data to PDF and CSV"""
@@ -57,43 +169,117 @@ class ExportService:
             spaceAfter=12
         ))
     
-    def export_invoices_pdf(self, invoices: List[dict], filename: str = None) -> str:
+    def export_invoices_pdf(self, invoices: Sequence[Mapping], filename: str = None,
+                            progress: Progress = None, title: str = "Raport Faktur",
+                            directory: str = "exports") -> str:
         """Export invoices to PDF file"""
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"faktury_{timestamp}.pdf"
-        
-        # Ensure exports directory exists
-        os.makedirs("exports", exist_ok=True)
-        filepath = os.path.join("exports", filename)
+        filepath = self._pdf_path(filename, directory)
         
         # Create PDF
         doc = SimpleDocTemplate(filepath, pagesize=A4)
-        story = []
+        story = self._pdf_title(title)
+        
+        # Summary, and the largest customers if the report covers several
+        frame = InvoiceFrame.from_records(invoices)
+        story.append(Paragraph("Podsumowanie", self.styles['CustomHeader']))
+        story.append(self._summary_table(len(frame), frame.total(frame.is_paid), frame.total(frame.unpaid),
+                                         frame.total()))
+        story.append(Spacer(1, 1*cm))
+        if len(frame.nips) > 1:
+            story.append(Paragraph("Najwięksi klienci", self.styles['CustomHeader']))
+            story.append(self._customer_table(frame.by_customer(limit=TOP_CUSTOMERS)))
+            story.append(Spacer(1, 1*cm))
+        
+        # Invoice list
+        list_header = Paragraph("Lista Faktur", self.styles['CustomHeader'])
+        story.append(list_header)
+        
+        # Table data
+        table_data = [INVOICE_PDF_HEADER]
+        for inv in _rows(ordered(invoices, 'created_at', descending=True), progress, len(invoices)):
+            table_data.append(self._invoice_pdf_row(inv))
+        
+        story.append(self._invoice_table(table_data))
         
-        # Title
-        title = Paragraph(f"{APP_NAME} - Raport Faktur", self.styles['CustomTitle'])
-        story.append(title)
+        # Build PDF; the page callback keeps the export cancellable while ReportLab lays out pages
+        def on_page(canvas, doc):
+            if progress is not None:
+                progress(len(invoices), len(invoices))
         
-        # Subtitle
+        with _output(filepath):
+            doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+        
+        return filepath
+    
+    def export_invoices_pdf_streaming(self, invoices: Iterable[Mapping], filename: str = None,
+                                      progress: Progress = None, total: Optional[int] = None,
+                                      title: str = "Raport Faktur", directory: str = "exports") -> str:
+        """Export invoices to PDF, laying them out CHUNK_ROWS at a time
+        
+        invoices is consumed once, in the order given (e.g. a sorted
+        database query or ordered()); table chunks are created only when
+        ReportLab reaches them, so memory stays flat for very large reports.
+        The summary is computed on the way and placed after the list.
+        """
+        filepath = self._pdf_path(filename, directory)
+        if total is None:
+            total = len(invoices) if isinstance(invoices, Sized) else 0
+        
+        doc = _StreamingDocTemplate(filepath, self._invoice_chunks(invoices, progress, total),
+                                    pagesize=A4, pageCompression=1)
+        story = self._pdf_title(title)
+        story.append(Paragraph("Lista Faktur", self.styles['CustomHeader']))
+        
+        # Chunks are pulled during layout, so their progress reports keep the build cancellable
+        with _output(filepath):
+            doc.build(story)
+        
+        return filepath
+    
+    def _invoice_chunks(self, invoices: Iterable[Mapping], progress: Progress, total: int) -> Iterator:
+        """Flowables of the streamed report: table chunks, then the summary"""
+        count = 0
+        paid_amount = unpaid_amount = 0.0
+        table_data = [INVOICE_PDF_HEADER]
+        for inv in _rows(invoices, progress, total):
+            count += 1
+            if inv.get('is_paid', False):
+                paid_amount += inv.get('amount', 0)
+            else:
+                unpaid_amount += inv.get('amount', 0)
+            table_data.append(self._invoice_pdf_row(inv))
+            if len(table_data) > CHUNK_ROWS:
+                yield self._invoice_table(table_data)
+                table_data = [INVOICE_PDF_HEADER]
+        if len(table_data) > 1 or not count:
+            yield self._invoice_table(table_data)
+        
+        yield Spacer(1, 1*cm)
+        yield Paragraph("Podsumowanie", self.styles['CustomHeader'])
+        yield self._summary_table(count, paid_amount, unpaid_amount, paid_amount + unpaid_amount)
+    
+    def _pdf_path(self, filename: Optional[str], directory: str) -> str:
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"faktury_{timestamp}.pdf"
+        
+        # Ensure exports directory exists
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, filename)
+    
+    def _pdf_title(self, title: str) -> list:
+        """Title and subtitle flowables of an invoice report"""
+        title = Paragraph(f"{APP_NAME} - {title}", self.styles['CustomTitle'])
         subtitle = Paragraph(
             f"{COMPANY_NAME}<br/>Wygenerowano: {datetime.now().strftime('%d.%m.%Y %H:%M')}",
             self.styles['CustomSubtitle']
         )
-        story.append(subtitle)
-        story.append(Spacer(1, 0.5*cm))
-        
-        # Summary
-        total_amount = sum(inv.get('amount', 0) for inv in invoices)
-        paid_amount = sum(inv.get('amount', 0) for inv in invoices if inv.get('is_paid', False))
-        unpaid_amount = total_amount - paid_amount
-        
-        summary_header = Paragraph("Podsumowanie", self.styles['CustomHeader'])
-        story.append(summary_header)
-        
+        return [title, subtitle, Spacer(1, 0.5*cm)]
+    
+    def _summary_table(self, count: int, paid_amount: float, unpaid_amount: float, total_amount: float) -> Table:
         summary_data = [
             ['Metryka', 'Wartość'],
-            ['Liczba faktur', str(len(invoices))],
+            ['Liczba faktur', str(count)],
             ['Opłacone', f"{paid_amount:,.2f} PLN"],
             ['Nieopłacone', f"{unpaid_amount:,.2f} PLN"],
             ['Razem', f"{total_amount:,.2f} PLN"]
@@ -110,181 +296,146 @@ class ExportService:
             ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F3F4F6')),
             ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB'))
         ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 1*cm))
-        
-        # Invoice list
-        list_header = Paragraph("Lista Faktur", self.styles['CustomHeader'])
-        story.append(list_header)
-        
-        # Table data
-        table_data = [['Data', 'Firma', 'NIP', 'Kwota', 'Termin', 'Status']]
-        
-        for inv in sorted(invoices, key=lambda x: x.get('created_at', ''), reverse=True):
-            try:
-                issue_date = datetime.fromisoformat(inv.get('issue_date', '')).strftime('%d.%m.%Y')
-            except:
-                issue_date = 'N/A'
-            
-            try:
-                deadline = datetime.fromisoformat(inv.get('deadline', '')).strftime('%d.%m.%Y')
-            except:
-                deadline = 'N/A'
-            
-            status = 'Opłacona' if inv.get('is_paid', False) else 'Oczekuje'
-            
+        return summary_table
+    
+    def _customer_table(self, customers) -> Table:
+        """Per-customer totals and median days from issue to payment"""
+        table_data = [CUSTOMER_PDF_HEADER]
+        for customer in customers:
+            median = customer.median_payment_days
             table_data.append([
-                issue_date,
-                inv.get('company_name', 'N/A')[:20],
-                inv.get('nip', 'N/A'),
-                f"{inv.get('amount', 0):,.2f}",
-                deadline,
-                status
+                (customer.company_name or 'N/A')[:20],
+                customer.nip or 'N/A',
+                str(customer.invoice_count),
+                f"{customer.revenue:,.2f}",
+                f"{customer.unpaid:,.2f}",
+                f"{customer.overdue:,.2f}",
+                f"{median:.0f}" if median == median else '—',  # NaN: nothing paid yet
             ])
+        customer_table = Table(table_data, colWidths=[3.5*cm, 2.3*cm, 1.4*cm, 2.3*cm, 2.3*cm, 2.3*cm, 1.6*cm])
+        customer_table.setStyle(INVOICE_TABLE_STYLE)
+        return customer_table
+    
+    def _invoice_pdf_row(self, inv: Mapping) -> list:
+        issue_date = formatted_date(inv, 'issue_date', '%d.%m.%Y', 'N/A')
+        deadline = formatted_date(inv, 'deadline', '%d.%m.%Y', 'N/A')
         
-        invoice_table = Table(table_data, colWidths=[2.5*cm, 5*cm, 3*cm, 2.5*cm, 2.5*cm, 2.5*cm])
-        invoice_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E40AF')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9FAFB')])
-        ]))
-        story.append(invoice_table)
-        
-        # Build PDF
-        doc.build(story)
+        status = 'Opłacona' if inv.get('is_paid', False) else 'Oczekuje'
         
-        return filepath
+        return [
+            issue_date,
+            inv.get('company_name', 'N/A')[:20],
+            inv.get('nip', 'N/A'),
+            f"{inv.get('amount', 0):,.2f}",
+            deadline,
+            status
+        ]
+    
+    def _invoice_table(self, table_data: list) -> Table:
+        """Invoice list table; the header row repeats on every page it spans"""
+        invoice_table = Table(table_data, colWidths=[2.5*cm, 5*cm, 3*cm, 2.5*cm, 2.5*cm, 2.5*cm], repeatRows=1)
+        invoice_table.setStyle(INVOICE_TABLE_STYLE)
+        return invoice_table
     
-    def export_invoices_csv(self, invoices: List[dict], filename: str = None) -> str:
+    def export_invoices_csv(self, invoices: Sequence[Mapping], filename: str = None,
+                            progress: Progress = None) -> str:
         """Export invoices to CSV file"""
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"faktury_{timestamp}.csv"
-        
-        # Ensure exports directory exists
-        os.makedirs("exports", exist_ok=True)
-        filepath = os.path.join("exports", filename)
-        
-        # Write CSV
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Header
-            writer.writerow([
-                'ID', 'Data wystawienia', 'Firma', 'NIP', 'Kwota', 
-                'Termin płatności', 'Termin (dni)', 'Opis', 'Status',
-                'Data opłacenia', 'Terminowa', 'Telefon', 'Dystans'
-            ])
-            
-            # Data rows
-            for inv in invoices:
-                try:
-                    issue_date = datetime.fromisoformat(inv.get('issue_date', '')).strftime('%Y-%m-%d')
-                except:
-                    issue_date = ''
-                
-                try:
-                    deadline = datetime.fromisoformat(inv.get('deadline', '')).strftime('%Y-%m-%d')
-                except:
-                    deadline = ''
-                
-                try:
-                    paid_at = datetime.fromisoformat(inv.get('paid_at', '')).strftime('%Y-%m-%d') if inv.get('paid_at') else ''
-                except:
-                    paid_at = ''
-                
-                writer.writerow([
-                    inv.get('id', ''),
-                    issue_date,
-                    inv.get('company_name', ''),
-                    inv.get('nip', ''),
-                    inv.get('amount', 0),
-                    deadline,
-                    inv.get('payment_term', 0),
-                    inv.get('description', ''),
-                    'Opłacona' if inv.get('is_paid', False) else 'Oczekuje',
-                    paid_at,
-                    'Tak' if inv.get('paid_on_time', False) else 'Nie',
-                    inv.get('contact_phone', ''),
-                    inv.get('calculated_distance', '')
-                ])
-        
+        filepath = self._csv_path(filename, "faktury")
+        self.stream_invoices_csv(invoices, filepath, progress)
         return filepath
     
-    def export_fuel_entries_csv(self, fuel_entries: List[dict], filename: str = None) -> str:
+    def export_fuel_entries_csv(self, fuel_entries: Sequence[Mapping], filename: str = None,
+                                progress: Progress = None) -> str:
         """Export fuel entries to CSV file"""
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"tankowania_{timestamp}.csv"
-        
-        os.makedirs("exports", exist_ok=True)
-        filepath = os.path.join("exports", filename)
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Header
-            writer.writerow([
-                'ID', 'Data', 'Kwota', 'Litry', 'Stacja',
-                'Kierowca ID', 'Pojazd ID', 'Notatki'
-            ])
-            
-            # Data rows
-            for fuel in fuel_entries:
-                try:
-                    fuel_date = datetime.fromisoformat(fuel.get('date', '')).strftime('%Y-%m-%d')
-                except:
-                    fuel_date = ''
-                
-                writer.writerow([
-                    fuel.get('id', ''),
-                    fuel_date,
-                    fuel.get('amount', 0),
-                    fuel.get('liters', 0),
-                    fuel.get('station', ''),
-                    fuel.get('driver_id', ''),
-                    fuel.get('vehicle_id', ''),
-                    fuel.get('notes', '')
-                ])
-        
+        filepath = self._csv_path(filename, "tankowania")
+        self.stream_fuel_entries_csv(fuel_entries, filepath, progress)
         return filepath
     
-    def export_drivers_csv(self, drivers: List[dict], filename: str = None) -> str:
+    def export_drivers_csv(self, drivers: Sequence[dict], filename: str = None,
+                           progress: Progress = None) -> str:
         """Export drivers to CSV file"""
+        filepath = self._csv_path(filename, "kierowcy")
+        self.stream_drivers_csv(drivers, filepath, progress)
+        return filepath
+    
+    # Streaming CSV: any iterable (list, generator, database cursor) to
+    # any sink (path, .gz/.zst path, file-like); rows are written as they
+    # are read, so memory does not grow with the export
+    def stream_invoices_csv(self, invoices: Iterable[Mapping], sink: Sink, progress: Progress = None,
+                            total: Optional[int] = None, compression: Optional[str] = None) -> int:
+        """Write invoices as CSV to sink; returns the number of rows"""
+        return self._stream_csv(INVOICE_CSV_HEADER, self._invoice_csv_row, invoices,
+                                sink, progress, total, compression)
+    
+    def stream_fuel_entries_csv(self, fuel_entries: Iterable[Mapping], sink: Sink, progress: Progress = None,
+                                total: Optional[int] = None, compression: Optional[str] = None) -> int:
+        """Write fuel entries as CSV to sink; returns the number of rows"""
+        return self._stream_csv(FUEL_CSV_HEADER, self._fuel_csv_row, fuel_entries,
+                                sink, progress, total, compression)
+    
+    def stream_drivers_csv(self, drivers: Iterable[dict], sink: Sink, progress: Progress = None,
+                           total: Optional[int] = None, compression: Optional[str] = None) -> int:
+        """Write drivers as CSV to sink; returns the number of rows"""
+        return self._stream_csv(DRIVER_CSV_HEADER, self._driver_csv_row, drivers,
+                                sink, progress, total, compression)
+    
+    def _stream_csv(self, header: list, make_row: Callable, records: Iterable, sink: Sink,
+                    progress: Progress, total: Optional[int], compression: Optional[str]) -> int:
+        if total is None:
+            total = len(records) if isinstance(records, Sized) else 0
+        count = 0
+        with open_sink(sink, compression) as stream:
+            writer = csv.writer(stream)
+            writer.writerow(header)
+            for record in _rows(records, progress, total):
+                writer.writerow(make_row(record))
+                count += 1
+        return count
+    
+    def _csv_path(self, filename: Optional[str], prefix: str) -> str:
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"kierowcy_{timestamp}.csv"
-        
-        os.makedirs("exports", exist_ok=True)
-        filepath = os.path.join("exports", filename)
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Header
-            writer.writerow([
-                'ID', 'Imię i nazwisko', 'Telefon', 'Email',
-                'Nr rejestracyjny', 'Marka pojazdu', 'Kolor', 'Koszt dzienny'
-            ])
-            
-            # Data rows
-            for driver in drivers:
-                writer.writerow([
-                    driver.get('id', ''),
-                    driver.get('name', ''),
-                    driver.get('phone', ''),
-                    driver.get('email', ''),
-                    driver.get('registration_number', ''),
-                    driver.get('car_brand', ''),
-                    driver.get('car_color', ''),
-                    driver.get('daily_cost', '')
-                ])
-        
-        return filepath
+            filename = f"{prefix}_{timestamp}.csv"
+        return os.path.join("exports", filename)
+    
+    def _invoice_csv_row(self, inv: Mapping) -> list:
+        # Records parse their dates once and cache them; plain dicts parse here
+        return [
+            inv.get('id', ''),
+            formatted_date(inv, 'issue_date', '%Y-%m-%d'),
+            inv.get('company_name', ''),
+            inv.get('nip', ''),
+            inv.get('amount', 0),
+            formatted_date(inv, 'deadline', '%Y-%m-%d'),
+            inv.get('payment_term', 0),
+            inv.get('description', ''),
+            'Opłacona' if inv.get('is_paid', False) else 'Oczekuje',
+            formatted_date(inv, 'paid_at', '%Y-%m-%d'),
+            'Tak' if inv.get('paid_on_time', False) else 'Nie',
+            inv.get('contact_phone', ''),
+            inv.get('calculated_distance', '')
+        ]
+    
+    def _fuel_csv_row(self, fuel: Mapping) -> list:
+        return [
+            fuel.get('id', ''),
+            formatted_date(fuel, 'date', '%Y-%m-%d'),
+            fuel.get('amount', 0),
+            fuel.get('liters', 0),
+            fuel.get('station', ''),
+            fuel.get('driver_id', ''),
+            fuel.get('vehicle_id', ''),
+            fuel.get('notes', '')
+        ]
+    
+    def _driver_csv_row(self, driver: dict) -> list:
+        return [
+            driver.get('id', ''),
+            driver.get('name', ''),
+            driver.get('phone', ''),
+            driver.get('email', ''),
+            driver.get('registration_number', ''),
+            driver.get('car_brand', ''),
+            driver.get('car_color', ''),
+            driver.get('daily_cost', '')
+        ]
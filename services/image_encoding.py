@@ -0,0 +1,97 @@
+"""
+Encoding policy for invoice attachments
+Photos and scans that are already compressed and small enough are stored
+byte for byte; anything else is downsized and re-encoded as a lossy image
+"""
+
+import io
+from typing import Tuple
+from PIL import Image, ImageOps
+
+# Attachments are downsized to fit this box
+MAX_SIZE = (1920, 1920)
+
+# Compressed files up to this size are kept as they are
+MAX_BYTES = 1024 * 1024
+
+# Formats stored unchanged when they fit MAX_SIZE and MAX_BYTES
+KEEP_FORMATS = ("JPEG", "WEBP")
+
+# Format of re-encoded attachments ("JPEG" or "WEBP") and the qualities
+# tried in turn until the result fits MAX_BYTES
+ENCODE_FORMAT = "JPEG"
+QUALITIES = (85, 75, 60)
+
+# EXIF orientation tag; 1 means the pixels are stored upright
+_ORIENTATION = 0x0112
+
+
+def fit(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    """size scaled down (never up) to fit box, keeping the aspect ratio"""
+    width, height = size
+    scale = min(box[0] / width, box[1] / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def can_keep(img: Image.Image, size_bytes: int, max_size: Tuple[int, int] = MAX_SIZE,
+             max_bytes: int = MAX_BYTES) -> bool:
+    """True if the original file can be stored without re-encoding"""
+    return img.format in KEEP_FORMATS and _fits(img, size_bytes, max_size, max_bytes)
+
+
+def _fits(img: Image.Image, size_bytes: int, max_size: Tuple[int, int], max_bytes: int) -> bool:
+    """True if the original file is within the limits and shown as decoded"""
+    return (
+        size_bytes <= max_bytes
+        and img.width <= max_size[0] and img.height <= max_size[1]
+        # Viewers rotating by EXIF would disagree with the thumbnails
+        and img.getexif().get(_ORIENTATION, 1) == 1
+        and not getattr(img, "is_animated", False)
+    )
+
+
+def encode_attachment(data: bytes, max_size: Tuple[int, int] = MAX_SIZE, max_bytes: int = MAX_BYTES,
+                      fmt: str = ENCODE_FORMAT) -> bytes:
+    """Bytes to store for an image file's contents"""
+    with Image.open(io.BytesIO(data)) as img:
+        if can_keep(img, len(data), max_size, max_bytes):
+            return data
+        fits = _fits(img, len(data), max_size, max_bytes)
+
+        # JPEG decoders scale by 1/2, 1/4 or 1/8 while decoding; asking for
+        # the final size makes a 12 MP photo decode at a quarter of the pixels
+        img.draft("RGB", fit(img.size, max_size))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+        img = _flatten(img, keep_alpha=fmt == "WEBP")
+
+        for quality in QUALITIES:
+            encoded = _save(img, fmt, quality)
+            if len(encoded) <= max_bytes:
+                break
+
+    # Small PNG screenshots and the like can beat a lossy re-encoding
+    if fits and len(data) <= len(encoded):
+        return data
+    return encoded
+
+
+def _flatten(img: Image.Image, keep_alpha: bool) -> Image.Image:
+    """img in RGB, transparency composited onto white unless kept"""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        if keep_alpha:
+            return img
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def _save(img: Image.Image, fmt: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "JPEG":
+        img.save(buffer, format=fmt, quality=quality, optimize=True, progressive=True)
+    else:
+        img.save(buffer, format=fmt, quality=quality, method=4)
+    return buffer.getvalue()
@@ -0,0 +1,42 @@
+"""
+Image ingestion pipeline for invoice attachments
+Encodes (see image_encoding) and stores selected image files on a thread
+pool so the dialogs stay responsive
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from database.blob_store import BlobStore
+from services.image_encoding import MAX_SIZE, encode_attachment
+
+# Pillow releases the GIL while decoding, resampling and compressing, so
+# threads run the per-image work in parallel without pickling image bytes
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def executor() -> ThreadPoolExecutor:
+    """Shared worker pool, created on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                       thread_name_prefix="images")
+    return _executor
+
+
+def encode_image(path: str, max_size: Tuple[int, int] = MAX_SIZE) -> bytes:
+    """Read an image file and encode it by the attachment policy"""
+    with open(path, "rb") as f:
+        return encode_attachment(f.read(), max_size)
+
+
+def ingest_image(store: BlobStore, path: str) -> str:
+    """Encode one file and put it into the blob store; returns its hash"""
+    return store.put(encode_image(path))
+
+
+def ingest_images(store: BlobStore, paths: Sequence[str]) -> List[Future]:
+    """Start ingesting files in parallel; one future (-> hash) per path, in order"""
+    pool = executor()
+    return [pool.submit(ingest_image, store, path) for path in paths]
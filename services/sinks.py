@@ -0,0 +1,83 @@
+"""
+Output sinks for streamed exports
+A sink is a path (plain, gzip- or zstd-compressed file) or an open
+file-like object such as sys.stdout; open_sink() turns it into a
+buffered text stream for csv.writer
+"""
+
+import gzip
+import io
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, TextIO, Union
+
+Sink = Union[str, Path, IO]
+
+# Write buffer of file sinks; rows are flushed to disk in large blocks
+BUFFER_SIZE = 1 << 20
+
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+
+def compression_for(path: Union[str, Path]) -> str:
+    """Compression implied by a file name (.gz, .zst)"""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.gz':
+        return 'gzip'
+    if suffix in ('.zst', '.zstd'):
+        return 'zstd'
+    return 'none'
+
+
+def _binary_file(path: Path, compression: str) -> IO[bytes]:
+    raw = open(path, 'wb', buffering=BUFFER_SIZE)
+    if compression == 'none':
+        return raw
+    if compression == 'gzip':
+        return gzip.GzipFile(filename=path.name, mode='wb', fileobj=raw, compresslevel=6)
+    try:
+        import zstandard
+    except ImportError:
+        raw.close()
+        path.unlink(missing_ok=True)
+        raise RuntimeError("Kompresja zstd wymaga pakietu 'zstandard' (pip install zstandard)")
+    return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+
+
+@contextmanager
+def open_sink(sink: Sink, compression: Optional[str] = None) -> Iterator[TextIO]:
+    """UTF-8 text stream (newline='') writing to sink
+
+    Paths are created (with parent directories) and closed at the end; a
+    partially written file is removed if the export fails. compression
+    defaults to the one implied by the file name. File-like objects are
+    only flushed, never closed; binary ones are wrapped for text.
+    """
+    if isinstance(sink, (str, Path)):
+        path = Path(sink)
+        compression = compression or compression_for(path)
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stream = io.TextIOWrapper(_binary_file(path, compression), encoding='utf-8', newline='')
+        try:
+            yield stream
+        except BaseException:
+            stream.close()
+            path.unlink(missing_ok=True)
+            raise
+        stream.close()
+        return
+
+    if compression not in (None, 'none'):
+        raise ValueError("Compression needs a file path sink")
+    if isinstance(sink, io.TextIOBase):
+        yield sink
+        sink.flush()
+        return
+    stream = io.TextIOWrapper(sink, encoding='utf-8', newline='', write_through=False)
+    try:
+        yield stream
+        stream.flush()
+    finally:
+        stream.detach()  # leave the caller's object open
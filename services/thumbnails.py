@@ -0,0 +1,63 @@
+"""
+Image thumbnails on disk
+Small previews of blob store images, generated once and kept under
+data/thumbs next to the blobs they were made from
+"""
+
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import Tuple
+from PIL import Image, features
+
+import config
+from database.blob_store import BlobStore
+from services.image_encoding import fit
+
+# Pixel box of stored thumbnails (twice the displayed size, for HiDPI)
+THUMB_SIZE = (96, 96)
+
+# WebP is smaller at the same quality; JPEG if Pillow was built without it
+THUMB_FORMAT, THUMB_SUFFIX = ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+
+
+class ThumbnailStore:
+    """Creates and reads thumbnails of blobs (safe to use from worker threads)"""
+
+    def __init__(self, blobs: BlobStore, root: Path = config.THUMBS_DIR, size: Tuple[int, int] = THUMB_SIZE):
+        self.blobs = blobs
+        self.root = Path(root)
+        self.size = size
+
+    def path(self, digest: str) -> Path:
+        """Thumbnail file of a blob (sharded like the blob store)"""
+        return self.root / digest[:2] / f"{digest}_{self.size[0]}x{self.size[1]}{THUMB_SUFFIX}"
+
+    def load(self, digest: str) -> Image.Image:
+        """Thumbnail image, generated from the blob on first use"""
+        path = self.path(digest)
+        try:
+            with Image.open(path) as thumb:
+                thumb.load()
+                return thumb
+        except FileNotFoundError:
+            pass
+
+        with Image.open(io.BytesIO(self.blobs.get(digest))) as img:
+            # Decode JPEG blobs directly at a reduced scale
+            img.draft("RGB", fit(img.size, self.size))
+            img.thumbnail(self.size, Image.Resampling.LANCZOS)
+            thumb = img.convert("RGB")
+
+        # Write to a temporary name first, so readers never see a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                thumb.save(f, format=THUMB_FORMAT, quality=80)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return thumb
@@ -0,0 +1,55 @@
+"""
+The columnar invoice frame gives the same per-customer figures as a
+plain loop over the records
+"""
+
+import math
+import statistics
+from datetime import date
+
+from database.records import compact
+from services.analytics import InvoiceFrame
+
+TODAY = date(2024, 3, 1)
+
+INVOICES = [
+    {'nip': '111', 'company_name': 'Alfa', 'amount': 100, 'is_paid': True,
+     'issue_date': '2024-01-01', 'paid_at': '2024-01-11T09:00:00'},
+    {'nip': '111', 'company_name': 'Alfa sp. z o.o.', 'amount': 50.5, 'is_paid': True,
+     'issue_date': '2024-01-05', 'paid_at': '2024-01-25'},
+    {'nip': '111', 'amount': 20, 'is_paid': False, 'issue_date': '2024-01-10', 'deadline': '2024-02-10'},
+    {'nip': '222', 'company_name': 'Beta', 'amount': 400, 'issue_date': '2024-02-01',
+     'deadline': '2024-03-15T00:00:00Z'},
+    {'nip': '222', 'company_name': 'Beta', 'amount': None, 'is_paid': True, 'issue_date': 'zła data',
+     'paid_at': '2024-02-03'},
+    {'company_name': 'Bez NIP', 'amount': '7.5', 'is_paid': True, 'issue_date': '2024-02-01',
+     'paid_at': '2024-02-04', 'deadline': '2024-01-01'},
+]
+
+
+def test_by_customer_matches_a_plain_loop():
+    frame = InvoiceFrame.from_records(compact('invoices', inv) for inv in INVOICES)
+    assert len(frame) == len(INVOICES)
+    assert frame.total() == 578.0
+    assert frame.total(frame.unpaid) == 420.0
+    assert frame.total(frame.overdue(TODAY)) == 20.0
+
+    customers = frame.by_customer(TODAY)
+    assert [c.nip for c in customers] == ['222', '111', '']
+    beta, alfa, no_nip = customers
+    assert (alfa.company_name, alfa.invoice_count, alfa.revenue, alfa.unpaid, alfa.overdue) == \
+        ('Alfa', 3, 170.5, 20.0, 20.0)
+    assert alfa.median_payment_days == statistics.median([10, 20])
+    assert math.isclose(alfa.p90_payment_days, 10 + 0.9 * 10)
+    assert (beta.revenue, beta.unpaid, beta.overdue) == (400.0, 400.0, 0.0)
+    # The only paid Beta invoice has no valid issue date
+    assert math.isnan(beta.median_payment_days)
+    assert no_nip.median_payment_days == 3
+
+    assert [c.nip for c in frame.by_customer(TODAY, limit=1)] == ['222']
+
+
+def test_empty_frame():
+    frame = InvoiceFrame.from_records([])
+    assert len(frame) == 0 and frame.total() == 0
+    assert frame.by_customer() == []
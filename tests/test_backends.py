@@ -0,0 +1,114 @@
+"""
+Database handlers on stored rows: both must return them the same way, and
+old, partial or odd rows must not break loading or queries
+"""
+
+import json
+
+from database.db import Database
+from database.events import RELOADED
+from database.sqlite_db import SQLiteDatabase
+
+# A row written by an older version: most model fields are absent
+PARTIAL_INVOICE = {
+    'id': 'inv-partial',
+    'company_name': 'Firma Sp. z o.o.',
+    'nip': '1234567890',
+    'is_paid': False,
+}
+
+
+def test_partial_row_round_trips_the_same_on_both_backends(tmp_path):
+    json_path = tmp_path / "faktury.json"
+    json_path.write_text(json.dumps({'invoices': {'1': PARTIAL_INVOICE}}), encoding='utf-8')
+    tinydb = Database(json_path)
+    sqlite = SQLiteDatabase(tmp_path / "faktury.sqlite3")
+    sqlite.insert_records('invoices', [PARTIAL_INVOICE])
+    try:
+        from_tinydb = tinydb.get_invoice('inv-partial')
+        from_sqlite = sqlite.get_invoice('inv-partial')
+        assert dict(from_tinydb) == dict(from_sqlite) == PARTIAL_INVOICE
+        assert [dict(r) for r in sqlite.get_invoices()] == [dict(r) for r in tinydb.get_invoices()]
+
+        # Defaults of absent fields apply on both backends
+        for invoice in (from_tinydb, from_sqlite):
+            assert f"{invoice.get('amount', 0):.2f}" == "0.00"
+            assert invoice.get('deadline', '') == ''
+    finally:
+        tinydb.close()
+        sqlite.close()
+
+
+def test_bulk_marking_compares_offset_deadlines_in_local_time(tmp_path):
+    late = {'id': 'inv-late', 'nip': '1', 'is_paid': False, 'deadline': '2026-10-10T00:00:00+02:00'}
+    early = {'id': 'inv-early', 'nip': '1', 'is_paid': False, 'deadline': '2026-10-30T00:00:00+02:00'}
+    undated = {'id': 'inv-undated', 'nip': '1', 'is_paid': False}
+    rows = [late, early, undated]
+    json_path = tmp_path / "faktury.json"
+    json_path.write_text(json.dumps({'invoices': {str(i): row for i, row in enumerate(rows, 1)}}), encoding='utf-8')
+    tinydb = Database(json_path)
+    sqlite = SQLiteDatabase(tmp_path / "faktury.sqlite3")
+    sqlite.insert_records('invoices', rows)
+    try:
+        for db in (tinydb, sqlite):
+            assert db.mark_many_as_paid([row['id'] for row in rows], '2026-10-20T12:00:00') == 3
+            assert db.get_invoice('inv-late')['paid_on_time'] is False
+            assert db.get_invoice('inv-early')['paid_on_time'] is True
+            assert db.get_invoice('inv-undated')['paid_on_time'] is True
+    finally:
+        tinydb.close()
+        sqlite.close()
+
+
+def test_rows_without_is_paid_count_as_unpaid(tmp_path):
+    legacy = {'id': 'inv-legacy', 'nip': '1234567890'}
+    paid = {'id': 'inv-paid', 'nip': '1234567890', 'is_paid': True}
+    json_path = tmp_path / "faktury.json"
+    json_path.write_text(json.dumps({'invoices': {'1': legacy, '2': paid}}), encoding='utf-8')
+    tinydb = Database(json_path)
+    sqlite = SQLiteDatabase(tmp_path / "faktury.sqlite3")
+    sqlite.insert_records('invoices', [legacy, paid])
+    try:
+        for db in (tinydb, sqlite):
+            assert [r['id'] for r in db.query_invoices(is_paid=False)] == ['inv-legacy']
+            assert [r['id'] for r in db.iter_invoices(is_paid=False)] == ['inv-legacy']
+            assert db.count_invoices(is_paid=False) == 1
+            assert db.count_invoices(is_paid=True) == 1
+    finally:
+        tinydb.close()
+        sqlite.close()
+
+
+def test_mixed_type_dates_neither_block_opening_nor_break_queries(tmp_path):
+    rows = [
+        {'id': 'inv-date', 'nip': '1', 'deadline': '2024-03-01'},
+        {'id': 'inv-null', 'nip': '1', 'deadline': None},
+        {'id': 'inv-number', 'nip': '1', 'deadline': 20240301},
+    ]
+    json_path = tmp_path / "faktury.json"
+    json_path.write_text(json.dumps({'invoices': {str(i): row for i, row in enumerate(rows, 1)}}), encoding='utf-8')
+    tinydb = Database(json_path)
+    try:
+        in_range = tinydb.query_invoices(date_from='2024-01-01', date_to='2025-01-01')
+        assert [r['id'] for r in in_range] == ['inv-date']
+        by_deadline = tinydb.query_invoices(sort='deadline')
+        assert [r['id'] for r in by_deadline] == ['inv-null', 'inv-number', 'inv-date']
+    finally:
+        tinydb.close()
+
+
+def test_refresh_reports_changes_made_by_another_connection(tmp_path):
+    path = tmp_path / "faktury.sqlite3"
+    gui, other = SQLiteDatabase(path), SQLiteDatabase(path)
+    events = []
+    gui.subscribe(events.append)
+    try:
+        assert gui.refresh() is False
+        other.insert_records('invoices', [PARTIAL_INVOICE])
+        assert gui.refresh() is True
+        assert {(event.table, event.kind) for event in events} >= {('invoices', RELOADED)}
+        assert gui.refresh() is False
+        assert gui.get_invoice('inv-partial') is not None
+    finally:
+        gui.close()
+        other.close()
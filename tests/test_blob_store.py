@@ -0,0 +1,29 @@
+"""
+Blob store garbage collection keeps every image an invoice points to
+"""
+
+import os
+import time
+
+from database.blob_store import BlobStore, referenced_images
+from database.db import Database
+from database.models import Invoice
+
+
+def test_remove_unreferenced_keeps_referenced_and_recent_blobs(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    kept = store.put(b"invoice scan")
+    orphan = store.put(b"deleted invoice scan")
+    recent = store.put(b"not saved yet")
+    an_hour_ago = time.time() - 3600
+    for digest in (kept, orphan):
+        os.utime(store.path(digest), (an_hour_ago, an_hour_ago))
+
+    db = Database(tmp_path / "faktury.json")
+    try:
+        db.add_invoice(Invoice(invoice_images=[kept]))
+        assert store.remove_unreferenced(referenced_images(db), min_age=60) == 1
+    finally:
+        db.close()
+    assert kept in store and recent in store
+    assert orphan not in store
@@ -0,0 +1,53 @@
+"""
+Exports take any iterable of mappings (plain dicts as well as Records)
+and never write two reports to the same file
+"""
+
+import csv
+import io
+
+from database.records import Record, compact
+from services.batch_export import partition
+from services.export_service import ExportService
+
+INVOICE = {
+    'id': 'inv-1',
+    'issue_date': '2024-01-01',
+    'deadline': '2024-01-31T00:00:00Z',
+    'amount': 5,
+    'is_paid': False,
+}
+
+
+def _csv_rows(invoices):
+    out = io.StringIO()
+    ExportService().stream_invoices_csv(invoices, out)
+    return list(csv.reader(io.StringIO(out.getvalue())))
+
+
+def test_invoice_csv_accepts_plain_dicts_and_records():
+    from_dict = _csv_rows([INVOICE])
+    assert from_dict[1][:2] == ['inv-1', '2024-01-01']
+    assert from_dict[1][5] == '2024-01-31'
+    assert _csv_rows([Record(INVOICE)]) == from_dict
+    assert _csv_rows([compact('invoices', INVOICE)]) == from_dict
+
+
+def test_invoice_pdf_accepts_plain_dicts(tmp_path):
+    path = ExportService().export_invoices_pdf([INVOICE], filename="faktury.pdf", directory=str(tmp_path))
+    assert (tmp_path / "faktury.pdf").stat().st_size > 0
+    assert path.endswith("faktury.pdf")
+
+
+def test_invoice_pdf_lists_customers_when_there_are_several(tmp_path):
+    invoices = [dict(INVOICE, nip='111'), dict(INVOICE, id='inv-2', nip='222', is_paid=True,
+                                              paid_at='2024-01-10')]
+    ExportService().export_invoices_pdf(invoices, filename="faktury.pdf", directory=str(tmp_path))
+    assert (tmp_path / "faktury.pdf").stat().st_size > 0
+
+
+def test_batch_partitions_get_distinct_file_stems():
+    groups = partition([{'nip': '123/456'}, {'nip': '123 456'}, {'nip': '999'}], 'nip')
+    stems = [stem for stem, _title in groups]
+    assert len(set(stems)) == 3
+    assert 'faktury_999' in stems
@@ -0,0 +1,134 @@
+"""
+Journaled TinyDB storage: faktury.json plus faktury.json.log must never
+lose a committed change, whatever point a crash or compaction hits
+"""
+
+import json
+
+import pytest
+
+import config
+from database.db import Database
+from database.models import Invoice
+from database.storage import JournalBusy, compact_journal
+
+
+@pytest.fixture(autouse=True)
+def journaled(monkeypatch):
+    monkeypatch.setattr(config, "DB_JOURNAL", True)
+
+
+def _ids(db):
+    return sorted(invoice['id'] for invoice in db.get_invoices())
+
+
+def test_changes_survive_a_crash_without_close(tmp_path):
+    path = tmp_path / "faktury.json"
+    crashed = Database(path)
+    crashed.add_invoice(Invoice(id="inv-1", amount=10))
+    crashed.add_invoice(Invoice(id="inv-2", amount=20))
+    crashed.update_invoice("inv-1", {'amount': 15})
+    crashed.delete_invoice("inv-2")
+    # No close(): the changes exist only in the log
+    assert path.with_name("faktury.json.log").stat().st_size > 0
+
+    db = Database(path)
+    try:
+        assert _ids(db) == ["inv-1"]
+        assert db.get_invoice("inv-1")['amount'] == 15
+        db.add_invoice(Invoice(id="inv-3"))
+    finally:
+        db.close()
+    # close() after writing folds the whole log into faktury.json
+    assert not path.with_name("faktury.json.log").exists()
+    assert sorted(doc['id'] for doc in json.loads(path.read_text())['invoices'].values()) == ["inv-1", "inv-3"]
+
+
+def test_a_torn_last_line_is_dropped_and_appends_continue(tmp_path):
+    path = tmp_path / "faktury.json"
+    log_path = path.with_name("faktury.json.log")
+    crashed = Database(path)
+    crashed.add_invoice(Invoice(id="inv-1"))
+    valid = log_path.stat().st_size
+    with open(log_path, 'ab') as log:
+        log.write(b'{"invoices":{"2":{"id":"inv-torn"')
+
+    db = Database(path)
+    assert _ids(db) == ["inv-1"]
+    assert log_path.stat().st_size == valid
+    db.add_invoice(Invoice(id="inv-2"))
+
+    reopened = Database(path)
+    try:
+        assert _ids(reopened) == ["inv-1", "inv-2"]
+    finally:
+        reopened.close()
+        db.close()
+
+
+def test_background_compaction_keeps_concurrent_writes(tmp_path):
+    path = tmp_path / "faktury.json"
+    db = Database(path)
+    storage = db._storage
+    storage.compact_bytes = 0
+    compacted = False
+    for i in range(200):
+        db.add_invoice(Invoice(id=f"inv-{i}", description="x" * 200))
+        compacted = compacted or storage.old_log_path.exists()
+    storage._join_compactor()
+    assert compacted
+    assert storage.compaction_error is None
+
+    # Replaying snapshot + logs gives the same data as the running instance
+    reopened = Database(path)
+    try:
+        assert _ids(reopened) == _ids(db) == sorted(f"inv-{i}" for i in range(200))
+    finally:
+        reopened.close()
+        db.close()
+
+
+def test_a_failed_batch_writes_nothing_and_restores_memory(tmp_path):
+    path = tmp_path / "faktury.json"
+    db = Database(path)
+    db.add_invoice(Invoice(id="inv-kept", amount=1))
+    events = []
+    db.subscribe(events.append)
+    with pytest.raises(RuntimeError):
+        with db.batch():
+            db.add_invoice(Invoice(id="inv-rolled-back"))
+            db.update_invoice("inv-kept", {'amount': 99})
+            raise RuntimeError("przerwane")
+    assert _ids(db) == ["inv-kept"]
+    assert db.get_invoice("inv-kept")['amount'] == 1
+    assert all(event.id != "inv-rolled-back" for event in events)
+
+    reopened = Database(path)
+    try:
+        assert _ids(reopened) == ["inv-kept"]
+        assert reopened.get_invoice("inv-kept")['amount'] == 1
+    finally:
+        reopened.close()
+        db.close()
+
+
+def test_compact_journal_refuses_while_the_database_is_open(tmp_path):
+    path = tmp_path / "faktury.json"
+    db = Database(path)
+    db.add_invoice(Invoice(id="inv-1"))
+    try:
+        with pytest.raises(JournalBusy):
+            compact_journal(path)
+        assert path.with_name("faktury.json.log").exists()
+    finally:
+        db.close()
+
+    cache = path.with_name("faktury.json.cache").read_bytes()
+    crashed = Database(path)
+    crashed.add_invoice(Invoice(id="inv-2"))
+    crashed._storage._lock_file.close()  # as if the process had exited
+    compact_journal(path)
+    assert not path.with_name("faktury.json.log").exists()
+    assert len(json.loads(path.read_text())['invoices']) == 2
+    # The migration tool leaves the application's cache alone
+    assert path.with_name("faktury.json.cache").read_bytes() == cache
@@ -0,0 +1,29 @@
+"""
+Compact records keep exactly the keys of the row they were built from
+"""
+
+import pickle
+
+import pytest
+
+from database.records import FrozenInvoiceRecord, InvoiceRecord, compact_by_id, freeze
+
+
+def test_from_row_round_trips_missing_and_unknown_keys():
+    row = {'id': 'inv-1', 'amount': 5, 'record': 'kept', 'legacy_field': [1, 2]}
+    record = InvoiceRecord.from_row(row)
+    assert record.to_row() == row
+    assert dict(record) == row
+    assert 'nip' not in record and record.get('nip', '') == ''
+    assert pickle.loads(pickle.dumps(record)).to_row() == row
+
+
+def test_bulk_builders_and_frozen_records():
+    rows = [{'id': 'inv-1', 'amount': 1}, {'id': 'inv-2', 'amount': 2}]
+    assert {key: record.to_row() for key, record in compact_by_id('invoices', rows).items()} == {
+        'inv-1': rows[0], 'inv-2': rows[1]
+    }
+    frozen = freeze('invoices', rows)
+    assert all(isinstance(record, FrozenInvoiceRecord) for record in frozen)
+    with pytest.raises(AttributeError):
+        frozen[0].amount = 3
@@ -0,0 +1,36 @@
+"""
+Startup timing
+Run with FAKTURY_TIMING=1 to print how long each startup phase took
+"""
+
+import os
+import sys
+import time
+
+ENABLED = bool(os.environ.get("FAKTURY_TIMING"))
+
+_last = time.perf_counter()
+_phases = []
+_reported = False
+
+
+def phase(name: str):
+    """End a startup phase (measured from the end of the previous one)"""
+    global _last
+    if not ENABLED or _reported:
+        return
+    now = time.perf_counter()
+    _phases.append((name, now - _last))
+    _last = now
+
+
+def report():
+    """Print the recorded phases once (to stderr) if timing is enabled"""
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    total = sum(elapsed for _name, elapsed in _phases)
+    for name, elapsed in _phases:
+        print(f"{name:<40} {elapsed * 1000:8.1f} ms", file=sys.stderr)
+    print(f"{'razem':<40} {total * 1000:8.1f} ms", file=sys.stderr)